@@ -4,6 +4,8 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 
+from figure_output import show_figure
+
 
 country_activity_df = pd.read_csv(r'Data-Analysis-Between-Traditional-and-Green-sources-of-energy\excel_conversions\1_1.csv', skiprows=3)
 
@@ -84,7 +86,7 @@ fig1 = px.bar(
     color_discrete_map={'Nuclear': 'blue', 'Green': 'green', 'Traditional': 'gray'}
 )
 fig1.update_layout(yaxis_range=[0, world_avg['LCOE'].max() + 20 if not world_avg.empty else 100])
-fig1.show()
+show_figure(fig1, 'costs_global_average_lcoe')
 
 
 
@@ -124,7 +126,7 @@ if top_countries_for_fig2:
     )
     max_lcoe_top_fig2 = top_avg_fig2['LCOE'].max() if not top_avg_fig2.empty else 120
     fig2.update_layout(yaxis_range=[0, max_lcoe_top_fig2 + 20 if pd.notna(max_lcoe_top_fig2) else 120])
-    fig2.show()
+    show_figure(fig2, 'costs_top_countries_lcoe')
 else:
     print("\nCould not find 5 countries with LCOE data for all three energy types to generate the second plot.")
     if countries_with_all_three_types:
@@ -148,4 +150,4 @@ else:
             )
             max_lcoe_top_fig2 = top_avg_fig2['LCOE'].max() if not top_avg_fig2.empty else 120
             fig2.update_layout(yaxis_range=[0, max_lcoe_top_fig2 + 20 if pd.notna(max_lcoe_top_fig2) else 120])
-            fig2.show()
\ No newline at end of file
+            show_figure(fig2, 'costs_top_countries_lcoe')
\ No newline at end of file
@@ -1,99 +1,118 @@
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+import argparse
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor
 
+import numpy as np
+import pandas as pd
 
-BASE_PATH = r'Data-Analysis-Between-Traditional-and-Green-sources-of-energy'
+from dtype_policy import compact_frame, exact_floats
+from energy_cache import CACHE_DIR, clear_cache, load_cached
+from eia_tables import EIA_TABLES, read_eia_table
+from eu_energy import EU_CHUNK_SIZE, EU_DTYPES, PRICE_BIN_WIDTH, clean_eu_frame, report_eu_issues, stream_eu_aggregates
+from eu_incremental import EU_STATE_DIR, update_eu_state
+from frame_backends import DEFAULT_BACKEND, FRAME_BACKENDS, available_backends, eu_aggregates, eu_price_histogram, group_sum
+from figure_output import (EXPORT_FORMATS, LazyModule, configure_compute_only, configure_export, configure_figure_filter,
+                           export_enabled, figure_wanted, lazy_function, show_figure, start_collecting, stop_collecting,
+                           take_exported_records, update_index)
+from lcoe_tables import LCOE_METRIC, load_cost_tables
+from pipeline_stages import mark_stage, profile_path_for, track_stages, write_profile_report
+from source_cube import category_weights, rollup_frame
+from violin_stats import VIOLIN_GRID_POINTS, violin_statistics
+
+px = LazyModule('plotly.express')
+go = LazyModule('plotly.graph_objects')
+make_subplots = lazy_function('plotly.subplots', 'make_subplots')
 
 
-def generate_costs_graphs():
-    country_activity_df = pd.read_csv(f'{BASE_PATH}\\excel_conversions\\1_1.csv', skiprows=3)
+BASE_PATH = r'Data-Analysis-Between-Traditional-and-Green-sources-of-energy'
+EU_STREAMING = False
+EU_INCREMENTAL = False
+DATAFRAME_BACKEND = DEFAULT_BACKEND
+COMPUTE_ONLY = False
+SELECTED_FIGURES = None
+ANIMATION_FRAME_STEP = 1
+COSTS_DISCOUNT_RATE = 0.03
+COSTS_FIGURE_TABLES = [
+    '3.13.a', '3.13.b1', '3.13.b2', '3.22.a', '3.22.b1', '3.22.b2',
+    '3.14', '3.15.a', '3.15.b', '3.16.a', '3.16.b', '3.16.c',
+    '3.20.a', '3.20.b', '3.21'
+]
+SUSTAINABLE_FOCUS_COUNTRIES = ['France']
+SUSTAINABLE_ANIMATION_COUNTRIES = ['Germany', 'France', 'United States', 'China']
+SUBSTITUTION_GROUPS = {
+    'Coal': 'Fossil Fuels', 'Oil': 'Fossil Fuels', 'Gas': 'Fossil Fuels',
+    'Hydropower': 'Renewables', 'Wind': 'Renewables', 'Solar': 'Renewables', 'Biofuels': 'Renewables', 'Other_renewables': 'Renewables'
+}
+
+
+def _slug(text):
+    return text.strip().lower().replace(' ', '_')
+
+
+def _entity_index(df):
+    return df.groupby('Entity', sort=False, observed=True).indices
+
+
+def _entity_rows(df, entity_index, entities):
+    positions = [entity_index[entity] for entity in entities if entity in entity_index]
+    if not positions:
+        return df.iloc[0:0]
+    return df.iloc[np.sort(np.concatenate(positions))]
+
+
+def _load_country_activity(path):
+    country_activity_df = pd.read_csv(path, skiprows=3)
     country_activity_df['TOTAL'] = pd.to_numeric(country_activity_df['TOTAL'], errors='coerce')
     country_activity_df = country_activity_df.dropna(subset=['Country', 'TOTAL'])
+    country_activity_df['Country'] = country_activity_df['Country'].str.strip()
+    return compact_frame(country_activity_df[['Country', 'TOTAL']])
 
-    nuclear_new_temp = pd.read_csv(f'{BASE_PATH}\\excel_conversions\\3_13_a_b1_b2.csv', skiprows=4)
-    nuclear_new = nuclear_new_temp.iloc[:, [1, 13]].copy()
-    nuclear_new.columns = ['Country', 'LCOE']
-    nuclear_new['Category'] = 'Nuclear'
-
-    nuclear = nuclear_new
-    try:
-        nuclear_lto_temp = pd.read_csv(f'{BASE_PATH}\\excel_conversions\\3_22_a_b1_b2.csv', skiprows=4)
-        if not nuclear_lto_temp.empty and nuclear_lto_temp.shape[1] > 13:
-            nuclear_lto = nuclear_lto_temp.iloc[:, [1, 13]].copy()
-            nuclear_lto.columns = ['Country', 'LCOE']
-            nuclear_lto['Category'] = 'Nuclear'
-            nuclear = pd.concat([nuclear_new, nuclear_lto])
-        else:
-            print("Warning (Costs): nuclear_lto file (3_22_a_b1_b2.csv) is empty or has too few columns. Using only new build nuclear data.")
-    except FileNotFoundError:
-        print("Warning (Costs): nuclear_lto file (3_22_a_b1_b2.csv) not found. Using only new build nuclear data.")
-    except IndexError:
-        print(f"Warning (Costs): Indexing error while processing nuclear_lto file (3_22_a_b1_b2.csv). Using only new build nuclear data.")
-
-
-    solar_temp = pd.read_csv(f'{BASE_PATH}\\excel_conversions\\3_14.csv', skiprows=4)
-    solar = solar_temp.iloc[:, [1, 14]].copy()
-    solar.columns = ['Country', 'LCOE']
-    solar['Category'] = 'Green'
-
-    wind_temp = pd.read_csv(f'{BASE_PATH}\\excel_conversions\\3_15_a_b.csv', skiprows=4)
-    wind = wind_temp.iloc[:, [1, 13]].copy()
-    wind.columns = ['Country', 'LCOE']
-    wind['Category'] = 'Green'
-
-    hydro_temp = pd.read_csv(f'{BASE_PATH}\\excel_conversions\\3_16_a_b_c.csv', skiprows=4)
-    hydro = hydro_temp.iloc[:, [1, 13]].copy()
-    hydro.columns = ['Country', 'LCOE']
-    hydro['Category'] = 'Green'
-
-    green = pd.concat([solar, wind, hydro])
-
-    coal_temp = pd.read_csv(f'{BASE_PATH}\\excel_conversions\\3_21.csv', skiprows=4)
-    coal = coal_temp.iloc[:, [1, 14]].copy()
-    coal.columns = ['Country', 'LCOE']
-    coal['Category'] = 'Traditional'
-
-    gas_temp = pd.read_csv(f'{BASE_PATH}\\excel_conversions\\3_20a_b.csv', skiprows=4)
-    gas = gas_temp.iloc[:, [1, 14]].copy()
-    gas.columns = ['Country', 'LCOE']
-    gas['Category'] = 'Traditional'
 
-    traditional = pd.concat([coal, gas])
-
-    combined_data = pd.concat([nuclear, green, traditional])
-    combined_data['LCOE'] = pd.to_numeric(combined_data['LCOE'], errors='coerce')
-    combined_data['Country'] = combined_data['Country'].str.strip()
+def generate_costs_graphs():
+    mark_stage('load')
+    lcoe_tables = exact_floats(load_cost_tables(f'{BASE_PATH}\\excel_conversions', tables=COSTS_FIGURE_TABLES, metrics=[LCOE_METRIC]))
+    mark_stage('clean', len(lcoe_tables))
+    combined_data = lcoe_tables[lcoe_tables['discount_rate'] == COSTS_DISCOUNT_RATE].rename(
+        columns={'country': 'Country', 'value': 'LCOE', 'category': 'Category'}
+    )[['Country', 'LCOE', 'Category']]
     combined_data = combined_data.dropna(subset=['Country', 'LCOE'])
 
-    world_avg = combined_data.groupby('Category')['LCOE'].mean().reset_index()
+    mark_stage('aggregate', len(combined_data))
+    world_avg = combined_data.groupby('Category', observed=True)['LCOE'].mean().reset_index()
     print("\nGlobal Average LCOE by Category (Costs.py):")
     print(world_avg)
 
-    if not world_avg.empty:
-        fig1 = px.bar(
-            world_avg,
-            x='Category',
-            y='LCOE',
-            title='Global Average LCOE by Energy Type ',
-            labels={'LCOE': 'LCOE (USD/MWh)', 'Category': 'Energy Type'},
-            color='Category',
-            color_discrete_map={'Nuclear': 'blue', 'Green': 'green', 'Traditional': 'gray'}
-        )
-        fig1.update_layout(yaxis_range=[0, world_avg['LCOE'].max() + 20 if not world_avg.empty else 100])
-        fig1.show()
-    else:
-        print("Warning (Costs): world_avg DataFrame is empty. Skipping fig1.")
+    mark_stage('figures', len(world_avg))
+    if figure_wanted('costs_global_average_lcoe'):
+        if not world_avg.empty:
+            fig1 = px.bar(
+                world_avg,
+                x='Category',
+                y='LCOE',
+                title='Global Average LCOE by Energy Type ',
+                labels={'LCOE': 'LCOE (USD/MWh)', 'Category': 'Energy Type'},
+                color='Category',
+                color_discrete_map={'Nuclear': 'blue', 'Green': 'green', 'Traditional': 'gray'}
+            )
+            fig1.update_layout(yaxis_range=[0, world_avg['LCOE'].max() + 20 if not world_avg.empty else 100])
+            show_figure(fig1, 'costs_global_average_lcoe')
+        else:
+            print("Warning (Costs): world_avg DataFrame is empty. Skipping fig1.")
 
+    if not _dataset_wanted('country_activity'):
+        print("-" * 50)
+        return
 
-    country_category_counts = combined_data.groupby('Country')['Category'].nunique()
+    mark_stage('load')
+    country_activity_df = exact_floats(load_cached(f'{BASE_PATH}\\excel_conversions\\1_1.csv', _load_country_activity, tag='activity-compact'))
+    mark_stage('aggregate', len(combined_data))
+    country_category_counts = combined_data.groupby('Country', observed=True)['Category'].nunique()
     countries_with_all_three_types = country_category_counts[country_category_counts == 3].index.tolist()
     print(f"\nCountries with LCOE data for all 3 energy types (Costs.py): {countries_with_all_three_types}")
 
     top_countries_for_fig2 = []
     if countries_with_all_three_types:
-        country_activity_df['Country'] = country_activity_df['Country'].str.strip()
         relevant_country_activity = country_activity_df[country_activity_df['Country'].isin(countries_with_all_three_types)]
         top_countries_for_fig2 = relevant_country_activity.sort_values('TOTAL', ascending=False).head(5)['Country'].tolist()
     
@@ -101,146 +120,136 @@ def generate_costs_graphs():
 
     if top_countries_for_fig2:
         top_data_fig2 = combined_data[combined_data['Country'].isin(top_countries_for_fig2)]
-        top_avg_fig2 = top_data_fig2.groupby(['Country', 'Category'])['LCOE'].mean().reset_index()
+        top_avg_fig2 = top_data_fig2.groupby(['Country', 'Category'], observed=True)['LCOE'].mean().reset_index()
         print("\nAverage LCOE for selected Top Countries (Fig 2 from Costs.py):")
         print(top_avg_fig2)
 
-        if not top_avg_fig2.empty:
-            fig2 = px.bar(
-                top_avg_fig2,
-                x='Country',
-                y='LCOE',
-                color='Category',
-                title='LCOE Comparison for Top Countries with All Energy Types ',
-                labels={'LCOE': 'LCOE (USD/MWh)'},
-                color_discrete_map={'Nuclear': 'blue', 'Green': 'green', 'Traditional': 'gray'},
-                barmode='group',
-                category_orders={"Country": top_countries_for_fig2}
-            )
-            max_lcoe_top_fig2 = top_avg_fig2['LCOE'].max() if not top_avg_fig2.empty else 120
-            fig2.update_layout(yaxis_range=[0, max_lcoe_top_fig2 + 20 if pd.notna(max_lcoe_top_fig2) else 120])
-            fig2.show()
-        else:
-            print("Warning (Costs): top_avg_fig2 DataFrame is empty. Skipping fig2.")
+        mark_stage('figures', len(top_avg_fig2))
+        if figure_wanted('costs_top_countries_lcoe'):
+            if not top_avg_fig2.empty:
+                fig2 = px.bar(
+                    top_avg_fig2,
+                    x='Country',
+                    y='LCOE',
+                    color='Category',
+                    title='LCOE Comparison for Top Countries with All Energy Types ',
+                    labels={'LCOE': 'LCOE (USD/MWh)'},
+                    color_discrete_map={'Nuclear': 'blue', 'Green': 'green', 'Traditional': 'gray'},
+                    barmode='group',
+                    category_orders={"Country": top_countries_for_fig2}
+                )
+                max_lcoe_top_fig2 = top_avg_fig2['LCOE'].max() if not top_avg_fig2.empty else 120
+                fig2.update_layout(yaxis_range=[0, max_lcoe_top_fig2 + 20 if pd.notna(max_lcoe_top_fig2) else 120])
+                show_figure(fig2, 'costs_top_countries_lcoe')
+            else:
+                print("Warning (Costs): top_avg_fig2 DataFrame is empty. Skipping fig2.")
 
     elif countries_with_all_three_types:
         print(f"Found {len(countries_with_all_three_types)} countries with all three types: {countries_with_all_three_types}. Showing data for these.")
         top_data_fig2 = combined_data[combined_data['Country'].isin(countries_with_all_three_types)]
-        top_avg_fig2 = top_data_fig2.groupby(['Country', 'Category'])['LCOE'].mean().reset_index()
+        top_avg_fig2 = top_data_fig2.groupby(['Country', 'Category'], observed=True)['LCOE'].mean().reset_index()
         print("\nAverage LCOE for countries with all three types (Costs.py):")
         print(top_avg_fig2)
-        if not top_avg_fig2.empty:
-            fig2 = px.bar(
-                top_avg_fig2,
-                x='Country',
-                y='LCOE',
-                color='Category',
-                title=f'LCOE Comparison for Countries with All Energy Types ({len(countries_with_all_three_types)} found) ',
-                labels={'LCOE': 'LCOE (USD/MWh)'},
-                color_discrete_map={'Nuclear': 'blue', 'Green': 'green', 'Traditional': 'gray'},
-                barmode='group',
-                category_orders={"Country": countries_with_all_three_types}
-            )
-            max_lcoe_top_fig2 = top_avg_fig2['LCOE'].max() if not top_avg_fig2.empty else 120
-            fig2.update_layout(yaxis_range=[0, max_lcoe_top_fig2 + 20 if pd.notna(max_lcoe_top_fig2) else 120])
-            fig2.show()
-        else:
-            print("Warning (Costs): top_avg_fig2 for fewer than 5 countries is empty. Skipping fig2.")
+        mark_stage('figures', len(top_avg_fig2))
+        if figure_wanted('costs_top_countries_lcoe'):
+            if not top_avg_fig2.empty:
+                fig2 = px.bar(
+                    top_avg_fig2,
+                    x='Country',
+                    y='LCOE',
+                    color='Category',
+                    title=f'LCOE Comparison for Countries with All Energy Types ({len(countries_with_all_three_types)} found) ',
+                    labels={'LCOE': 'LCOE (USD/MWh)'},
+                    color_discrete_map={'Nuclear': 'blue', 'Green': 'green', 'Traditional': 'gray'},
+                    barmode='group',
+                    category_orders={"Country": countries_with_all_three_types}
+                )
+                max_lcoe_top_fig2 = top_avg_fig2['LCOE'].max() if not top_avg_fig2.empty else 120
+                fig2.update_layout(yaxis_range=[0, max_lcoe_top_fig2 + 20 if pd.notna(max_lcoe_top_fig2) else 120])
+                show_figure(fig2, 'costs_top_countries_lcoe')
+            else:
+                print("Warning (Costs): top_avg_fig2 for fewer than 5 countries is empty. Skipping fig2.")
     else:
         print("\nCould not find countries with LCOE data for all three energy types to generate the second plot (Costs.py).")
     print("-" * 50)
 
 
-def generate_eu_energy_graphs():
-
-    try:
-        df_eu = pd.read_csv(f'{BASE_PATH}\\EU_energy data\\EU_energy_data.csv')
-    except FileNotFoundError:
-        print(f"Error (EUEnergy): EU_energy_data.csv not found at {BASE_PATH}\\EU_energy data\\EU_energy_data.csv. Skipping EU Energy graphs.")
-        return
-
-    column_translation = {
-        'fecha': 'date', 'hora': 'time', 'sistema': 'system_code',
-        'bandera': 'is_green_energy', 'precio': 'price_eur_mwh',
-        'tipo_moneda': 'currency_type', 'origen_dato': 'data_source',
-        'fecha_actualizacion': 'last_updated'
-    }
-    df_eu = df_eu.rename(columns=column_translation)
-
-    df_eu['is_green_energy'] = (
-        df_eu['is_green_energy']
-        .astype(str).str.strip().str.upper()
-        .map({'Y': True, '1': True, 'N': False, '0': False})
-    )
-
-    if df_eu['is_green_energy'].isna().any():
-        print(f"Warning (EUEnergy): {df_eu['is_green_energy'].isna().sum()} unmapped 'is_green_energy' values found. Filling with False.")
-        df_eu['is_green_energy'] = df_eu['is_green_energy'].fillna(False)
-    
-    df_eu['date'] = pd.to_datetime(df_eu['date'], dayfirst=True, errors='coerce')
-    df_eu['last_updated'] = pd.to_datetime(df_eu['last_updated'], errors='coerce')
-    df_eu['hour'] = pd.to_datetime(df_eu['time'], format='%H:%M:%S', errors='coerce').dt.hour 
-    df_eu.dropna(subset=['date', 'hour', 'price_eur_mwh', 'is_green_energy'], inplace=True)
-
-    if df_eu.empty:
-        print("Warning (EUEnergy): DataFrame is empty after initial processing. Skipping graphs.")
-        return
-
-    price_diff = df_eu.pivot_table(index=['date', 'hour'], 
-                                 columns='is_green_energy', 
-                                 values='price_eur_mwh',
-                                 aggfunc='mean')
-    
-    if True in price_diff.columns and False in price_diff.columns:
-        price_diff['price_diff'] = price_diff[True] - price_diff[False]
-        if not price_diff.empty and 'price_diff' in price_diff.columns and not price_diff['price_diff'].isna().all():
-            fig_density = px.density_heatmap(price_diff.reset_index(), 
-                                    x='hour', y='date', z='price_diff',
-                                    nbinsx=24,
-                                    title='<b>Green vs Conventional Price Gap (€/MWh)</b><br>Positive = Green more expensive',
-                                    color_continuous_scale='RdBu',
-                                    range_color=[-50, 50])
-            fig_density.update_layout(yaxis_title='Date', xaxis_title='Hour of Day')
-            fig_density.show()
+def _load_eu_energy_data(path):
+    mark_stage('load')
+    df_eu = pd.read_csv(path, dtype=EU_DTYPES)
+    mark_stage('clean', len(df_eu))
+    df_eu, issues = clean_eu_frame(df_eu)
+    report_eu_issues(issues)
+    return compact_frame(df_eu)
+
+
+def _build_eu_figures(eu_agg, price_hist, violin_points=VIOLIN_GRID_POINTS):
+    if figure_wanted('eu_price_gap_heatmap'):
+        eu_mean = (eu_agg['sum'] / eu_agg['count']).rename('price_eur_mwh')
+
+        price_diff = eu_mean.unstack('is_green_energy')
+        if True in price_diff.columns and False in price_diff.columns:
+            price_diff['price_diff'] = price_diff[True] - price_diff[False]
+            if not price_diff['price_diff'].isna().all():
+                fig_density = px.density_heatmap(price_diff.reset_index(), 
+                                        x='hour', y='date', z='price_diff',
+                                        nbinsx=24,
+                                        title='<b>Green vs Conventional Price Gap (€/MWh)</b><br>Positive = Green more expensive',
+                                        color_continuous_scale='RdBu',
+                                        range_color=[-50, 50])
+                fig_density.update_layout(yaxis_title='Date', xaxis_title='Hour of Day')
+                show_figure(fig_density, 'eu_price_gap_heatmap')
+            else:
+                print("Warning (EUEnergy): 'price_diff' column is all NaN. Skipping density heatmap.")
         else:
-            print("Warning (EUEnergy): price_diff DataFrame for density heatmap is empty or 'price_diff' column is all NaN. Skipping density heatmap.")
-    else:
-        print("Warning (EUEnergy): Could not create price_diff due to missing True/False columns in pivot. Skipping density heatmap.")
-
-
-    df_eu['hour_str'] = df_eu['hour'].astype(int).astype(str) + ':00'
-    fig_violin = go.Figure()
-    for is_green, color in [(True, '#2ecc71'), (False, '#e74c3c')]:
-        subset = df_eu[df_eu['is_green_energy'] == is_green]
-        if not subset.empty:
-            fig_violin.add_trace(go.Violin(
-                x=subset['hour_str'], y=subset['price_eur_mwh'],
-                name='Green' if is_green else 'Conventional',
-                box_visible=True, meanline_visible=True, line_color=color,
+            print("Warning (EUEnergy): Could not create price_diff due to missing True/False columns in pivot. Skipping density heatmap.")
+
+
+    if figure_wanted('eu_hourly_price_violin'):
+        fig_violin = go.Figure()
+        violins = violin_statistics(price_hist, PRICE_BIN_WIDTH, violin_points)
+        for is_green, color, offset in [(True, '#2ecc71', -0.2), (False, '#e74c3c', 0.2)]:
+            subset = [v for v in violins if v['is_green_energy'] == is_green]
+            if not subset:
+                continue
+            outline_x, outline_y = [], []
+            for violin in subset:
+                half_width = 0.18 * violin['density'] / violin['density'].max()
+                center = violin['hour'] + offset
+                outline_x.extend(list(np.round(center - half_width, 4)) + list(np.round(center + half_width[::-1], 4)) + [None])
+                outline_y.extend(list(np.round(violin['grid'], 2)) + list(np.round(violin['grid'][::-1], 2)) + [None])
+            name = 'Green' if is_green else 'Conventional'
+            fig_violin.add_trace(go.Scatter(
+                x=outline_x, y=outline_y, mode='lines', fill='toself', name=name, legendgroup=name,
+                line=dict(color=color, width=1), hoverinfo='skip',
                 fillcolor=f'rgba({int(color[1:3],16)}, {int(color[3:5],16)}, {int(color[5:],16)}, 0.2)'
             ))
-    if fig_violin.data:
-        fig_violin.update_layout(
-            title='<b>Price Distribution by Hour and Energy Type </b>',
-            xaxis_title='Hour of Day', yaxis_title='Price (€/MWh)',
-            violingap=0.2, violingroupgap=0
-        )
-        fig_violin.show()
-    else:
-        print("Warning (EUEnergy): No data for violin plot. Skipping.")
+            fig_violin.add_trace(go.Box(
+                x=[v['hour'] + offset for v in subset], q1=[v['q1'] for v in subset],
+                median=[v['median'] for v in subset], q3=[v['q3'] for v in subset],
+                lowerfence=[v['lowerfence'] for v in subset], upperfence=[v['upperfence'] for v in subset],
+                mean=[v['mean'] for v in subset], boxmean=True, boxpoints=False, width=0.06, name=name,
+                legendgroup=name, showlegend=False, line_color=color, fillcolor=color
+            ))
+        if fig_violin.data:
+            fig_violin.update_layout(
+                title='<b>Price Distribution by Hour and Energy Type </b>',
+                xaxis=dict(title='Hour of Day', tickmode='array', tickvals=list(range(24)),
+                           ticktext=[f'{hour}:00' for hour in range(24)]),
+                yaxis_title='Price (€/MWh)', boxmode='overlay'
+            )
+            show_figure(fig_violin, 'eu_hourly_price_violin')
+        else:
+            print("Warning (EUEnergy): No data for violin plot. Skipping.")
 
 
-    hourly_prices = (
-        df_eu.set_index('date')
-        .groupby(['is_green_energy', pd.Grouper(freq='H')])['price_eur_mwh']
-        .agg(['first', 'max', 'min', 'last'])
-        .reset_index(level=0)
-    )
-    if not hourly_prices.empty:
+    if figure_wanted('eu_hourly_candlesticks'):
+        hourly_prices = eu_agg.reset_index()
+        hourly_prices.index = hourly_prices['date'] + pd.to_timedelta(hourly_prices['hour'].astype(int), unit='h')
         fig_candlestick = make_subplots(rows=2, cols=1, shared_xaxes=True)
         traces_added = 0
         for i, (is_green, color) in enumerate([(True, 'green'), (False, 'red')], 1):
-            subset = hourly_prices[hourly_prices['is_green_energy'] == is_green]
+            subset = hourly_prices[hourly_prices['is_green_energy'] == is_green].sort_index()
             if not subset.empty:
                 fig_candlestick.add_trace(go.Candlestick(
                     x=subset.index, open=subset['first'], high=subset['max'],
@@ -257,99 +266,149 @@ def generate_eu_energy_graphs():
                 xaxis_rangeslider_visible=False, height=800, hovermode='x unified'
             )
             fig_candlestick.update_xaxes(rangeslider_thickness=0.05, row=2, col=1)
-            fig_candlestick.show()
+            show_figure(fig_candlestick, 'eu_hourly_candlesticks')
         else:
             print("Warning (EUEnergy): No data for candlestick plot. Skipping.")
 
-    else:
-        print("Warning (EUEnergy): hourly_prices DataFrame is empty. Skipping candlestick plot.")
-
-
-    hourly_avg = df_eu.groupby(['hour', 'is_green_energy'])['price_eur_mwh'].mean().unstack()
-    if not hourly_avg.empty and True in hourly_avg.columns and False in hourly_avg.columns:
-        fig_mirror = go.Figure()
-        fig_mirror.add_trace(go.Bar(
-            x=hourly_avg.index, y=hourly_avg[True], name='Green',
-            marker_color='#2ecc71', opacity=0.7
-        ))
-        fig_mirror.add_trace(go.Bar(
-            x=hourly_avg.index, y=-hourly_avg[False], name='Conventional',
-            marker_color='#e74c3c', opacity=0.7
-        ))
-        fig_mirror.add_trace(go.Scatter(
-            x=hourly_avg.index, y=hourly_avg[True] - hourly_avg[False],
-            name='Spread', line=dict(color='purple', width=3)
-        ))
-        fig_mirror.update_layout(
-            title='<b>Mirrored Hourly Prices </b><br>Green (Above) vs Conventional (Below)',
-            barmode='relative', yaxis_title="Price (€/MWh)", hovermode='x unified'
-        )
-        fig_mirror.show()
-    else:
-        print("Warning (EUEnergy): hourly_avg DataFrame for mirrored plot is empty or missing True/False columns. Skipping.")
+
+    if figure_wanted('eu_mirrored_hourly_prices'):
+        hourly_totals = eu_agg.groupby(level=['hour', 'is_green_energy'])[['sum', 'count']].sum()
+        hourly_avg = (hourly_totals['sum'] / hourly_totals['count']).unstack()
+        if not hourly_avg.empty and True in hourly_avg.columns and False in hourly_avg.columns:
+            fig_mirror = go.Figure()
+            fig_mirror.add_trace(go.Bar(
+                x=hourly_avg.index, y=hourly_avg[True], name='Green',
+                marker_color='#2ecc71', opacity=0.7
+            ))
+            fig_mirror.add_trace(go.Bar(
+                x=hourly_avg.index, y=-hourly_avg[False], name='Conventional',
+                marker_color='#e74c3c', opacity=0.7
+            ))
+            fig_mirror.add_trace(go.Scatter(
+                x=hourly_avg.index, y=hourly_avg[True] - hourly_avg[False],
+                name='Spread', line=dict(color='purple', width=3)
+            ))
+            fig_mirror.update_layout(
+                title='<b>Mirrored Hourly Prices </b><br>Green (Above) vs Conventional (Below)',
+                barmode='relative', yaxis_title="Price (€/MWh)", hovermode='x unified'
+            )
+            show_figure(fig_mirror, 'eu_mirrored_hourly_prices')
+        else:
+            print("Warning (EUEnergy): hourly_avg DataFrame for mirrored plot is empty or missing True/False columns. Skipping.")
+
+
+def generate_eu_energy_graphs(streaming=None, chunksize=EU_CHUNK_SIZE, violin_points=VIOLIN_GRID_POINTS, eu_path=None,
+                              incremental=None, eu_state_dir=EU_STATE_DIR):
+    if streaming is None:
+        streaming = EU_STREAMING
+    if incremental is None:
+        incremental = EU_INCREMENTAL
+    eu_files = [eu_path] if eu_path else sorted(glob.glob(f'{BASE_PATH}\\EU_energy data\\*.csv'))
+    if eu_path is None:
+        eu_path = f'{BASE_PATH}\\EU_energy data\\EU_energy_data.csv'
+
+    mark_stage('load')
+    try:
+        if incremental:
+            if not eu_files:
+                raise FileNotFoundError(eu_path)
+            eu_agg, price_hist = update_eu_state(eu_files, eu_state_dir, chunksize=chunksize)
+        elif streaming:
+            eu_agg, price_hist = stream_eu_aggregates(eu_path, chunksize=chunksize)
+        else:
+            df_eu = exact_floats(load_cached(eu_path, _load_eu_energy_data, tag='eu-compact'))
+            mark_stage('aggregate', len(df_eu))
+            eu_agg = eu_aggregates(df_eu, DATAFRAME_BACKEND)
+            price_hist = eu_price_histogram(df_eu, backend=DATAFRAME_BACKEND)
+    except FileNotFoundError:
+        print(f"Error (EUEnergy): EU_energy_data.csv not found at {eu_path}. Skipping EU Energy graphs.")
+        return
+
+    if eu_agg.empty:
+        print("Warning (EUEnergy): DataFrame is empty after initial processing. Skipping graphs.")
+        return
+
+    mark_stage('figures', len(eu_agg))
+    _build_eu_figures(eu_agg, price_hist, violin_points)
     print("-" * 50)
 
 
-def generate_global_sustainable_energy_graphs():
+def _load_sustainable(path):
+    return compact_frame(pd.read_csv(path))
 
+
+def generate_global_sustainable_energy_graphs():
+    mark_stage('load')
     try:
-        df = pd.read_csv(f'{BASE_PATH}\\Global Data on Sustainable Energy (2000-2020)\\global-data-on-sustainable-energy (1).csv')
+        df = exact_floats(load_cached(f'{BASE_PATH}\\Global Data on Sustainable Energy (2000-2020)\\global-data-on-sustainable-energy (1).csv', _load_sustainable, tag='compact'))
     except FileNotFoundError:
         print(f"Error (GlobalSustainable): CSV not found at {BASE_PATH}\\Global Data on Sustainable Energy (2000-2020)\\global-data-on-sustainable-energy (1).csv. Skipping these graphs.")
         return
 
     print(df.head())
-    viz_df = df.copy()
-    viz_df['Value_co2_emissions_kt_by_country'] = viz_df['Value_co2_emissions_kt_by_country'].replace(0, 1)
-    viz_df = viz_df.dropna(subset=[
-        'gdp_per_capita', 'Renewables (% equivalent primary energy)',
-        'Value_co2_emissions_kt_by_country'
-    ])
-    if not viz_df.empty:
-        fig_scatter_gdp = px.scatter(viz_df, 
-                        x='gdp_per_capita', 
-                        y='Renewables (% equivalent primary energy)',
-                        size='Value_co2_emissions_kt_by_country',
-                        color='Entity', hover_name='Entity', log_x=True,
-                        size_max=60,
-                        title='Renewable Energy vs GDP (Size = CO2 Emissions)')
-        fig_scatter_gdp.show()
-    else:
-        print("Warning (GlobalSustainable): viz_df for scatter GDP plot is empty. Skipping.")
-
-
-    latest_year = df['Year'].max()
-    year_df = df[df['Year'] == latest_year].copy()
-    year_df['Total Electricity (TWh)'] = (year_df['Electricity from fossil fuels (TWh)'].fillna(0) + 
-                                         year_df['Electricity from nuclear (TWh)'].fillna(0) + 
-                                         year_df['Electricity from renewables (TWh)'].fillna(0))
-    year_df = year_df[year_df['Total Electricity (TWh)'] > 0]
-    year_df['Low-carbon electricity (% electricity)'] = year_df['Low-carbon electricity (% electricity)'].fillna(0)
-
-    if not year_df.empty:
-        fig_treemap = px.treemap(year_df,
-                        path=['Entity'], values='Total Electricity (TWh)',
-                        color='Low-carbon electricity (% electricity)',
-                        color_continuous_scale=['red', 'yellow', 'green'],
-                        color_continuous_midpoint=50,
-                        hover_data={
-                            'Fossil Fuels (TWh)': year_df['Electricity from fossil fuels (TWh)'].round(1),
-                            'Renewables (TWh)': year_df['Electricity from renewables (TWh)'].round(1),
-                            'Nuclear (TWh)': year_df['Electricity from nuclear (TWh)'].round(1),
-                            'Total': year_df['Total Electricity (TWh)'].round(1)
-                        },
-                        title=f'Global Energy Mix {latest_year} <br><sup>Size=Total Energy, Color=% Low-Carbon</sup>')
-        fig_treemap.update_layout(
-            margin=dict(t=80, l=0, r=0, b=0),
-            coloraxis_colorbar=dict(title='% Low-Carbon', ticksuffix='%')
-        )
-        fig_treemap.show()
-    else:
-        print("Warning (GlobalSustainable): year_df for treemap is empty. Skipping.")
+    if figure_wanted('sustainable_renewables_vs_gdp'):
+        mark_stage('clean', len(df))
+        viz_df = df.copy()
+        viz_df['Value_co2_emissions_kt_by_country'] = viz_df['Value_co2_emissions_kt_by_country'].replace(0, 1)
+        viz_df = viz_df.dropna(subset=[
+            'gdp_per_capita', 'Renewables (% equivalent primary energy)',
+            'Value_co2_emissions_kt_by_country'
+        ])
+        mark_stage('figures', len(viz_df))
+        if not viz_df.empty:
+            fig_scatter_gdp = px.scatter(viz_df, 
+                            x='gdp_per_capita', 
+                            y='Renewables (% equivalent primary energy)',
+                            size='Value_co2_emissions_kt_by_country',
+                            color='Entity', hover_name='Entity', log_x=True,
+                            size_max=60,
+                            title='Renewable Energy vs GDP (Size = CO2 Emissions)')
+            show_figure(fig_scatter_gdp, 'sustainable_renewables_vs_gdp')
+        else:
+            print("Warning (GlobalSustainable): viz_df for scatter GDP plot is empty. Skipping.")
+
+
+    if figure_wanted('sustainable_energy_mix_treemap'):
+        mark_stage('aggregate', len(df))
+        latest_year = df['Year'].max()
+        year_df = df[df['Year'] == latest_year].copy()
+        year_df['Total Electricity (TWh)'] = (year_df['Electricity from fossil fuels (TWh)'].fillna(0) + 
+                                             year_df['Electricity from nuclear (TWh)'].fillna(0) + 
+                                             year_df['Electricity from renewables (TWh)'].fillna(0))
+        year_df = year_df[year_df['Total Electricity (TWh)'] > 0]
+        year_df['Low-carbon electricity (% electricity)'] = year_df['Low-carbon electricity (% electricity)'].fillna(0)
+
+        mark_stage('figures', len(year_df))
+        if not year_df.empty:
+            fig_treemap = px.treemap(year_df,
+                            path=['Entity'], values='Total Electricity (TWh)',
+                            color='Low-carbon electricity (% electricity)',
+                            color_continuous_scale=['red', 'yellow', 'green'],
+                            color_continuous_midpoint=50,
+                            hover_data={
+                                'Fossil Fuels (TWh)': year_df['Electricity from fossil fuels (TWh)'].round(1),
+                                'Renewables (TWh)': year_df['Electricity from renewables (TWh)'].round(1),
+                                'Nuclear (TWh)': year_df['Electricity from nuclear (TWh)'].round(1),
+                                'Total': year_df['Total Electricity (TWh)'].round(1)
+                            },
+                            title=f'Global Energy Mix {latest_year} <br><sup>Size=Total Energy, Color=% Low-Carbon</sup>')
+            fig_treemap.update_layout(
+                margin=dict(t=80, l=0, r=0, b=0),
+                coloraxis_colorbar=dict(title='% Low-Carbon', ticksuffix='%')
+            )
+            show_figure(fig_treemap, 'sustainable_energy_mix_treemap')
+        else:
+            print("Warning (GlobalSustainable): year_df for treemap is empty. Skipping.")
+
 
+    mark_stage('aggregate', len(df))
+    entity_index = _entity_index(df)
 
-    def create_comparison_bars(country, main_df):
-        country_data = main_df[(main_df['Entity'] == country) & (main_df['Year'].isin([2000, 2020]))]
+    def create_comparison_bars(country, main_df, main_index):
+        mark_stage('aggregate')
+        country_data = _entity_rows(main_df, main_index, [country])
+        country_data = country_data[country_data['Year'].isin([2000, 2020])]
+        mark_stage('figures', len(country_data))
         if not country_data.empty:
             fig = px.bar(country_data,
                         x='Year',
@@ -365,15 +424,19 @@ def generate_global_sustainable_energy_graphs():
                             'Electricity from renewables (TWh)':'#76B041'
                         })
             fig.update_layout(yaxis_title="Electricity Generation (TWh)", legend_title="Energy Source")
-            fig.show()
+            show_figure(fig, f'sustainable_{_slug(country)}_comparison_bars')
         else:
             print(f"Warning (GlobalSustainable): No data for {country} comparison bars. Skipping.")
 
-    create_comparison_bars('France', df)
+    for country in SUSTAINABLE_FOCUS_COUNTRIES:
+        if figure_wanted(f'sustainable_{_slug(country)}_comparison_bars'):
+            create_comparison_bars(country, df, entity_index)
 
-    def create_stacked_area(country, main_df):
-        country_data = main_df[(main_df['Entity'] == country) & 
-                             (main_df['Year'].between(2000, 2020))]
+    def create_stacked_area(country, main_df, main_index):
+        mark_stage('aggregate')
+        country_data = _entity_rows(main_df, main_index, [country])
+        country_data = country_data[country_data['Year'].between(2000, 2020)]
+        mark_stage('figures', len(country_data))
         if not country_data.empty:
             fig = px.area(country_data,
                         x='Year',
@@ -388,18 +451,22 @@ def generate_global_sustainable_energy_graphs():
                             'Electricity from renewables (TWh)':'#76B041'
                         })
             fig.update_layout(yaxis_title="Electricity Generation (TWh)", legend_title="Energy Source")
-            fig.show()
+            show_figure(fig, f'sustainable_{_slug(country)}_stacked_area')
         else:
             print(f"Warning (GlobalSustainable): No data for {country} stacked area. Skipping.")
             
-    create_stacked_area('France', df)
+    for country in SUSTAINABLE_FOCUS_COUNTRIES:
+        if figure_wanted(f'sustainable_{_slug(country)}_stacked_area'):
+            create_stacked_area(country, df, entity_index)
 
-    def create_animated_barchart(countries, main_df):
-        temp_df = main_df[main_df['Entity'].isin(countries)].copy()
+    def create_animated_barchart(countries, main_df, main_index):
+        mark_stage('aggregate')
+        temp_df = _entity_rows(main_df, main_index, countries).copy()
         if not temp_df.empty:
             temp_df['Total'] = temp_df[['Electricity from fossil fuels (TWh)',
                                       'Electricity from nuclear (TWh)',
                                       'Electricity from renewables (TWh)']].sum(axis=1)
+            mark_stage('figures', len(temp_df))
             if not temp_df.empty and temp_df['Total'].max() > 0 :                                 
                 fig = px.bar(temp_df,
                             x='Entity',
@@ -415,252 +482,470 @@ def generate_global_sustainable_energy_graphs():
                                 'Electricity from renewables (TWh)':'#76B041'
                             })
                 fig.update_layout(yaxis_title="Electricity Generation (TWh)", xaxis_title="Country", legend_title="Energy Source")
-                fig.show()
+                show_figure(fig, 'sustainable_country_transition_animation')
             else:
                 print("Warning (GlobalSustainable): temp_df for animated barchart has no positive total or is empty. Skipping.")
         else:
             print("Warning (GlobalSustainable): temp_df for animated barchart is empty. Skipping.")
 
 
-    create_animated_barchart(['Germany', 'France', 'United States', 'China'], df)
+    if figure_wanted('sustainable_country_transition_animation'):
+        create_animated_barchart(SUSTAINABLE_ANIMATION_COUNTRIES, df, entity_index)
 
-    global_df = df.groupby('Year')[['Electricity from fossil fuels (TWh)',
-                                  'Electricity from nuclear (TWh)',
-                                  'Electricity from renewables (TWh)']].sum().reset_index()
-    global_df['Total'] = global_df[['Electricity from fossil fuels (TWh)', 
-                                   'Electricity from nuclear (TWh)', 
-                                   'Electricity from renewables (TWh)']].sum(axis=1)
+    if figure_wanted('sustainable_global_mix_share') or figure_wanted('sustainable_global_generation_by_source'):
+        mark_stage('aggregate', len(df))
+        global_df = group_sum(df, 'Year', ['Electricity from fossil fuels (TWh)',
+                                          'Electricity from nuclear (TWh)',
+                                          'Electricity from renewables (TWh)'], backend=DATAFRAME_BACKEND)
+        global_df['Total'] = global_df[['Electricity from fossil fuels (TWh)', 
+                                       'Electricity from nuclear (TWh)', 
+                                       'Electricity from renewables (TWh)']].sum(axis=1)
     
-    global_df = global_df[global_df['Total'] > 0]
-
-    if not global_df.empty:
-        global_df['Fossil %'] = (global_df['Electricity from fossil fuels (TWh)'] / global_df['Total']) * 100
-        global_df['Nuclear %'] = (global_df['Electricity from nuclear (TWh)'] / global_df['Total']) * 100
-        global_df['Renewables %'] = (global_df['Electricity from renewables (TWh)'] / global_df['Total']) * 100
-
-        fig_global_mix = px.bar(global_df, 
-                    x='Year', y=['Fossil %', 'Nuclear %', 'Renewables %'],
-                    title='<b>Global Electricity Generation Mix </b><br><i>Percentage Breakdown by Source</i>',
-                    labels={'value': 'Percentage (%)', 'variable': 'Energy Source'},
-                    color_discrete_map={
-                        'Fossil %': '#E4572E', 'Nuclear %': '#17BEBB', 'Renewables %': '#76B041'
-                    }, text_auto='.1f')
-        fig_global_mix.update_layout(
-            yaxis_title="Percentage of Total Generation", legend_title="Energy Source",
-            hovermode="x unified", barmode='stack'
-        )
-        fig_global_mix.show()
-
-        melted_global_df = global_df.melt(id_vars='Year', 
-                                        value_vars=['Electricity from fossil fuels (TWh)',
-                                                    'Electricity from nuclear (TWh)',
-                                                    'Electricity from renewables (TWh)'])
-        if not melted_global_df.empty:
-            fig_global_line = px.line(melted_global_df, 
-                        x='Year', y='value', facet_col='variable', facet_col_spacing=0.08,
-                        title='<b>Global Electricity Generation by Source Type </b>',
-                        labels={'value': 'Generation (TWh)'},
-                        color_discrete_sequence=['#E4572E', '#17BEBB', '#76B041'])
-            fig_global_line.update_layout(showlegend=False, yaxis_title="Generation (TWh)")
-            fig_global_line.for_each_annotation(lambda a: a.update(text=a.text.split("=")[-1]))
-            fig_global_line.show()
+        global_df = global_df[global_df['Total'] > 0]
+
+        if not global_df.empty:
+            global_df['Fossil %'] = (global_df['Electricity from fossil fuels (TWh)'] / global_df['Total']) * 100
+            global_df['Nuclear %'] = (global_df['Electricity from nuclear (TWh)'] / global_df['Total']) * 100
+            global_df['Renewables %'] = (global_df['Electricity from renewables (TWh)'] / global_df['Total']) * 100
+
+            mark_stage('figures', len(global_df))
+            if figure_wanted('sustainable_global_mix_share'):
+                fig_global_mix = px.bar(global_df, 
+                            x='Year', y=['Fossil %', 'Nuclear %', 'Renewables %'],
+                            title='<b>Global Electricity Generation Mix </b><br><i>Percentage Breakdown by Source</i>',
+                            labels={'value': 'Percentage (%)', 'variable': 'Energy Source'},
+                            color_discrete_map={
+                                'Fossil %': '#E4572E', 'Nuclear %': '#17BEBB', 'Renewables %': '#76B041'
+                            }, text_auto='.1f')
+                fig_global_mix.update_layout(
+                    yaxis_title="Percentage of Total Generation", legend_title="Energy Source",
+                    hovermode="x unified", barmode='stack'
+                )
+                show_figure(fig_global_mix, 'sustainable_global_mix_share')
+
+            if figure_wanted('sustainable_global_generation_by_source'):
+                melted_global_df = global_df.melt(id_vars='Year', 
+                                                value_vars=['Electricity from fossil fuels (TWh)',
+                                                            'Electricity from nuclear (TWh)',
+                                                            'Electricity from renewables (TWh)'])
+                if not melted_global_df.empty:
+                    fig_global_line = px.line(melted_global_df, 
+                                x='Year', y='value', facet_col='variable', facet_col_spacing=0.08,
+                                title='<b>Global Electricity Generation by Source Type </b>',
+                                labels={'value': 'Generation (TWh)'},
+                                color_discrete_sequence=['#E4572E', '#17BEBB', '#76B041'])
+                    fig_global_line.update_layout(showlegend=False, yaxis_title="Generation (TWh)")
+                    fig_global_line.for_each_annotation(lambda a: a.update(text=a.text.split("=")[-1]))
+                    show_figure(fig_global_line, 'sustainable_global_generation_by_source')
+                else:
+                    print("Warning (GlobalSustainable): melted_global_df for line plot is empty. Skipping.")
         else:
-            print("Warning (GlobalSustainable): melted_global_df for line plot is empty. Skipping.")
-    else:
-        print("Warning (GlobalSustainable): global_df for mix and line plots is empty after filtering zero totals. Skipping.")
-
-
-    df_filtered_anim_scatter = df.dropna(subset=[
-        'Renewable energy share in the total final energy consumption (%)',
-        'Value_co2_emissions_kt_by_country',
-        'Primary energy consumption per capita (kWh/person)',
-        'Year', 'Entity'
-    ])
-    if not df_filtered_anim_scatter.empty:
-        fig_anim_scatter = px.scatter(
-            df_filtered_anim_scatter,
-            x='Renewable energy share in the total final energy consumption (%)',
-            y='Value_co2_emissions_kt_by_country',
-            size='Primary energy consumption per capita (kWh/person)',
-            color='Entity', animation_frame='Year', hover_name='Entity',
-            log_y=True, range_x=[0, 100],
-            title='<b>Renewable Energy Adoption vs CO₂ Emissions Over Time </b>'
-        )
-        fig_anim_scatter.update_layout(showlegend=False)
-        fig_anim_scatter.show()
-    else:
-        print("Warning (GlobalSustainable): df_filtered_anim_scatter for animated scatter is empty. Skipping.")
+            print("Warning (GlobalSustainable): global_df for mix and line plots is empty after filtering zero totals. Skipping.")
+
+
+    if figure_wanted('sustainable_renewables_vs_co2_animation'):
+        mark_stage('clean', len(df))
+        df_filtered_anim_scatter = df.dropna(subset=[
+            'Renewable energy share in the total final energy consumption (%)',
+            'Value_co2_emissions_kt_by_country',
+            'Primary energy consumption per capita (kWh/person)',
+            'Year', 'Entity'
+        ])
+        mark_stage('figures', len(df_filtered_anim_scatter))
+        if not df_filtered_anim_scatter.empty:
+            fig_anim_scatter = px.scatter(
+                df_filtered_anim_scatter,
+                x='Renewable energy share in the total final energy consumption (%)',
+                y='Value_co2_emissions_kt_by_country',
+                size='Primary energy consumption per capita (kWh/person)',
+                color='Entity', animation_frame='Year', hover_name='Entity',
+                log_y=True, range_x=[0, 100],
+                title='<b>Renewable Energy Adoption vs CO₂ Emissions Over Time </b>'
+            )
+            fig_anim_scatter.update_layout(showlegend=False)
+            show_figure(fig_anim_scatter, 'sustainable_renewables_vs_co2_animation')
+        else:
+            print("Warning (GlobalSustainable): df_filtered_anim_scatter for animated scatter is empty. Skipping.")
     print("-" * 50)
 
 
+def _load_death_rates(path):
+    df_death = read_eia_table(path, EIA_TABLES['death_rates'])
+    return df_death.dropna(subset=['Deaths per TWh of electricity production'])
+
+
 def generate_death_rate_graphs():
+    mark_stage('load')
     try:
-        df_death = pd.read_csv(f'{BASE_PATH}\\Nuclear Energy Datasets\\rates_death_from_energy_production_per_twh.csv')
+        df_death = exact_floats(load_cached(f'{BASE_PATH}\\Nuclear Energy Datasets\\rates_death_from_energy_production_per_twh.csv', _load_death_rates, tag='death-eia'))
     except FileNotFoundError:
         print(f"Error (DeathRate): CSV not found at {BASE_PATH}\\Nuclear Energy Datasets\\rates_death_from_energy_production_per_twh.csv. Skipping this graph.")
         return
-
-    df_death['Deaths per TWh of electricity production'] = pd.to_numeric(
-        df_death['Deaths per TWh of electricity production'].astype(str).str.replace(',', '.'), 
-        errors='coerce'
-    )
-    df_death = df_death.dropna(subset=['Deaths per TWh of electricity production'])
     
-    if not df_death.empty:
-        df_death = df_death.sort_values('Deaths per TWh of electricity production', ascending=True)
-        fig_death = px.bar(
-            df_death,
-            x='Deaths per TWh of electricity production', y='Entity',
-            orientation='h', color='Deaths per TWh of electricity production',
-            color_continuous_scale='RdYlGn_r',
-            title='Energy Production Mortality Rates 2021 ',
-            labels={'Deaths per TWh of electricity production': 'Deaths/TWh'},
-            height=600
-        )
-        fig_death.update_xaxes(type='log', range=[-1, 2], title='Deaths per TWh (log scale)') 
-        fig_death.update_layout(
-            yaxis={'categoryorder': 'total ascending'},
-            coloraxis_colorbar=dict(title='Deaths/TWh'),
-            template='plotly_white'
-        )
-        fig_death.show()
-    else:
-        print("Warning (DeathRate): df_death is empty after processing. Skipping graph.")
+    mark_stage('figures', len(df_death))
+    if figure_wanted('death_rate_per_twh'):
+        if not df_death.empty:
+            df_death = df_death.sort_values('Deaths per TWh of electricity production', ascending=True)
+            fig_death = px.bar(
+                df_death,
+                x='Deaths per TWh of electricity production', y='Entity',
+                orientation='h', color='Deaths per TWh of electricity production',
+                color_continuous_scale='RdYlGn_r',
+                title='Energy Production Mortality Rates 2021 ',
+                labels={'Deaths per TWh of electricity production': 'Deaths/TWh'},
+                height=600
+            )
+            fig_death.update_xaxes(type='log', range=[-1, 2], title='Deaths per TWh (log scale)') 
+            fig_death.update_layout(
+                yaxis={'categoryorder': 'total ascending'},
+                coloraxis_colorbar=dict(title='Deaths/TWh'),
+                template='plotly_white'
+            )
+            show_figure(fig_death, 'death_rate_per_twh')
+        else:
+            print("Warning (DeathRate): df_death is empty after processing. Skipping graph.")
     print("-" * 50)
 
 
-def generate_global_energy_substitution_graphs():
+def _load_substitution(path):
+    return compact_frame(pd.read_csv(path).set_index('Year'))
+
+
+def generate_global_energy_substitution_graphs(frame_step=None):
+    mark_stage('load')
     try:
-        df_sub = pd.read_csv(f'{BASE_PATH}\\Global Energy Substitution from 1983 to 2022\\global-energy-substitution.csv')
+        df_sub = exact_floats(load_cached(f'{BASE_PATH}\\Global Energy Substitution from 1983 to 2022\\global-energy-substitution.csv',
+                                          _load_substitution, tag='compact'))
     except FileNotFoundError:
         print(f"Error (EnergySub): CSV not found at {BASE_PATH}\\Global Energy Substitution from 1983 to 2022\\global-energy-substitution.csv. Skipping these graphs.")
         return
 
-    df_sub.set_index('Year', inplace=True)
-
-    total_energy = df_sub.sum().sort_values(ascending=False)
-    if not total_energy.empty:
-        fig1_sub = px.bar(total_energy, 
-                        title='Total Energy Consumption by Source (1983-2022) ',
-                        labels={'value': 'Energy Units', 'index': 'Energy Source'},
-                        color=total_energy.index)
-        fig1_sub.update_layout(xaxis_tickangle=-45)
-        fig1_sub.show()
-    else:
-        print("Warning (EnergySub): total_energy Series is empty. Skipping fig1_sub.")
-
-
-    fossil_fuels = df_sub[['Coal', 'Oil', 'Gas']].sum(axis=1)
-    renewables = df_sub[['Hydropower', 'Wind', 'Solar', 'Biofuels', 'Other_renewables']].sum(axis=1)
-    fig2_sub = go.Figure()
-    fig2_sub.add_trace(go.Scatter(x=df_sub.index, y=fossil_fuels, mode='lines', name='Fossil Fuels (Coal+Oil+Gas)'))
-    fig2_sub.add_trace(go.Scatter(x=df_sub.index, y=renewables, mode='lines', name='Renewables (Hydro+Wind+Solar+Bio)'))
-    fig2_sub.add_trace(go.Scatter(x=df_sub.index, y=df_sub['Nuclear'], mode='lines', name='Nuclear'))
-    fig2_sub.update_layout(title='Fossil Fuels vs Renewables vs Nuclear Over Time ', yaxis_title='Energy Units')
-    fig2_sub.show()
-
-    renewable_sources = ['Solar', 'Wind', 'Biofuels', 'Other_renewables', 'Hydropower']
-    fig3_sub = px.line(df_sub[renewable_sources], 
-                    title='Growth of Renewable Energy Sources ',
-                    labels={'value': 'Energy Units', 'Year': 'Year'})
-    fig3_sub.update_layout(hovermode='x unified')
-    fig3_sub.show()
-
-    energy_mix_cols = ['Coal', 'Oil', 'Gas', 'Nuclear', 'Hydropower', 'Wind', 'Solar', 'Biofuels']
-    valid_energy_mix_cols = [col for col in energy_mix_cols if col in df_sub.columns]
-
-    if valid_energy_mix_cols:
-        fig_mix_sub = px.area(
-            df_sub[valid_energy_mix_cols],
-            title="🌍 Global Energy Mix Over Time ",
-            labels={'value': 'Energy Units', 'Year': 'Year'}
-        )
-        fig_mix_sub.update_layout(hovermode="x unified", legend=dict(orientation="h", yanchor="bottom", y=1.02))
-        fig_mix_sub.show()
-    else:
-        print("Warning (EnergySub): No valid columns for energy mix area chart. Skipping.")
+    if figure_wanted('substitution_total_by_source'):
+        mark_stage('aggregate', len(df_sub))
+        total_energy = df_sub.sum().sort_values(ascending=False)
+        mark_stage('figures', len(total_energy))
+        if not total_energy.empty:
+            fig1_sub = px.bar(total_energy, 
+                            title='Total Energy Consumption by Source (1983-2022) ',
+                            labels={'value': 'Energy Units', 'index': 'Energy Source'},
+                            color=total_energy.index)
+            fig1_sub.update_layout(xaxis_tickangle=-45)
+            show_figure(fig1_sub, 'substitution_total_by_source')
+        else:
+            print("Warning (EnergySub): total_energy Series is empty. Skipping fig1_sub.")
+
+
+    if figure_wanted('substitution_fossil_renewables_nuclear'):
+        mark_stage('aggregate', len(df_sub))
+        groups = rollup_frame(df_sub, category_weights(df_sub.columns, SUBSTITUTION_GROUPS))
+        fossil_fuels, renewables = groups['Fossil Fuels'], groups['Renewables']
+        mark_stage('figures', len(df_sub))
+        fig2_sub = go.Figure()
+        fig2_sub.add_trace(go.Scatter(x=df_sub.index, y=fossil_fuels, mode='lines', name='Fossil Fuels (Coal+Oil+Gas)'))
+        fig2_sub.add_trace(go.Scatter(x=df_sub.index, y=renewables, mode='lines', name='Renewables (Hydro+Wind+Solar+Bio)'))
+        fig2_sub.add_trace(go.Scatter(x=df_sub.index, y=df_sub['Nuclear'], mode='lines', name='Nuclear'))
+        fig2_sub.update_layout(title='Fossil Fuels vs Renewables vs Nuclear Over Time ', yaxis_title='Energy Units')
+        show_figure(fig2_sub, 'substitution_fossil_renewables_nuclear')
+
+    if figure_wanted('substitution_renewables_growth'):
+        renewable_sources = ['Solar', 'Wind', 'Biofuels', 'Other_renewables', 'Hydropower']
+        fig3_sub = px.line(df_sub[renewable_sources], 
+                        title='Growth of Renewable Energy Sources ',
+                        labels={'value': 'Energy Units', 'Year': 'Year'})
+        fig3_sub.update_layout(hovermode='x unified')
+        show_figure(fig3_sub, 'substitution_renewables_growth')
+
+    if figure_wanted('substitution_energy_mix_area'):
+        energy_mix_cols = ['Coal', 'Oil', 'Gas', 'Nuclear', 'Hydropower', 'Wind', 'Solar', 'Biofuels']
+        valid_energy_mix_cols = [col for col in energy_mix_cols if col in df_sub.columns]
+
+        if valid_energy_mix_cols:
+            fig_mix_sub = px.area(
+                df_sub[valid_energy_mix_cols],
+                title="🌍 Global Energy Mix Over Time ",
+                labels={'value': 'Energy Units', 'Year': 'Year'}
+            )
+            fig_mix_sub.update_layout(hovermode="x unified", legend=dict(orientation="h", yanchor="bottom", y=1.02))
+            show_figure(fig_mix_sub, 'substitution_energy_mix_area')
+        else:
+            print("Warning (EnergySub): No valid columns for energy mix area chart. Skipping.")
 
 
-    if 1983 in df_sub.index and 2022 in df_sub.index:
-        year_1983 = df_sub.loc[1983].drop('Traditional_biomass', errors='ignore')
-        year_2022 = df_sub.loc[2022].drop('Traditional_biomass', errors='ignore')
+    if figure_wanted('substitution_mix_1983_vs_2022'):
+        if 1983 in df_sub.index and 2022 in df_sub.index:
+            year_1983 = df_sub.loc[1983].drop('Traditional_biomass', errors='ignore')
+            year_2022 = df_sub.loc[2022].drop('Traditional_biomass', errors='ignore')
         
-        if not year_1983.empty and not year_2022.empty:
-            fig_comparison_sub = make_subplots(rows=1, cols=2, specs=[[{'type': 'pie'}, {'type': 'pie'}]], subplot_titles=['1983 Energy Mix', '2022 Energy Mix'])
-            fig_comparison_sub.add_trace(
-                go.Pie(labels=year_1983.index, values=year_1983.values, name='1983', hole=0.3, marker_colors=px.colors.qualitative.Pastel),
-                row=1, col=1
-            )
-            fig_comparison_sub.add_trace(
-                go.Pie(labels=year_2022.index, values=year_2022.values, name='2022', hole=0.3, marker_colors=px.colors.qualitative.Pastel),
-                row=1, col=2
+            if not year_1983.empty and not year_2022.empty:
+                fig_comparison_sub = make_subplots(rows=1, cols=2, specs=[[{'type': 'pie'}, {'type': 'pie'}]], subplot_titles=['1983 Energy Mix', '2022 Energy Mix'])
+                fig_comparison_sub.add_trace(
+                    go.Pie(labels=year_1983.index, values=year_1983.values, name='1983', hole=0.3, marker_colors=px.colors.qualitative.Pastel),
+                    row=1, col=1
+                )
+                fig_comparison_sub.add_trace(
+                    go.Pie(labels=year_2022.index, values=year_2022.values, name='2022', hole=0.3, marker_colors=px.colors.qualitative.Pastel),
+                    row=1, col=2
+                )
+                fig_comparison_sub.update_layout(
+                    title_text='⚡ Energy Mix Comparison: 1983 vs. 2022 ', showlegend=True,
+                    annotations=[dict(text='1983', x=0.18, y=1.1, font_size=15, showarrow=False),
+                                 dict(text='2022', x=0.82, y=1.1, font_size=15, showarrow=False)]
+                )
+                fig_comparison_sub.update_traces(textposition='inside', textinfo='percent+label')
+                show_figure(fig_comparison_sub, 'substitution_mix_1983_vs_2022')
+            else:
+                print("Warning (EnergySub): Data for 1983 or 2022 is empty after dropping Traditional_biomass. Skipping pie comparison.")
+        else:
+            print("Warning (EnergySub): Year 1983 or 2022 not found in index. Skipping pie comparison.")
+
+
+    if figure_wanted('substitution_mix_animation'):
+        energy_mix_anim_cols = ['Coal', 'Oil', 'Gas', 'Nuclear', 'Hydropower', 'Wind', 'Solar', 'Biofuels', 'Other_renewables']
+        valid_energy_mix_anim_cols = [col for col in energy_mix_anim_cols if col in df_sub.columns]
+
+        if valid_energy_mix_anim_cols and not df_sub.empty:
+            if frame_step is None:
+                frame_step = ANIMATION_FRAME_STEP
+            mark_stage('aggregate', len(df_sub))
+            anim_df = df_sub.sort_index()
+            mix_values = anim_df[valid_energy_mix_anim_cols].fillna(0).to_numpy(dtype='float64')
+            mix_totals = mix_values.sum(axis=1, keepdims=True)
+            mix_shares = np.round(np.divide(mix_values * 100, mix_totals, out=np.zeros_like(mix_values), where=mix_totals > 0), 3)
+            frame_rows = np.arange(0, len(mix_shares), max(1, frame_step))
+            if frame_rows[-1] != len(mix_shares) - 1:
+                frame_rows = np.append(frame_rows, len(mix_shares) - 1)
+            year_labels = anim_df.index.astype(str)
+
+            mark_stage('figures', len(mix_shares))
+            fig_anim_pie_sub = go.Figure()
+            fig_anim_pie_sub.add_trace(
+                go.Pie(
+                    labels=valid_energy_mix_anim_cols,
+                    values=mix_shares[0],
+                    name=year_labels[0], hole=0.3, marker_colors=px.colors.qualitative.Pastel
+                )
             )
-            fig_comparison_sub.update_layout(
-                title_text='⚡ Energy Mix Comparison: 1983 vs. 2022 ', showlegend=True,
-                annotations=[dict(text='1983', x=0.18, y=1.1, font_size=15, showarrow=False),
-                             dict(text='2022', x=0.82, y=1.1, font_size=15, showarrow=False)]
+            frames = [
+                go.Frame(data=[{'type': 'pie', 'values': mix_shares[row].tolist()}], traces=[0], name=year_labels[row])
+                for row in frame_rows
+            ]
+            fig_anim_pie_sub.frames = frames
+            fig_anim_pie_sub.update_layout(
+                title="🌍 Evolution of Global Energy Mix (1983-2022) ",
+                updatemenus=[{
+                    "type": "buttons",
+                    "buttons": [
+                        {"label": "Play", "method": "animate", "args": [None, {"frame": {"duration": 1000}, "fromcurrent": True}]},
+                        {"label": "Pause", "method": "animate", "args": [[None], {"frame": {"duration": 0}, "mode": "immediate"}]}
+                    ], "x": 0.1, "y": 0
+                }],
+                sliders=[{
+                    "steps": [{"args": [[f.name], {"frame": {"duration": 0}, "mode": "immediate"}],
+                                "label": f.name, "method": "animate"} for f in frames],
+                    "x": 0.1, "len": 0.9, "currentvalue": {"prefix": "Year: "}
+                }]
             )
-            fig_comparison_sub.update_traces(textposition='inside', textinfo='percent+label')
-            fig_comparison_sub.show()
+            fig_anim_pie_sub.update_traces(textposition='inside', textinfo='percent+label')
+            show_figure(fig_anim_pie_sub, 'substitution_mix_animation')
         else:
-            print("Warning (EnergySub): Data for 1983 or 2022 is empty after dropping Traditional_biomass. Skipping pie comparison.")
-    else:
-        print("Warning (EnergySub): Year 1983 or 2022 not found in index. Skipping pie comparison.")
-
+            print("Warning (EnergySub): No valid columns or initial data for animated pie chart. Skipping.")
 
-    energy_mix_anim_cols = ['Coal', 'Oil', 'Gas', 'Nuclear', 'Hydropower', 'Wind', 'Solar', 'Biofuels', 'Other_renewables']
-    valid_energy_mix_anim_cols = [col for col in energy_mix_anim_cols if col in df_sub.columns]
-    years = df_sub.index.unique()
+    print("-" * 50)
 
-    if valid_energy_mix_anim_cols and not df_sub.loc[df_sub.index.min()][valid_energy_mix_anim_cols].empty:
-        fig_anim_pie_sub = go.Figure()
-        fig_anim_pie_sub.add_trace(
-            go.Pie(
-                labels=valid_energy_mix_anim_cols,
-                values=df_sub.loc[df_sub.index.min()][valid_energy_mix_anim_cols],
-                name=str(df_sub.index.min()), hole=0.3, marker_colors=px.colors.qualitative.Pastel
-            )
-        )
-        frames = []
-        for year_val in years:
-            frames.append(
-                go.Frame(
-                    data=[go.Pie(
-                        labels=valid_energy_mix_anim_cols,
-                        values=df_sub.loc[year_val][valid_energy_mix_anim_cols],
-                        name=str(year_val))
-                    ],
-                    name=str(year_val)
-                )
-            )
-        fig_anim_pie_sub.frames = frames
-        fig_anim_pie_sub.update_layout(
-            title="🌍 Evolution of Global Energy Mix (1983-2022) ",
-            updatemenus=[{
-                "type": "buttons",
-                "buttons": [
-                    {"label": "Play", "method": "animate", "args": [None, {"frame": {"duration": 1000}, "fromcurrent": True}]},
-                    {"label": "Pause", "method": "animate", "args": [[None], {"frame": {"duration": 0}, "mode": "immediate"}]}
-                ], "x": 0.1, "y": 0
-            }],
-            sliders=[{
-                "steps": [{"args": [[f.name], {"frame": {"duration": 0}, "mode": "immediate"}],
-                            "label": f.name, "method": "animate"} for f in frames],
-                "x": 0.1, "len": 0.9, "currentvalue": {"prefix": "Year: "}
-            }]
-        )
-        fig_anim_pie_sub.update_traces(textposition='inside', textinfo='percent+label')
-        fig_anim_pie_sub.show()
+GENERATORS = {
+    'costs': generate_costs_graphs,
+    'eu': generate_eu_energy_graphs,
+    'sustainable': generate_global_sustainable_energy_graphs,
+    'death_rate': generate_death_rate_graphs,
+    'substitution': generate_global_energy_substitution_graphs,
+}
+
+FIGURE_DEPENDENCIES = {
+    'costs_global_average_lcoe': ('costs', ('lcoe_tables',)),
+    'costs_top_countries_lcoe': ('costs', ('lcoe_tables', 'country_activity')),
+    'eu_price_gap_heatmap': ('eu', ('eu_market',)),
+    'eu_hourly_price_violin': ('eu', ('eu_market',)),
+    'eu_hourly_candlesticks': ('eu', ('eu_market',)),
+    'eu_mirrored_hourly_prices': ('eu', ('eu_market',)),
+    'sustainable_renewables_vs_gdp': ('sustainable', ('sustainable',)),
+    'sustainable_energy_mix_treemap': ('sustainable', ('sustainable',)),
+    'sustainable_country_transition_animation': ('sustainable', ('sustainable',)),
+    'sustainable_global_mix_share': ('sustainable', ('sustainable',)),
+    'sustainable_global_generation_by_source': ('sustainable', ('sustainable',)),
+    'sustainable_renewables_vs_co2_animation': ('sustainable', ('sustainable',)),
+    'death_rate_per_twh': ('death_rate', ('death_rates',)),
+    'substitution_total_by_source': ('substitution', ('substitution',)),
+    'substitution_fossil_renewables_nuclear': ('substitution', ('substitution',)),
+    'substitution_renewables_growth': ('substitution', ('substitution',)),
+    'substitution_energy_mix_area': ('substitution', ('substitution',)),
+    'substitution_mix_1983_vs_2022': ('substitution', ('substitution',)),
+    'substitution_mix_animation': ('substitution', ('substitution',)),
+}
+
+
+def figure_dependencies():
+    dependencies = dict(FIGURE_DEPENDENCIES)
+    for country in SUSTAINABLE_FOCUS_COUNTRIES:
+        dependencies[f'sustainable_{_slug(country)}_comparison_bars'] = ('sustainable', ('sustainable',))
+        dependencies[f'sustainable_{_slug(country)}_stacked_area'] = ('sustainable', ('sustainable',))
+    return dependencies
+
+
+def select_figures(generators=None, figures=None):
+    dependencies = figure_dependencies()
+    unknown = [name for name in figures or [] if name not in dependencies]
+    if unknown:
+        raise ValueError(f"Unknown figures: {', '.join(unknown)}. Run with --list-figures to see the names.")
+    selected = [name for name, (generator, _) in dependencies.items()
+                if (figures is None or name in figures) and (generators is None or generator in generators)]
+    names = [name for name in GENERATORS if any(dependencies[figure][0] == name for figure in selected)]
+    datasets = sorted({dataset for figure in selected for dataset in dependencies[figure][1]})
+    return names, (None if figures is None else selected), datasets
+
+
+def _dataset_wanted(dataset):
+    if SELECTED_FIGURES is None:
+        return True
+    dependencies = figure_dependencies()
+    return any(dataset in dependencies[figure][1] for figure in SELECTED_FIGURES if figure in dependencies)
+
+
+def _run_settings():
+    return {'EU_STREAMING': EU_STREAMING, 'EU_INCREMENTAL': EU_INCREMENTAL, 'DATAFRAME_BACKEND': DATAFRAME_BACKEND,
+            'COMPUTE_ONLY': COMPUTE_ONLY, 'SELECTED_FIGURES': SELECTED_FIGURES, 'ANIMATION_FRAME_STEP': ANIMATION_FRAME_STEP}
+
+
+def _configure_worker(settings, output_dir, formats):
+    globals().update(settings)
+    if output_dir:
+        configure_export(output_dir, formats, defer_index=True)
+
+
+def _run_generator(name, profiling=None):
+    configure_compute_only(COMPUTE_ONLY)
+    configure_figure_filter(SELECTED_FIGURES)
+    if profiling is None:
+        GENERATORS[name]()
+        return None
+    with track_stages(name, memory=profiling['memory'],
+                      profile_path=profile_path_for(profiling['cprofile_dir'], name)) as run:
+        GENERATORS[name]()
+    return run
+
+
+def _run_generator_in_worker(name, profiling=None):
+    if export_enabled():
+        run = _run_generator(name, profiling)
+        return [], take_exported_records(), run
+    start_collecting()
+    try:
+        run = _run_generator(name, profiling)
+    finally:
+        figures = stop_collecting()
+    return figures, [], run
+
+
+def run_generators(names=None, parallel=False, workers=None, output_dir=None, formats=EXPORT_FORMATS,
+                   profile_report=None, profile_memory=False, cprofile_dir=None, figures=None):
+    global SELECTED_FIGURES
+    names, SELECTED_FIGURES, datasets = select_figures(names, figures)
+    if not names:
+        print("Warning (Report): no figures match the selected generators and figures. Nothing to run.")
+        return
+    if figures is not None or len(names) < len(GENERATORS):
+        print(f"Report: running {', '.join(names)}; loading {', '.join(datasets)}")
+    if output_dir:
+        configure_export(output_dir, formats)
+    profiling = None
+    if profile_report or cprofile_dir:
+        profiling = {'memory': profile_memory, 'cprofile_dir': os.path.abspath(cprofile_dir) if cprofile_dir else None}
+
+    runs = []
+    if not parallel:
+        for name in names:
+            runs.append(_run_generator(name, profiling))
     else:
-        print("Warning (EnergySub): No valid columns or initial data for animated pie chart. Skipping.")
+        records = []
+        with ProcessPoolExecutor(max_workers=workers or len(names), initializer=_configure_worker,
+                                 initargs=(_run_settings(), output_dir, formats)) as executor:
+            futures = {name: executor.submit(_run_generator_in_worker, name, profiling) for name in names}
+            for name in names:
+                try:
+                    figures, exported, run = futures[name].result()
+                except Exception as exc:
+                    print(f"Error ({name}): generator failed in worker process: {exc!r}")
+                    continue
+                for figure_name, fig in figures:
+                    show_figure(fig, figure_name)
+                records.extend(exported)
+                runs.append(run)
+        if records:
+            update_index(records, output_dir)
+
+    if profile_report:
+        settings = dict(_run_settings(), parallel=parallel, profile_memory=profile_memory, cprofile_dir=cprofile_dir)
+        path = write_profile_report([run for run in runs if run is not None], profile_report, settings)
+        print(f"Profile report written to {path}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Green versus traditional energy sources report generator.')
+    parser.add_argument('--generators', nargs='+', choices=list(GENERATORS), default=None,
+                        help='run only these generators (default: all)')
+    parser.add_argument('--figures', nargs='+', default=None,
+                        help='build only these figures and load only the datasets they need (see --list-figures)')
+    parser.add_argument('--list-figures', action='store_true',
+                        help='print every figure name with its generator and datasets, then exit')
+    parser.add_argument('--parallel', action='store_true',
+                        help='run the report generators in a process pool')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='number of worker processes for --parallel (default: one per generator)')
+    parser.add_argument('--output-dir', default=None,
+                        help='write every figure to this directory instead of opening a browser (headless mode)')
+    parser.add_argument('--formats', nargs='+', choices=['html', 'json'], default=list(EXPORT_FORMATS),
+                        help='file formats written in headless mode (default: html json)')
+    parser.add_argument('--eu-streaming', action='store_true',
+                        help='read the EU market file in chunks and keep only hourly aggregates')
+    parser.add_argument('--eu-incremental', action='store_true',
+                        help='only process EU market rows that are new or revised since the last run (state in .energy_cache/eu_state)')
+    parser.add_argument('--backend', choices=FRAME_BACKENDS, default=DATAFRAME_BACKEND,
+                        help=f"engine for the EU and yearly aggregations; polars and duckdb are optional installs "
+                             f"(installed here: {', '.join(available_backends())}; default: pandas)")
+    parser.add_argument('--compute-only', action='store_true',
+                        help='load and aggregate the data and print the tables, but build no figures (plotly is never imported)')
+    parser.add_argument('--frame-step', type=int, default=ANIMATION_FRAME_STEP,
+                        help='keep every N-th year in the animated energy mix pie (default: every year)')
+    parser.add_argument('--profile-report', default=None,
+                        help='write per-stage wall time, CPU time and row counts of every generator to this JSON file')
+    parser.add_argument('--profile-memory', action='store_true',
+                        help='also record the peak tracemalloc memory of every stage (slows the run down)')
+    parser.add_argument('--cprofile-dir', default=None,
+                        help='write a cProfile dump per generator to this directory (<generator>.prof)')
+    parser.add_argument('--clear-cache', action='store_true',
+                        help=f'delete the cached Parquet datasets in {CACHE_DIR} before running, so every CSV is parsed again')
+    return parser.parse_args(argv)
 
-    print("-" * 50)
 
 if __name__ == "__main__":
-    
-    generate_costs_graphs()
-    generate_eu_energy_graphs()
-    generate_global_sustainable_energy_graphs()
-    generate_death_rate_graphs()
-    generate_global_energy_substitution_graphs()
-    
+    args = parse_args()
+    EU_STREAMING = args.eu_streaming
+    EU_INCREMENTAL = args.eu_incremental
+    DATAFRAME_BACKEND = args.backend
+    COMPUTE_ONLY = args.compute_only
+    ANIMATION_FRAME_STEP = args.frame_step
+    if args.clear_cache:
+        print(f"Cache: removed {clear_cache()} cached datasets from {CACHE_DIR}")
+    if args.list_figures:
+        for figure, (generator, datasets) in figure_dependencies().items():
+            print(f"{figure:45} {generator:13} {', '.join(datasets)}")
+    elif DATAFRAME_BACKEND not in available_backends():
+        print(f"Error (Report): the {DATAFRAME_BACKEND} backend is not installed. Installed backends: {', '.join(available_backends())}")
+    else:
+        try:
+            select_figures(args.generators, args.figures)
+        except ValueError as exc:
+            print(f"Error (Report): {exc}")
+        else:
+            run_generators(args.generators, parallel=args.parallel, workers=args.workers, output_dir=args.output_dir,
+                           formats=args.formats, profile_report=args.profile_report, profile_memory=args.profile_memory,
+                           cprofile_dir=args.cprofile_dir, figures=args.figures)
@@ -3,6 +3,8 @@ import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
+from figure_output import show_figure
+
 
 df_eu = pd.read_csv('Data-Analysis-Between-Traditional-and-Green-sources-of-energy\EU_energy data\EU_energy_data.csv')
 
@@ -53,7 +55,7 @@ fig = px.density_heatmap(price_diff.reset_index(),
                         color_continuous_scale='RdBu',
                         range_color=[-50, 50])
 fig.update_layout(yaxis_title='Date', xaxis_title='Hour of Day')
-fig.show()
+show_figure(fig, 'eu_price_gap_heatmap')
 
 if 'hour' not in df_eu.columns:
     df_eu['hour'] = pd.to_datetime(df_eu['time']).dt.hour
@@ -81,7 +83,7 @@ fig.update_layout(
     violingap=0.2,
     violingroupgap=0
 )
-fig.show()
+show_figure(fig, 'eu_hourly_price_violin')
 
 
 
@@ -124,7 +126,7 @@ fig.update_xaxes(
     row=2, col=1
 )
 
-fig.show()
+show_figure(fig, 'eu_hourly_candlesticks')
 
 
 hourly_avg = df_eu.groupby(['hour', 'is_green_energy'])['price_eur_mwh'].mean().unstack()
@@ -159,4 +161,4 @@ fig.update_layout(
     yaxis_title="Price (€/MWh)",
     hovermode='x unified'
 )
-fig.show()
\ No newline at end of file
+show_figure(fig, 'eu_mirrored_hourly_prices')
\ No newline at end of file
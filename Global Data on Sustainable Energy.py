@@ -1,6 +1,8 @@
 import pandas as pd
 import plotly.express as px
 
+from figure_output import show_figure
+
 df = pd.read_csv('Data-Analysis-Between-Traditional-and-Green-sources-of-energy\Global Data on Sustainable Energy (2000-2020)\global-data-on-sustainable-energy (1).csv')  # Replace with your actual file path
 
 
@@ -25,7 +27,7 @@ fig = px.scatter(viz_df,
                  log_x=True,
                  size_max=60,
                  title='Renewable Energy vs GDP (Size = CO2 Emissions)')
-fig.show()
+show_figure(fig, 'sustainable_renewables_vs_gdp')
 
 latest_year = df['Year'].max()
 year_df = df[df['Year'] == latest_year].copy()
@@ -60,7 +62,7 @@ if not year_df.empty:
             ticksuffix='%'
         )
     )
-    fig.show()
+    show_figure(fig, 'sustainable_energy_mix_treemap')
 else:
     print("No valid data available for visualization after filtering.")
 
@@ -89,7 +91,7 @@ def create_comparison_bars(country):
     )
     return fig
 
-create_comparison_bars('France').show()
+show_figure(create_comparison_bars('France'), 'sustainable_france_comparison_bars')
 
 def create_stacked_area(country):
     country_data = df[(df['Entity'] == country) & 
@@ -114,7 +116,7 @@ def create_stacked_area(country):
     )
     return fig
 
-create_stacked_area('France').show()
+show_figure(create_stacked_area('France'), 'sustainable_france_stacked_area')
 
 
 def create_animated_barchart(countries):
@@ -144,7 +146,7 @@ def create_animated_barchart(countries):
     )
     return fig
 
-create_animated_barchart(['Germany', 'France', 'United States', 'China']).show()
+show_figure(create_animated_barchart(['Germany', 'France', 'United States', 'China']), 'sustainable_country_transition_animation')
 
 global_df = df.groupby('Year')[['Electricity from fossil fuels (TWh)',
                               'Electricity from nuclear (TWh)',
@@ -172,7 +174,7 @@ fig.update_layout(
     hovermode="x unified",
     barmode='stack'
 )
-fig.show()
+show_figure(fig, 'sustainable_global_mix_share')
 
 fig = px.line(global_df.melt(id_vars='Year', 
                             value_vars=['Electricity from fossil fuels (TWh)',
@@ -191,7 +193,7 @@ fig.update_layout(
     yaxis_title="Generation (TWh)"
 )
 fig.for_each_annotation(lambda a: a.update(text=a.text.split("=")[-1]))
-fig.show()
+show_figure(fig, 'sustainable_global_generation_by_source')
 
 fig = px.scatter(
     df,
@@ -206,4 +208,4 @@ fig = px.scatter(
     title='<b>Renewable Energy Adoption vs CO₂ Emissions Over Time</b>'
 )
 fig.update_layout(showlegend=False)
-fig.show()
\ No newline at end of file
+show_figure(fig, 'sustainable_renewables_vs_co2_animation')
\ No newline at end of file
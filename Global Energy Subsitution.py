@@ -3,6 +3,8 @@ import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
+from figure_output import show_figure
+
 
 df = pd.read_csv('Data-Analysis-Between-Traditional-and-Green-sources-of-energy\Global Energy Substitution from 1983 to 2022\global-energy-substitution.csv')
 
@@ -36,9 +38,9 @@ fig3 = px.line(df[renewable_sources],
 fig3.update_layout(hovermode='x unified')
 
 
-fig1.show()
-fig2.show()
-fig3.show()
+show_figure(fig1, 'substitution_total_by_source')
+show_figure(fig2, 'substitution_fossil_renewables_nuclear')
+show_figure(fig3, 'substitution_renewables_growth')
 
 
 
@@ -52,7 +54,7 @@ fig_mix.update_layout(
     hovermode="x unified",
     legend=dict(orientation="h", yanchor="bottom", y=1.02)
 )
-fig_mix.show()
+show_figure(fig_mix, 'substitution_energy_mix_area')
 
 
 
@@ -95,7 +97,7 @@ fig_comparison.update_layout(
 )
 fig_comparison.update_traces(textposition='inside', textinfo='percent+label')
 
-fig_comparison.show()
+show_figure(fig_comparison, 'substitution_mix_1983_vs_2022')
 
 energy_mix = ['Coal', 'Oil', 'Gas', 'Nuclear', 'Hydropower', 'Wind', 'Solar', 'Biofuels', 'Other_renewables']
 years = df.index.unique()
@@ -161,4 +163,4 @@ fig.update_layout(
 
 fig.update_traces(textposition='inside', textinfo='percent+label')
 
-fig.show()
\ No newline at end of file
+show_figure(fig, 'substitution_mix_animation')
\ No newline at end of file
@@ -0,0 +1,408 @@
+import argparse
+import contextlib
+import csv
+import io
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from importlib.metadata import PackageNotFoundError, version
+
+import numpy as np
+import pandas as pd
+
+import dtype_policy
+import energy_cache
+from datetime_parsing import clear_parse_cache
+from dtype_policy import compact_frame, memory_report
+from eu_energy import clean_eu_frame
+from eu_synthetic import (SYNTHETIC_DAYS, append_synthetic_revisions, minimum_synthetic_days, synthetic_eu_chunks,
+                          write_synthetic_eu_csv)
+from figure_output import start_collecting, stop_collecting
+from lcoe_tables import LCOE_METRIC, load_cost_tables
+from pipeline_stages import track_stages
+from renewables_store import build_renewables_store, renewables_paths
+from report_module import load_report_module
+
+
+BENCHMARK_GENERATORS = ['costs', 'eu', 'sustainable', 'substitution']
+EU_BENCHMARK_ROWS = [10_000, 100_000, 1_000_000, 10_000_000]
+DATASET_SCALES = [1, 4]
+DTYPE_REPORT_EU_ROWS = 1_000_000
+DTYPE_CHECK_GENERATORS = ['costs', 'sustainable', 'death_rate', 'substitution']
+IMPORT_TIME_GENERATOR = 'costs'
+PLOTLY_PACKAGES = ('plotly', '_plotly_utils')
+RESULTS_DIR = 'benchmark_results'
+
+SUSTAINABLE_CSV = 'Global Data on Sustainable Energy (2000-2020)\\global-data-on-sustainable-energy (1).csv'
+SUBSTITUTION_CSV = 'Global Energy Substitution from 1983 to 2022\\global-energy-substitution.csv'
+DEATH_RATE_CSV = 'Nuclear Energy Datasets\\rates_death_from_energy_production_per_twh.csv'
+COSTS_DIR = 'excel_conversions'
+
+
+def _scaled_path(base, relative):
+    path = f'{base}\\{relative}'
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    return path
+
+
+def _write_scaled_sustainable(source_base, target_base, scale):
+    df = pd.read_csv(f'{source_base}\\{SUSTAINABLE_CSV}')
+    copies = [df] + [df.assign(Entity=df['Entity'] + f' #{copy}') for copy in range(1, scale)]
+    pd.concat(copies, ignore_index=True).to_csv(_scaled_path(target_base, SUSTAINABLE_CSV), index=False)
+    return len(df) * scale
+
+
+def _write_scaled_substitution(source_base, target_base, scale):
+    df = pd.read_csv(f'{source_base}\\{SUBSTITUTION_CSV}')
+    span = df['Year'].max() - df['Year'].min() + 1
+    copies = [df.assign(Year=df['Year'] - span * copy) for copy in range(scale)]
+    pd.concat(copies, ignore_index=True).sort_values('Year').to_csv(_scaled_path(target_base, SUBSTITUTION_CSV), index=False)
+    return len(df) * scale
+
+
+def _write_scaled_costs(source_base, target_base, scale):
+    source_dir = f'{source_base}\\{COSTS_DIR}'
+    target_dir = f'{target_base}\\{COSTS_DIR}'
+    os.makedirs(target_dir, exist_ok=True)
+    shutil.copyfile(f'{source_dir}\\1_1.csv', _scaled_path(target_base, f'{COSTS_DIR}\\1_1.csv'))
+    data_rows = 0
+    for file_name in sorted(os.listdir(source_dir)):
+        if not file_name.startswith('3_'):
+            continue
+        with open(os.path.join(source_dir, file_name), encoding='utf-8', newline='') as source_file:
+            records = list(csv.reader(source_file))
+        output = []
+        for record in records:
+            is_data = (len(record) > 3 and record[2].strip() not in ('', 'Technology')
+                       and pd.to_numeric(pd.Series(record[3:], dtype='object'), errors='coerce').notna().any())
+            output.extend([record] * (scale if is_data else 1))
+            data_rows += scale if is_data else 0
+        with open(os.path.join(target_dir, file_name), 'w', encoding='utf-8', newline='') as target_file:
+            csv.writer(target_file).writerows(output)
+    return data_rows
+
+
+SCALED_DATASETS = {
+    'costs': _write_scaled_costs,
+    'sustainable': _write_scaled_sustainable,
+    'substitution': _write_scaled_substitution,
+}
+
+
+def _stage_summary(stages):
+    return {stage: round(record['wall_seconds'], 3) for stage, record in stages.items()}
+
+
+def _run_timed(report, name, memory=False, **kwargs):
+    clear_parse_cache()
+    start_collecting()
+    try:
+        with track_stages(name, memory=memory) as run, contextlib.redirect_stdout(io.StringIO()):
+            report.GENERATORS[name](**kwargs)
+    finally:
+        figures = stop_collecting()
+    return {
+        'stages': run['stages'],
+        'total_seconds': run['wall_seconds'],
+        'cpu_seconds': run['cpu_seconds'],
+        'peak_traced_bytes': run['peak_traced_bytes'],
+        'figures': len(figures),
+    }
+
+
+def benchmark_eu_incremental(report, rows, days, work_dir, run, memory=False):
+    path = os.path.join(work_dir, f'eu_incremental_{rows}.csv')
+    state_dir = os.path.join(work_dir, f'eu_state_{rows}')
+    write_synthetic_eu_csv(path, rows, days=days)
+    results = []
+    for phase in ('initial', 'revisions'):
+        revised = append_synthetic_revisions(path, rows, days=days) if phase == 'revisions' else 0
+        result = _run_timed(report, 'eu', memory, incremental=True, eu_path=path, eu_state_dir=state_dir)
+        result.update({'generator': 'eu', 'input': {'rows': rows, 'incremental': phase, 'revised_rows': revised}, 'run': run})
+        results.append(result)
+        print(f"Benchmark (eu): {rows} rows incremental {phase} ({revised} revised) -> "
+              f"{result['total_seconds']:.3f}s {_stage_summary(result['stages'])}")
+    shutil.rmtree(state_dir, ignore_errors=True)
+    os.remove(path)
+    return results
+
+
+def benchmark_eu(report, rows_list, work_dir, repeat=1, streaming=False, memory=False, incremental=False):
+    results = []
+    for rows in rows_list:
+        days = max(SYNTHETIC_DAYS, minimum_synthetic_days(rows))
+        if incremental:
+            for run in range(repeat):
+                results.extend(benchmark_eu_incremental(report, rows, days, work_dir, run, memory))
+            continue
+        path = os.path.join(work_dir, f'eu_synthetic_{rows}.csv')
+        started = time.perf_counter()
+        write_synthetic_eu_csv(path, rows, days=days)
+        print(f"Benchmark (eu): wrote {rows} synthetic rows in {time.perf_counter() - started:.1f}s")
+        for run in range(repeat):
+            result = _run_timed(report, 'eu', memory, streaming=streaming, eu_path=path)
+            result.update({'generator': 'eu', 'input': {'rows': rows, 'streaming': streaming}, 'run': run})
+            results.append(result)
+            print(f"Benchmark (eu): {rows} rows -> {result['total_seconds']:.3f}s {_stage_summary(result['stages'])}")
+        os.remove(path)
+    return results
+
+
+def benchmark_datasets(report, names, scales, work_dir, repeat=1, memory=False):
+    source_base = report.BASE_PATH
+    results = []
+    for scale in scales:
+        target_base = os.path.join(work_dir, f'scale_{scale}')
+        os.makedirs(target_base, exist_ok=True)
+        report.BASE_PATH = target_base
+        try:
+            for name in names:
+                input_rows = SCALED_DATASETS[name](source_base, target_base, scale)
+                for run in range(repeat):
+                    result = _run_timed(report, name, memory)
+                    result.update({'generator': name, 'input': {'scale': scale, 'rows': input_rows}, 'run': run})
+                    results.append(result)
+                    print(f"Benchmark ({name}): scale {scale} -> {result['total_seconds']:.3f}s {_stage_summary(result['stages'])}")
+        finally:
+            report.BASE_PATH = source_base
+    return results
+
+
+_IMPORT_TIME_SCRIPT = '''
+import sys
+sys.path.insert(0, {repo_dir!r})
+from figure_output import start_collecting, stop_collecting
+from report_module import load_report_module
+report = load_report_module()
+report.COMPUTE_ONLY = {compute_only!r}
+try:
+    import pyarrow.parquet
+except ImportError:
+    pass
+start_collecting()
+report._run_generator({generator!r})
+stop_collecting()
+'''
+
+
+def _parse_import_times(stderr):
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip(' ')) - 1) // 2
+        imports.append({'name': name.strip(), 'depth': depth, 'self_us': int(self_us), 'cumulative_us': int(cumulative_us)})
+
+    ancestors = []
+    for record in reversed(imports):
+        while ancestors and ancestors[-1]['depth'] >= record['depth']:
+            ancestors.pop()
+        record['parent'] = ancestors[-1]['name'] if ancestors else None
+        ancestors.append(record)
+    return imports
+
+
+def _is_plotly(name):
+    return name is not None and name.split('.')[0] in PLOTLY_PACKAGES
+
+
+def benchmark_import_time(generator=IMPORT_TIME_GENERATOR, repeat=1):
+    repo_dir = os.path.dirname(os.path.abspath(__file__))
+    results = []
+    for compute_only in (False, True):
+        script = _IMPORT_TIME_SCRIPT.format(repo_dir=repo_dir, compute_only=compute_only, generator=generator)
+        for run in range(repeat):
+            started = time.perf_counter()
+            completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', script], capture_output=True, text=True)
+            elapsed = time.perf_counter() - started
+            if completed.returncode:
+                print(f"Error (Benchmark): import time run failed: {completed.stderr.strip().splitlines()[-1]}")
+                continue
+            imports = _parse_import_times(completed.stderr)
+            timed = [record for record in imports if record['self_us'] >= 0 and record['cumulative_us'] >= 0]
+            plotly_imports = [record for record in timed if _is_plotly(record['name'])]
+            result = {
+                'generator': 'import-time',
+                'input': {'generator': generator, 'compute_only': compute_only},
+                'run': run,
+                'total_seconds': elapsed,
+                'import_seconds': sum(record['cumulative_us'] for record in timed if record['depth'] == 0) / 1e6,
+                'plotly_import_seconds': sum(record['cumulative_us'] for record in plotly_imports
+                                             if not _is_plotly(record['parent'])) / 1e6,
+                'modules_imported': len(imports),
+                'plotly_modules_imported': len(plotly_imports),
+            }
+            results.append(result)
+            mode = 'compute-only' if compute_only else 'with figures'
+            print(f"Benchmark (import): {generator} {mode} -> {elapsed:.3f}s wall, {result['import_seconds']:.3f}s in imports, "
+                  f"{result['plotly_import_seconds']:.3f}s importing plotly ({len(plotly_imports)} plotly modules)")
+    return results
+
+
+def dataset_memory_report(report, eu_rows=DTYPE_REPORT_EU_ROWS):
+    base = report.BASE_PATH
+    loaders = {
+        'eu (synthetic)': lambda: clean_eu_frame(pd.concat(synthetic_eu_chunks(eu_rows), ignore_index=True))[0],
+        'sustainable': lambda: pd.read_csv(f'{base}\\{SUSTAINABLE_CSV}'),
+        'renewables': lambda: build_renewables_store(renewables_paths(), compact=False),
+        'substitution': lambda: pd.read_csv(f'{base}\\{SUBSTITUTION_CSV}').set_index('Year'),
+        'death_rate': lambda: pd.read_csv(f'{base}\\{DEATH_RATE_CSV}'),
+        'lcoe': lambda: load_cost_tables(f'{base}\\{COSTS_DIR}', metrics=[LCOE_METRIC], compact=False),
+    }
+    frames = {}
+    for name, load in loaders.items():
+        try:
+            default = load()
+        except FileNotFoundError as exc:
+            print(f"Warning (Benchmark): {name} dataset not found ({exc}). Skipping its memory report.")
+            continue
+        frames[name] = (default, compact_frame(default))
+    return memory_report(frames)
+
+
+def _same_figure_values(left, right):
+    if isinstance(left, dict) and isinstance(right, dict):
+        return left.keys() == right.keys() and all(_same_figure_values(left[key], right[key]) for key in left)
+    if isinstance(left, (list, tuple)) and isinstance(right, (list, tuple)):
+        return len(left) == len(right) and all(map(_same_figure_values, left, right))
+    if isinstance(left, np.ndarray) or isinstance(right, np.ndarray):
+        left, right = np.asarray(left), np.asarray(right)
+        return left.shape == right.shape and bool(np.all((left == right) | (pd.isna(left) & pd.isna(right))))
+    return bool(left == right) or (pd.isna(left) is True and pd.isna(right) is True)
+
+
+def _generator_figures(report, name):
+    start_collecting()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            report.GENERATORS[name]()
+    finally:
+        figures = stop_collecting()
+    return {figure_name: fig.to_dict() for figure_name, fig in figures}
+
+
+def check_compact_figures(report, names=DTYPE_CHECK_GENERATORS):
+    cache_enabled = energy_cache.CACHE_ENABLED
+    energy_cache.CACHE_ENABLED = False
+    baseline, compact = {}, {}
+    try:
+        dtype_policy.COMPACT_ENABLED = False
+        try:
+            for name in names:
+                baseline.update(_generator_figures(report, name))
+        finally:
+            dtype_policy.COMPACT_ENABLED = True
+        for name in names:
+            compact.update(_generator_figures(report, name))
+    finally:
+        energy_cache.CACHE_ENABLED = cache_enabled
+    differing = sorted(name for name in baseline.keys() | compact.keys()
+                       if name not in baseline or name not in compact or not _same_figure_values(baseline[name], compact[name]))
+    if differing:
+        print(f"Benchmark: compact dtype check FAILED, {len(differing)} figure(s) differ from the default dtypes: {', '.join(differing)}")
+        return False
+    print(f"Benchmark: compact dtype check passed ({len(compact)} figures match the default dtypes)")
+    return True
+
+
+def _git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _package_version(package):
+    try:
+        return version(package)
+    except PackageNotFoundError:
+        return None
+
+
+def environment_info():
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'plotly': _package_version('plotly'),
+        'git_revision': _git_revision(),
+    }
+
+
+def save_results(results, settings, output_dir=RESULTS_DIR):
+    os.makedirs(output_dir, exist_ok=True)
+    stamp = time.strftime('%Y%m%d-%H%M%S')
+    path = os.path.join(output_dir, f'benchmark-{stamp}.json')
+    with open(path, 'w', encoding='utf-8') as results_file:
+        json.dump({'created': stamp, 'environment': environment_info(), 'settings': settings, 'results': results},
+                  results_file, indent=2)
+    return path
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Time the load, clean, aggregate and figure stages of the report generators.')
+    parser.add_argument('--generators', nargs='+', choices=BENCHMARK_GENERATORS, default=BENCHMARK_GENERATORS,
+                        help='generators to benchmark (default: all)')
+    parser.add_argument('--eu-rows', nargs='+', type=int, default=EU_BENCHMARK_ROWS,
+                        help='synthetic EU row counts (default: 10k, 100k, 1M, 10M)')
+    parser.add_argument('--scales', nargs='+', type=int, default=DATASET_SCALES,
+                        help='replication factors for the costs, sustainable and substitution datasets (default: 1 4)')
+    parser.add_argument('--repeat', type=int, default=1,
+                        help='runs per input size (default: 1)')
+    parser.add_argument('--eu-streaming', action='store_true',
+                        help='benchmark the chunked EU reader instead of the in-memory one')
+    parser.add_argument('--eu-incremental', action='store_true',
+                        help='benchmark the incremental EU state: a first run, then a run after a batch of revised rows is appended')
+    parser.add_argument('--memory', action='store_true',
+                        help='record the peak tracemalloc memory of every stage (slows the runs down)')
+    parser.add_argument('--with-cache', action='store_true',
+                        help='keep the parquet cache enabled (default: every run reads and cleans the CSVs)')
+    parser.add_argument('--dtype-report', action='store_true',
+                        help='only print the memory of every dataset with default and compact dtypes')
+    parser.add_argument('--dtype-check', action='store_true',
+                        help='only check that the figures built from compact dtypes match the ones built from default dtypes')
+    parser.add_argument('--import-time', action='store_true',
+                        help=f'only time a cold start of the {IMPORT_TIME_GENERATOR} generator under python -X importtime, with and without --compute-only')
+    parser.add_argument('--output-dir', default=RESULTS_DIR,
+                        help=f'directory for the JSON results (default: {RESULTS_DIR})')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    energy_cache.CACHE_ENABLED = args.with_cache
+    report = load_report_module()
+    if args.dtype_report:
+        print(dataset_memory_report(report).to_string(index=False))
+        return
+    if args.dtype_check:
+        raise SystemExit(0 if check_compact_figures(report) else 1)
+    results = []
+    if args.import_time:
+        results.extend(benchmark_import_time(repeat=args.repeat))
+        path = save_results(results, vars(args), args.output_dir)
+        print(f"Benchmark results written to {path}")
+        return
+    work_dir = tempfile.mkdtemp(prefix='energy-benchmark-')
+    try:
+        if 'eu' in args.generators:
+            results.extend(benchmark_eu(report, args.eu_rows, work_dir, args.repeat, args.eu_streaming, args.memory,
+                                        args.eu_incremental))
+        dataset_names = [name for name in args.generators if name in SCALED_DATASETS]
+        if dataset_names:
+            results.extend(benchmark_datasets(report, dataset_names, args.scales, work_dir, args.repeat, args.memory))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    path = save_results(results, vars(args), args.output_dir)
+    print(f"Benchmark results written to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+
+
+DATE_FORMATS = ['%d/%m/%Y', '%d-%m-%Y', '%Y-%m-%d']
+DATETIME_FORMATS = ['%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d %H:%M:%S.%f',
+                    '%d/%m/%Y %H:%M:%S', '%d/%m/%Y %H:%M', '%Y-%m-%d']
+TIME_FORMATS = ['%H:%M:%S', '%H:%M']
+
+MAX_CACHE_ENTRIES = 1_000_000
+
+_parse_cache = {}
+
+
+def _parse_uniques(uniques, formats, dayfirst):
+    parsed = pd.Series(pd.NaT, index=uniques, dtype='datetime64[ns]')
+    remaining = uniques
+    for fmt in formats:
+        if remaining.empty:
+            break
+        attempt = pd.to_datetime(pd.Series(remaining, index=remaining), format=fmt, errors='coerce')
+        hits = attempt.notna().to_numpy()
+        parsed.loc[remaining[hits]] = attempt[hits].to_numpy()
+        remaining = remaining[~hits]
+    if not remaining.empty:
+        attempt = pd.to_datetime(pd.Series(remaining, index=remaining), format='mixed', dayfirst=dayfirst, errors='coerce')
+        parsed.loc[remaining] = attempt.to_numpy()
+    return parsed
+
+
+def _cached_lookup(uniques, formats, dayfirst):
+    key = (tuple(formats), dayfirst)
+    known = _parse_cache.get(key)
+    if known is None:
+        missing = uniques
+    else:
+        missing = uniques[~uniques.isin(known.index)]
+    if not missing.empty:
+        fresh = _parse_uniques(missing, formats, dayfirst)
+        known = fresh if known is None or len(known) + len(fresh) > MAX_CACHE_ENTRIES else pd.concat([known, fresh])
+        _parse_cache[key] = known
+    return known.reindex(uniques).to_numpy()
+
+
+def parse_datetimes(values, formats=DATETIME_FORMATS, dayfirst=False):
+    values = pd.Series(values)
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values, 0
+
+    codes, uniques = pd.factorize(values)
+    uniques = pd.Index(np.asarray(uniques).astype(str))
+    parsed_uniques = _cached_lookup(uniques, formats, dayfirst)
+
+    parsed = np.full(len(codes), np.datetime64('NaT'), dtype='datetime64[ns]')
+    valid = codes >= 0
+    parsed[valid] = parsed_uniques[codes[valid]]
+    result = pd.Series(parsed, index=values.index, name=values.name)
+    unparsed = int((valid & np.isnat(parsed)).sum())
+    return result, unparsed
+
+
+def parse_dates(values, formats=DATE_FORMATS, dayfirst=True):
+    return parse_datetimes(values, formats=formats, dayfirst=dayfirst)
+
+
+def parse_times(values, formats=TIME_FORMATS):
+    parsed, unparsed = parse_datetimes(values, formats=formats)
+    return parsed - parsed.dt.normalize(), unparsed
+
+
+def parse_hours(values, formats=TIME_FORMATS):
+    parsed, unparsed = parse_datetimes(values, formats=formats)
+    return parsed.dt.hour, unparsed
+
+
+def clear_parse_cache():
+    _parse_cache.clear()
@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+
+
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+FLOAT64_COLUMNS = ['discount_rate']
+FLOAT32_DIGITS = 6
+COMPACT_ENABLED = True
+
+
+def memory_bytes(df):
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def _wants_category(series):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return False
+    if not (pd.api.types.is_object_dtype(series.dtype) or pd.api.types.is_string_dtype(series.dtype)):
+        return False
+    return len(series) > 0 and series.nunique(dropna=True) <= len(series) * CATEGORY_MAX_UNIQUE_RATIO
+
+
+def _round_significant(values, digits=FLOAT32_DIGITS):
+    values = np.asarray(values, dtype='float64')
+    regular = np.isfinite(values) & (values != 0)
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        shift = digits - 1 - np.floor(np.log10(np.abs(np.where(regular, values, 1.0))))
+        scale = 10.0 ** np.abs(shift)
+        rounded = np.where(shift >= 0, np.round(values * scale) / scale, np.round(values / scale) * scale)
+    return np.where(regular, rounded, values)
+
+
+def _fits_float32(values):
+    finite = values[np.isfinite(values)]
+    with np.errstate(over='ignore'):
+        narrowed = finite.astype('float32')
+    return bool(np.array_equal(_round_significant(narrowed), finite))
+
+
+def compact_series(series, name=None):
+    name = series.name if name is None else name
+    dtype = series.dtype
+    if _wants_category(series):
+        return series.astype('category')
+    if pd.api.types.is_bool_dtype(dtype) or not pd.api.types.is_numeric_dtype(dtype):
+        return series
+    if pd.api.types.is_integer_dtype(dtype):
+        return pd.to_numeric(series, downcast='integer')
+    if dtype == 'float64' and name not in FLOAT64_COLUMNS and _fits_float32(series.to_numpy()):
+        return series.astype('float32')
+    return series
+
+
+def compact_frame(df):
+    if not COMPACT_ENABLED:
+        return df
+    compacted = df.copy(deep=False)
+    for column in df.columns:
+        compacted[column] = compact_series(df[column], column)
+    if not isinstance(df.index, pd.MultiIndex) and pd.api.types.is_integer_dtype(df.index.dtype):
+        compacted.index = pd.Index(pd.to_numeric(df.index, downcast='integer'), name=df.index.name)
+    return compacted
+
+
+def exact_floats(df):
+    float32_columns = [column for column in df.columns if df[column].dtype == 'float32']
+    if not float32_columns:
+        return df
+    return df.assign(**{column: _round_significant(df[column].to_numpy(dtype='float64')) for column in float32_columns})
+
+
+def memory_report(frames):
+    rows = []
+    for name, (before, after) in frames.items():
+        before_bytes, after_bytes = memory_bytes(before), memory_bytes(after)
+        rows.append({'dataset': name, 'rows': len(after), 'before_mb': round(before_bytes / 1e6, 2),
+                     'after_mb': round(after_bytes / 1e6, 2),
+                     'saved_pct': round(100 * (1 - after_bytes / before_bytes), 1) if before_bytes else 0.0})
+    return pd.DataFrame(rows, columns=['dataset', 'rows', 'before_mb', 'after_mb', 'saved_pct'])
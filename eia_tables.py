@@ -0,0 +1,92 @@
+import argparse
+import os
+
+import pandas as pd
+
+from dtype_policy import compact_frame
+from energy_cache import load_cached
+
+
+NUCLEAR_DIR = 'Nuclear Energy Datasets'
+EIA_ENCODING = 'utf-8-sig'
+
+NOT_AVAILABLE = 'Not Available'
+WITHHELD = 'W'
+NOT_APPLICABLE = '- -'
+
+EIA_TABLES = {
+    'nuclear_overview': {'file': 'nuclear_energy_overview_eia.csv', 'sentinels': [NOT_AVAILABLE],
+                         'text_columns': ['Month']},
+    'uranium_plants': {'file': 'number_of_plants_producing_uranium_in_us.csv'},
+    'uranium_production': {'file': 'uranium_production_summary_us.csv', 'sentinels': [WITHHELD], 'thousands': ','},
+    'uranium_purchase_price': {'file': 'uranium_purchase_price_us.csv', 'sentinels': [WITHHELD, NOT_APPLICABLE]},
+    'us_generation': {'file': 'us_nuclear_generating_statistics_1971_2021.csv'},
+    'world_monthly_generation': {'file': 'world_electricity_generation.csv'},
+    'world_nuclear_generation': {'file': 'world_nuclear_energy_generation.csv', 'text_columns': ['Entity']},
+    'death_rates': {'file': 'rates_death_from_energy_production_per_twh.csv', 'text_columns': ['Entity'],
+                    'decimal': '.', 'alternate_decimal': ','},
+    'reactor_owners': {'file': 'reactors_parent_companies.csv',
+                       'text_columns': ['Plant Name, Unit Number', 'Parent Company Utility Name', 'Parent Company Website']},
+}
+
+
+def _coerce_leftovers(df, spec, numeric_columns, path):
+    alternate = spec.get('alternate_decimal')
+    for column in numeric_columns:
+        if pd.api.types.is_numeric_dtype(df[column].dtype):
+            continue
+        text = df[column].astype('string').str.strip()
+        if alternate:
+            text = text.str.replace(alternate, spec.get('decimal', '.'), regex=False)
+        values = pd.to_numeric(text, errors='coerce').astype('float64')
+        unexpected = text[values.isna() & text.notna()].unique()
+        if len(unexpected):
+            print(f"Warning (EIA): {len(unexpected)} undeclared markers in '{column}' of {os.path.basename(path)} "
+                  f"({', '.join(map(str, unexpected[:5]))}). Treating them as missing.")
+        df[column] = values
+    return df
+
+
+def read_eia_table(path, spec):
+    df = pd.read_csv(path, encoding=EIA_ENCODING, na_values=spec.get('sentinels', []),
+                     thousands=spec.get('thousands'), decimal=spec.get('decimal', '.'), skipinitialspace=True)
+    df.columns = df.columns.str.strip()
+    numeric_columns = [column for column in df.columns if column not in spec.get('text_columns', [])]
+    return compact_frame(_coerce_leftovers(df, spec, numeric_columns, path))
+
+
+def load_eia_table(name, nuclear_dir=NUCLEAR_DIR):
+    spec = EIA_TABLES[name]
+    return load_cached(os.path.join(nuclear_dir, spec['file']), lambda path: read_eia_table(path, spec), tag=f'eia-{name}')
+
+
+def load_eia_tables(names=None, nuclear_dir=NUCLEAR_DIR):
+    tables = {}
+    for name in names or EIA_TABLES:
+        try:
+            tables[name] = load_eia_table(name, nuclear_dir)
+        except FileNotFoundError:
+            print(f"Warning (EIA): {EIA_TABLES[name]['file']} not found in {nuclear_dir}. Skipping it.")
+    return tables
+
+
+def missing_summary(df):
+    missing = df.isna().sum()
+    return missing[missing > 0]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Load the EIA nuclear and uranium tables as typed, cached frames.')
+    parser.add_argument('--dir', default=NUCLEAR_DIR,
+                        help=f'folder with the EIA CSV files (default: {NUCLEAR_DIR})')
+    parser.add_argument('--table', nargs='+', choices=list(EIA_TABLES), default=None,
+                        help='tables to load (default: all)')
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    for name, table in load_eia_tables(args.table, args.dir).items():
+        print(f"EIA: {name} -> {len(table)} rows, {len(table.columns)} columns")
+        for column, count in missing_summary(table).items():
+            print(f"    {count} missing (sentinel) values in '{column}'")
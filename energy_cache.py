@@ -0,0 +1,106 @@
+import hashlib
+import os
+import re
+
+import pandas as pd
+
+
+CACHE_DIR = '.energy_cache'
+CACHE_ENABLED = True
+CACHE_FORMAT = 2
+
+_engine_warning_shown = False
+
+
+def _source_files(source_path):
+    return [source_path] if isinstance(source_path, str) else list(source_path)
+
+
+def _cache_prefix(source_path, tag):
+    sources = _source_files(source_path)
+    if len(sources) == 1:
+        name = os.path.splitext(re.split(r'[\\/]', sources[0])[-1])[0]
+    else:
+        name = re.split(r'[\\/]', os.path.dirname(os.path.abspath(sources[0])))[-1]
+    location = hashlib.sha1('|'.join(os.path.abspath(source) for source in sources).encode('utf-8')).hexdigest()[:8]
+    return f"{re.sub(r'[^A-Za-z0-9_.-]+', '_', name)}--{re.sub(r'[^A-Za-z0-9_.-]+', '_', tag)}--{location}--"
+
+
+def cache_path_for(source_path, tag='raw', cache_dir=None):
+    stats = [os.stat(source) for source in _source_files(source_path)]
+    key_source = '|'.join(f'{stat.st_mtime_ns}|{stat.st_size}' for stat in stats) + f'|{tag}|{CACHE_FORMAT}'
+    key = hashlib.sha1(key_source.encode('utf-8')).hexdigest()[:16]
+    return os.path.join(cache_dir or CACHE_DIR, f'{_cache_prefix(source_path, tag)}{key}.parquet')
+
+
+def _remove_stale_entries(cache_file, source_path, tag, cache_dir):
+    prefix = _cache_prefix(source_path, tag)
+    for entry in os.listdir(cache_dir):
+        if entry.startswith(prefix) and os.path.join(cache_dir, entry) != cache_file:
+            try:
+                os.remove(os.path.join(cache_dir, entry))
+            except OSError:
+                pass
+
+
+def _write_cache(df, cache_file, source_path, tag, cache_dir, parquet_options=None):
+    global _engine_warning_shown
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_file = f'{cache_file}.{os.getpid()}.tmp'
+    try:
+        df.to_parquet(tmp_file, **(parquet_options or {}))
+        os.replace(tmp_file, cache_file)
+        _remove_stale_entries(cache_file, source_path, tag, cache_dir)
+        return True
+    except ImportError:
+        if not _engine_warning_shown:
+            print("Warning (Cache): no Parquet engine (pyarrow or fastparquet) installed. Datasets will not be cached.")
+            _engine_warning_shown = True
+    except Exception as exc:
+        print(f"Warning (Cache): could not cache {source_path} ({exc}). Continuing without cache.")
+    finally:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+    return False
+
+
+def load_cached(source_path, build, tag='raw', cache_dir=None, parquet_options=None):
+    if not CACHE_ENABLED:
+        return build(source_path)
+
+    cache_dir = cache_dir or CACHE_DIR
+    cache_file = cache_path_for(source_path, tag, cache_dir)
+    if os.path.exists(cache_file):
+        try:
+            return pd.read_parquet(cache_file)
+        except Exception as exc:
+            print(f"Warning (Cache): could not read {cache_file} ({exc}). Rebuilding from {source_path}.")
+
+    df = build(source_path)
+    _write_cache(df, cache_file, source_path, tag, cache_dir, parquet_options)
+    return df
+
+
+def cache_entry(source_path, build, tag='raw', cache_dir=None, parquet_options=None):
+    if not CACHE_ENABLED:
+        return None, build(source_path)
+
+    cache_dir = cache_dir or CACHE_DIR
+    cache_file = cache_path_for(source_path, tag, cache_dir)
+    if os.path.exists(cache_file):
+        return cache_file, None
+
+    df = build(source_path)
+    return (cache_file if _write_cache(df, cache_file, source_path, tag, cache_dir, parquet_options) else None), df
+
+
+def clear_cache(cache_dir=None):
+    cache_dir = cache_dir or CACHE_DIR
+    if not os.path.isdir(cache_dir):
+        return 0
+    removed = 0
+    for entry in os.listdir(cache_dir):
+        if entry.endswith('.parquet'):
+            os.remove(os.path.join(cache_dir, entry))
+            removed += 1
+    return removed
@@ -0,0 +1,224 @@
+import argparse
+import json
+import math
+import time
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+
+from dtype_policy import exact_floats
+from energy_cache import load_cached
+from eu_energy import aggregate_eu_prices, stream_eu_aggregates
+from lcoe_tables import LCOE_METRIC, load_cost_tables
+from report_module import load_report_module
+
+
+SERVICE_HOST = '127.0.0.1'
+SERVICE_PORT = 8765
+QUERY_CACHE_SIZE = 256
+LOOPBACK_HOSTS = ('127.0.0.1', 'localhost')
+TRANSITION_COLUMNS = ['Electricity from fossil fuels (TWh)', 'Electricity from nuclear (TWh)', 'Electricity from renewables (TWh)']
+
+_datasets = {}
+_queries = {}
+
+
+def _load_dataset(name, load):
+    started = time.perf_counter()
+    try:
+        _datasets[name] = load()
+    except FileNotFoundError as exc:
+        print(f"Warning (Service): {name} dataset not found ({exc}). Its endpoint will answer 404.")
+        _datasets[name] = None
+        return
+    print(f"Service: loaded {name} in {time.perf_counter() - started:.2f}s")
+
+
+def load_service_data(report=None):
+    report = report or load_report_module()
+    base = report.BASE_PATH
+
+    def load_sustainable():
+        df = load_cached(f'{base}\\Global Data on Sustainable Energy (2000-2020)\\global-data-on-sustainable-energy (1).csv', report._load_sustainable, tag='compact')
+        return {'frame': df, 'entities': report._entity_index(df)}
+
+    def load_eu():
+        eu_path = f'{base}\\EU_energy data\\EU_energy_data.csv'
+        if report.EU_STREAMING:
+            return stream_eu_aggregates(eu_path)[0]
+        return aggregate_eu_prices(load_cached(eu_path, report._load_eu_energy_data, tag='eu-compact'))
+
+    _load_dataset('substitution', lambda: load_cached(
+        f'{base}\\Global Energy Substitution from 1983 to 2022\\global-energy-substitution.csv', report._load_substitution, tag='compact'))
+    _load_dataset('sustainable', load_sustainable)
+    _load_dataset('lcoe', lambda: load_cost_tables(f'{base}\\excel_conversions', tables=report.COSTS_FIGURE_TABLES, metrics=[LCOE_METRIC]))
+    _load_dataset('eu', load_eu)
+    _queries.clear()
+
+
+def _dataset(name):
+    data = _datasets.get(name)
+    if data is None:
+        raise LookupError(f"The {name} dataset is not loaded.")
+    return data
+
+
+def _records(df):
+    return json.loads(exact_floats(df).to_json(orient='records'))
+
+
+def global_mix(year=None):
+    df_sub = exact_floats(_dataset('substitution').sort_index())
+    if year is not None:
+        if year not in df_sub.index:
+            raise LookupError(f"No global energy mix for {year}.")
+        df_sub = df_sub.loc[[year]]
+    values = json.loads(df_sub.to_json(orient='index'))
+    shares = json.loads(df_sub.div(df_sub.sum(axis=1), axis=0).mul(100).round(3).to_json(orient='index'))
+    return [{'year': int(row_year), 'values': values[str(row_year)], 'shares': shares[str(row_year)]} for row_year in df_sub.index]
+
+
+def country_transition(country, start=None, end=None):
+    sustainable = _dataset('sustainable')
+    if country not in sustainable['entities']:
+        raise LookupError(f"Unknown country '{country}'.")
+    rows = sustainable['frame'].iloc[sustainable['entities'][country]]
+    if start is not None or end is not None:
+        rows = rows[rows['Year'].between(start if start is not None else -math.inf, end if end is not None else math.inf)]
+    transition = rows[['Year'] + TRANSITION_COLUMNS].sort_values('Year').copy()
+    total = transition[TRANSITION_COLUMNS].sum(axis=1)
+    transition['Renewables share (%)'] = (transition['Electricity from renewables (TWh)'] / total.where(total > 0) * 100).round(3)
+    return _records(transition)
+
+
+def lcoe_by_category(discount_rate=0.03, by='category'):
+    if by not in ('category', 'source'):
+        raise ValueError("by must be 'category' or 'source'.")
+    lcoe = _dataset('lcoe')
+    lcoe = lcoe[lcoe['discount_rate'] == discount_rate].dropna(subset=['country', 'value'])
+    if lcoe.empty:
+        raise LookupError(f"No LCOE values at discount rate {discount_rate}.")
+    keys = ['category'] if by == 'category' else ['category', 'source']
+    summary = lcoe.groupby(keys, observed=True)['value'].agg(['count', 'mean', 'median', 'min', 'max']).round(3).reset_index()
+    return _records(summary)
+
+
+def eu_hourly_spread(start_date=None, end_date=None):
+    eu_agg = _dataset('eu')
+    if start_date is not None or end_date is not None:
+        dates = eu_agg.index.get_level_values('date')
+        mask = (dates >= pd.Timestamp(start_date or dates.min())) & (dates <= pd.Timestamp(end_date or dates.max()))
+        eu_agg = eu_agg[mask]
+    totals = eu_agg.groupby(level=['hour', 'is_green_energy'])[['sum', 'count']].sum()
+    hourly = (totals['sum'] / totals['count']).unstack()
+    spread = pd.DataFrame({
+        'hour': hourly.index.astype(int),
+        'green': hourly.get(True),
+        'conventional': hourly.get(False),
+    })
+    spread['spread'] = spread['green'] - spread['conventional']
+    return _records(spread.round(3))
+
+
+QUERY_HANDLERS = {
+    '/global-mix': (global_mix, {'year': int}),
+    '/country-transition': (country_transition, {'country': str, 'start': int, 'end': int}),
+    '/lcoe': (lcoe_by_category, {'discount_rate': float, 'by': str}),
+    '/eu-hourly-spread': (eu_hourly_spread, {'start_date': str, 'end_date': str}),
+}
+
+
+def configure_query_cache(maxsize=QUERY_CACHE_SIZE):
+    _queries.clear()
+    for path, (handler, _) in QUERY_HANDLERS.items():
+        _queries[path] = lru_cache(maxsize=maxsize)(lambda params, handler=handler: json.dumps(handler(**dict(params))).encode('utf-8'))
+
+
+def cache_stats():
+    stats = {}
+    hits = misses = 0
+    for path, query in _queries.items():
+        info = query.cache_info()
+        hits, misses = hits + info.hits, misses + info.misses
+        stats[path] = {'hits': info.hits, 'misses': info.misses, 'size': info.currsize, 'maxsize': info.maxsize,
+                       'hit_rate': round(info.hits / (info.hits + info.misses), 4) if info.hits + info.misses else None}
+    stats['total'] = {'hits': hits, 'misses': misses, 'hit_rate': round(hits / (hits + misses), 4) if hits + misses else None}
+    return stats
+
+
+def run_query(path, query_string):
+    if not _queries:
+        configure_query_cache()
+    converters = QUERY_HANDLERS[path][1]
+    params = {}
+    for name, values in parse_qs(query_string, strict_parsing=False).items():
+        if name not in converters:
+            raise ValueError(f"Unknown parameter '{name}'. Allowed: {', '.join(converters)}.")
+        params[name] = converters[name](values[-1])
+    return _queries[path](tuple(sorted(params.items())))
+
+
+class EnergyQueryHandler(BaseHTTPRequestHandler):
+
+    def _send_json(self, status, body):
+        payload = body if isinstance(body, bytes) else json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == '/stats':
+            self._send_json(200, cache_stats())
+            return
+        if url.path == '/':
+            self._send_json(200, {'endpoints': sorted(QUERY_HANDLERS) + ['/stats'],
+                                  'datasets': {name: data is not None for name, data in _datasets.items()}})
+            return
+        if url.path not in QUERY_HANDLERS:
+            self._send_json(404, {'error': f"Unknown endpoint '{url.path}'."})
+            return
+        try:
+            self._send_json(200, run_query(url.path, url.query))
+        except LookupError as exc:
+            self._send_json(404, {'error': str(exc)})
+        except (TypeError, ValueError) as exc:
+            self._send_json(400, {'error': str(exc)})
+
+    def log_message(self, format, *args):
+        pass
+
+
+def create_server(host=SERVICE_HOST, port=SERVICE_PORT, cache_size=QUERY_CACHE_SIZE):
+    if host not in LOOPBACK_HOSTS:
+        raise ValueError(f"The query service only binds to localhost ({', '.join(LOOPBACK_HOSTS)}), not '{host}'.")
+    configure_query_cache(cache_size)
+    return ThreadingHTTPServer((host, port), EnergyQueryHandler)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Serve the energy report aggregates as JSON on localhost.')
+    parser.add_argument('--host', default=SERVICE_HOST, choices=LOOPBACK_HOSTS,
+                        help=f'loopback address to bind (default: {SERVICE_HOST})')
+    parser.add_argument('--port', type=int, default=SERVICE_PORT,
+                        help=f'port to listen on, 0 picks a free port (default: {SERVICE_PORT})')
+    parser.add_argument('--cache-size', type=int, default=QUERY_CACHE_SIZE,
+                        help=f'LRU entries kept per endpoint (default: {QUERY_CACHE_SIZE})')
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    load_service_data()
+    server = create_server(args.host, args.port, args.cache_size)
+    print(f"Service: listening on http://{args.host}:{server.server_address[1]}/ (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
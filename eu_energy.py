@@ -0,0 +1,180 @@
+import numpy as np
+import pandas as pd
+
+from datetime_parsing import parse_dates, parse_datetimes, parse_hours
+from pipeline_stages import mark_stage
+
+
+EU_CHUNK_SIZE = 500_000
+
+EU_COLUMN_TRANSLATION = {
+    'fecha': 'date', 'hora': 'time', 'sistema': 'system_code',
+    'bandera': 'is_green_energy', 'precio': 'price_eur_mwh',
+    'tipo_moneda': 'currency_type', 'origen_dato': 'data_source',
+    'fecha_actualizacion': 'last_updated'
+}
+
+EU_DTYPES = {
+    'fecha': 'object', 'hora': 'object', 'sistema': 'category',
+    'bandera': 'object', 'precio': 'float64', 'tipo_moneda': 'category',
+    'origen_dato': 'category', 'fecha_actualizacion': 'object'
+}
+
+EU_STREAM_COLUMNS = ['fecha', 'hora', 'bandera', 'precio']
+
+PRICE_BIN_WIDTH = 0.5
+
+AGGREGATE_COLUMNS = ['count', 'sum', 'min', 'max', 'first', 'last']
+AGGREGATE_KEYS = ['date', 'hour', 'is_green_energy']
+HISTOGRAM_KEYS = ['hour', 'is_green_energy', 'price_bin']
+
+_MERGE_RULES = {'count': 'sum', 'sum': 'sum', 'min': 'min', 'max': 'max', 'first': 'first', 'last': 'last'}
+
+
+def clean_eu_frame(df_eu):
+    df_eu = df_eu.rename(columns=EU_COLUMN_TRANSLATION)
+    issues = {}
+
+    df_eu['is_green_energy'] = (
+        df_eu['is_green_energy']
+        .astype(str).str.strip().str.upper()
+        .map({'Y': True, '1': True, 'N': False, '0': False})
+    )
+    issues['unmapped is_green_energy'] = int(df_eu['is_green_energy'].isna().sum())
+    df_eu['is_green_energy'] = df_eu['is_green_energy'].fillna(False).astype(bool)
+
+    df_eu['date'], issues['unparsed date'] = parse_dates(df_eu['date'])
+    if 'last_updated' in df_eu.columns:
+        df_eu['last_updated'], issues['unparsed last_updated'] = parse_datetimes(df_eu['last_updated'])
+    df_eu['hour'], issues['unparsed time'] = parse_hours(df_eu['time'])
+    df_eu = df_eu.dropna(subset=['date', 'hour', 'price_eur_mwh'])
+    df_eu['hour'] = df_eu['hour'].astype('int8')
+    return df_eu, issues
+
+
+def merge_issue_counts(total, issues):
+    for name, count in issues.items():
+        total[name] = total.get(name, 0) + count
+    return total
+
+
+def report_eu_issues(issues):
+    if issues.get('unmapped is_green_energy'):
+        print(f"Warning (EUEnergy): {issues['unmapped is_green_energy']} unmapped 'is_green_energy' values found. Filling with False.")
+    for name in ('unparsed date', 'unparsed time', 'unparsed last_updated'):
+        if issues.get(name):
+            print(f"Warning (EUEnergy): {issues[name]} values could not be parsed in '{name.split(' ', 1)[1]}'.")
+
+
+def empty_eu_aggregates():
+    index = pd.MultiIndex.from_arrays(
+        [pd.DatetimeIndex([]), pd.Index([], dtype='int8'), pd.Index([], dtype='bool')],
+        names=AGGREGATE_KEYS
+    )
+    return pd.DataFrame({
+        'count': pd.Series(dtype='int64'), 'sum': pd.Series(dtype='float64'),
+        'min': pd.Series(dtype='float64'), 'max': pd.Series(dtype='float64'),
+        'first': pd.Series(dtype='float64'), 'last': pd.Series(dtype='float64')
+    }, index=index)
+
+
+def aggregate_eu_prices(df_eu):
+    if df_eu.empty:
+        return empty_eu_aggregates()
+
+    date_codes, date_values = pd.factorize(df_eu['date'], sort=True)
+    hours = df_eu['hour'].to_numpy(dtype='int64')
+    green = df_eu['is_green_energy'].to_numpy(dtype='int64')
+    keys = (date_codes.astype('int64') * 24 + hours) * 2 + green
+
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+    sorted_prices = df_eu['price_eur_mwh'].to_numpy(dtype='float64')[order]
+    starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+    ends = np.r_[starts[1:], len(sorted_keys)]
+    group_keys = sorted_keys[starts]
+
+    index = pd.MultiIndex.from_arrays([
+        pd.DatetimeIndex(date_values)[group_keys // 48],
+        pd.Index((group_keys // 2 % 24).astype('int8')),
+        pd.Index((group_keys % 2).astype(bool))
+    ], names=AGGREGATE_KEYS)
+    return pd.DataFrame({
+        'count': (ends - starts).astype('int64'),
+        'sum': np.add.reduceat(sorted_prices, starts),
+        'min': np.minimum.reduceat(sorted_prices, starts),
+        'max': np.maximum.reduceat(sorted_prices, starts),
+        'first': sorted_prices[starts],
+        'last': sorted_prices[ends - 1]
+    }, index=index)
+
+
+def merge_eu_aggregates(state, partial):
+    if state is None or state.empty:
+        return partial
+    if partial.empty:
+        return state
+    return pd.concat([state, partial]).groupby(level=AGGREGATE_KEYS, sort=False).agg(_MERGE_RULES)
+
+
+def empty_price_histogram():
+    index = pd.MultiIndex.from_arrays(
+        [pd.Index([], dtype='int8'), pd.Index([], dtype='bool'), pd.Index([], dtype='int64')],
+        names=HISTOGRAM_KEYS
+    )
+    return pd.Series([], index=index, dtype='int64', name='count')
+
+
+def price_histogram(df_eu, bin_width=PRICE_BIN_WIDTH):
+    if df_eu.empty:
+        return empty_price_histogram()
+
+    groups = df_eu['hour'].to_numpy(dtype='int64') * 2 + df_eu['is_green_energy'].to_numpy(dtype='int64')
+    price_bins = np.floor(df_eu['price_eur_mwh'].to_numpy(dtype='float64') / bin_width).astype('int64')
+    lowest_bin = price_bins.min()
+    bins_per_group = int(price_bins.max() - lowest_bin + 1)
+
+    counts = np.bincount(groups * bins_per_group + (price_bins - lowest_bin), minlength=48 * bins_per_group)
+    keys = np.flatnonzero(counts)
+    group_keys = keys // bins_per_group
+    index = pd.MultiIndex.from_arrays([
+        pd.Index((group_keys // 2).astype('int8')),
+        pd.Index((group_keys % 2).astype(bool)),
+        pd.Index(keys % bins_per_group + lowest_bin)
+    ], names=HISTOGRAM_KEYS)
+    return pd.Series(counts[keys], index=index, name='count')
+
+
+def merge_price_histograms(state, partial):
+    if state is None or state.empty:
+        return partial
+    if partial.empty:
+        return state
+    return pd.concat([state, partial]).groupby(level=HISTOGRAM_KEYS).sum()
+
+
+def stream_eu_aggregates(path, chunksize=EU_CHUNK_SIZE, usecols=None, bin_width=PRICE_BIN_WIDTH):
+    usecols = list(usecols or EU_STREAM_COLUMNS)
+    dtypes = {col: dtype for col, dtype in EU_DTYPES.items() if col in usecols}
+
+    state = None
+    histogram = None
+    rows_read = 0
+    issues = {}
+    mark_stage('load')
+    for chunk in pd.read_csv(path, usecols=usecols, dtype=dtypes, chunksize=chunksize):
+        rows_read += len(chunk)
+        mark_stage('clean', len(chunk))
+        cleaned, chunk_issues = clean_eu_frame(chunk)
+        merge_issue_counts(issues, chunk_issues)
+        mark_stage('aggregate', len(cleaned))
+        state = merge_eu_aggregates(state, aggregate_eu_prices(cleaned))
+        histogram = merge_price_histograms(histogram, price_histogram(cleaned, bin_width))
+        mark_stage('load')
+
+    report_eu_issues(issues)
+    if state is None:
+        state = empty_eu_aggregates()
+        histogram = empty_price_histogram()
+    print(f"EUEnergy: streamed {rows_read} rows into {len(state)} (date, hour, energy type) aggregates.")
+    return state.sort_index(), histogram.sort_index()
@@ -0,0 +1,288 @@
+import argparse
+import glob
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import pandas as pd
+
+from datetime_parsing import parse_times
+from energy_cache import CACHE_DIR
+from eu_energy import (AGGREGATE_KEYS, EU_CHUNK_SIZE, EU_DTYPES, aggregate_eu_prices, clean_eu_frame,
+                       empty_eu_aggregates, empty_price_histogram, merge_issue_counts, merge_price_histograms,
+                       price_histogram, report_eu_issues)
+from eu_synthetic import SYNTHETIC_KEY, synthetic_eu_chunks, synthetic_eu_revisions
+from pipeline_stages import mark_stage
+
+
+EU_STATE_DIR = os.path.join(CACHE_DIR, 'eu_state')
+EU_DATA_DIR = 'EU_energy data'
+STATE_VERSION = 2
+EU_INCREMENTAL_COLUMNS = ['fecha', 'hora', 'sistema', 'bandera', 'precio', 'fecha_actualizacion']
+RECORD_KEY = ['date', 'time', 'system_code', 'is_green_energy']
+ROW_STORE_COLUMNS = RECORD_KEY + ['hour', 'price_eur_mwh', 'last_updated', 'batch', 'seq']
+ROW_ORDER = ['batch', 'last_updated', 'seq']
+FINGERPRINT_BYTES = 65_536
+CHECK_ROWS = 20_000
+CHECK_DAYS = 10
+CHECK_CHUNK_SIZE = 3_000
+CHECK_TOLERANCE = 1e-9
+
+MANIFEST_FILE = 'manifest.json'
+AGGREGATES_FILE = 'aggregates.parquet'
+HISTOGRAM_FILE = 'histogram.parquet'
+ROWS_DIR = 'rows'
+
+
+def _new_manifest():
+    return {'version': STATE_VERSION, 'files': {}, 'high_water_mark': None, 'next_batch': 0, 'next_seq': 0}
+
+
+def load_manifest(state_dir=EU_STATE_DIR):
+    path = os.path.join(state_dir, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return _new_manifest()
+    with open(path, encoding='utf-8') as manifest_file:
+        return json.load(manifest_file)
+
+
+def _replace_file(path, write):
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _save_manifest(manifest, state_dir):
+    def write(path):
+        with open(path, 'w', encoding='utf-8') as manifest_file:
+            json.dump(manifest, manifest_file, indent=2, sort_keys=True)
+    _replace_file(os.path.join(state_dir, MANIFEST_FILE), write)
+
+
+def _fingerprint(path, length):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as source:
+        digest.update(source.read(min(length, FINGERPRINT_BYTES)))
+        source.seek(max(0, length - FINGERPRINT_BYTES))
+        digest.update(source.read(min(length, FINGERPRINT_BYTES)))
+    return digest.hexdigest()
+
+
+def _read_header(path):
+    return list(pd.read_csv(path, nrows=0).columns)
+
+
+def _plan_read(path, entry):
+    size = os.path.getsize(path)
+    if entry is None:
+        return 'new', 0, size
+    if size >= entry['offset'] and _fingerprint(path, entry['offset']) == entry['fingerprint']:
+        return ('unchanged' if size == entry['offset'] else 'appended'), entry['offset'], size
+    return 'rewritten', 0, size
+
+
+def _read_chunks(path, offset, header, chunksize):
+    usecols = [column for column in EU_INCREMENTAL_COLUMNS if column in header]
+    dtypes = {column: dtype for column, dtype in EU_DTYPES.items() if column in usecols}
+    source = open(path, 'rb')
+    try:
+        if offset:
+            source.seek(offset)
+            reader = pd.read_csv(source, header=None, names=header, usecols=usecols, dtype=dtypes, chunksize=chunksize)
+        else:
+            reader = pd.read_csv(source, usecols=usecols, dtype=dtypes, chunksize=chunksize)
+        for chunk in reader:
+            yield chunk
+    finally:
+        source.close()
+
+
+def _to_row_store(cleaned, batch, first_seq):
+    rows = pd.DataFrame({
+        'date': cleaned['date'],
+        'time': parse_times(cleaned['time'])[0],
+        'system_code': cleaned['system_code'].astype(str) if 'system_code' in cleaned.columns else '',
+        'is_green_energy': cleaned['is_green_energy'],
+        'hour': cleaned['hour'],
+        'price_eur_mwh': cleaned['price_eur_mwh'].astype('float64'),
+        'last_updated': cleaned['last_updated'] if 'last_updated' in cleaned.columns else pd.NaT,
+    })
+    rows['batch'] = batch
+    rows['seq'] = range(first_seq, first_seq + len(rows))
+    return rows.astype({'batch': 'int64', 'seq': 'int64', 'last_updated': 'datetime64[ns]'})[ROW_STORE_COLUMNS].reset_index(drop=True)
+
+
+def _upsert_rows(state_dir, rows, aggregates, histogram):
+    rows_dir = os.path.join(state_dir, ROWS_DIR)
+    os.makedirs(rows_dir, exist_ok=True)
+    replaced = 0
+    for month, month_rows in rows.groupby(rows['date'].dt.strftime('%Y-%m'), sort=False):
+        path = os.path.join(rows_dir, f'{month}.parquet')
+        combined = pd.concat([pd.read_parquet(path), month_rows], ignore_index=True) if os.path.exists(path) else month_rows
+        combined = combined.sort_values(ROW_ORDER, na_position='first', kind='stable')
+        superseded = combined.duplicated(RECORD_KEY, keep='last').to_numpy()
+        removed = combined[superseded]
+        combined = combined[~superseded].sort_values('seq', kind='stable').reset_index(drop=True)
+        _replace_file(path, lambda tmp_path: combined.to_parquet(tmp_path, index=False))
+        replaced += len(removed)
+
+        affected = pd.MultiIndex.from_frame(pd.concat([month_rows[AGGREGATE_KEYS], removed[AGGREGATE_KEYS]]).drop_duplicates())
+        in_affected = pd.MultiIndex.from_frame(combined[AGGREGATE_KEYS]).isin(affected)
+        fresh = aggregate_eu_prices(combined[in_affected])
+        aggregates = pd.concat([aggregates[~aggregates.index.isin(affected)], fresh])
+
+        histogram = merge_price_histograms(histogram, price_histogram(month_rows))
+        if not removed.empty:
+            histogram = merge_price_histograms(histogram, -price_histogram(removed))
+            histogram = histogram[histogram != 0]
+    return aggregates, histogram, replaced
+
+
+def _load_state(state_dir):
+    aggregates_path = os.path.join(state_dir, AGGREGATES_FILE)
+    histogram_path = os.path.join(state_dir, HISTOGRAM_FILE)
+    if not (os.path.exists(aggregates_path) and os.path.exists(histogram_path)):
+        return empty_eu_aggregates(), empty_price_histogram()
+    return pd.read_parquet(aggregates_path), pd.read_parquet(histogram_path)['count']
+
+
+def _save_state(state_dir, aggregates, histogram):
+    _replace_file(os.path.join(state_dir, AGGREGATES_FILE), lambda path: aggregates.to_parquet(path))
+    _replace_file(os.path.join(state_dir, HISTOGRAM_FILE), lambda path: histogram.to_frame().to_parquet(path))
+
+
+def update_eu_state(paths, state_dir=EU_STATE_DIR, chunksize=EU_CHUNK_SIZE):
+    manifest = load_manifest(state_dir)
+    if manifest.get('version') != STATE_VERSION:
+        print(f"EUEnergy: the state in {state_dir} was written by an older version. Rebuilding it.")
+        reset_eu_state(state_dir)
+        manifest = _new_manifest()
+    os.makedirs(state_dir, exist_ok=True)
+    aggregates, histogram = _load_state(state_dir)
+    high_water_mark = pd.Timestamp(manifest['high_water_mark']) if manifest['high_water_mark'] else None
+    issues = {}
+    rows_added = rows_replaced = rows_skipped = 0
+
+    for path in paths:
+        key = os.path.abspath(path)
+        entry = manifest['files'].get(key)
+        mark_stage('load')
+        mode, offset, size = _plan_read(path, entry)
+        if mode == 'unchanged':
+            continue
+        header = entry['header'] if mode == 'appended' else _read_header(path)
+        batch = manifest['next_batch']
+        manifest['next_batch'] += 1
+
+        for chunk in _read_chunks(path, offset, header, chunksize):
+            mark_stage('clean', len(chunk))
+            cleaned, chunk_issues = clean_eu_frame(chunk)
+            merge_issue_counts(issues, chunk_issues)
+            if mode == 'rewritten' and high_water_mark is not None:
+                fresh = cleaned['last_updated'] > high_water_mark
+                rows_skipped += int((~fresh).sum())
+                cleaned = cleaned[fresh]
+            if not cleaned.empty:
+                mark_stage('aggregate', len(cleaned))
+                rows = _to_row_store(cleaned, batch, manifest['next_seq'])
+                manifest['next_seq'] += len(rows)
+                aggregates, histogram, replaced = _upsert_rows(state_dir, rows, aggregates, histogram)
+                rows_added += len(rows)
+                rows_replaced += replaced
+                latest = rows['last_updated'].max()
+                if pd.notna(latest) and (high_water_mark is None or latest > high_water_mark):
+                    high_water_mark = latest
+            mark_stage('load')
+
+        manifest['files'][key] = {'offset': size, 'size': size, 'header': header,
+                                  'fingerprint': _fingerprint(path, size)}
+        manifest['high_water_mark'] = high_water_mark.isoformat() if high_water_mark is not None else None
+        _save_state(state_dir, aggregates, histogram)
+        _save_manifest(manifest, state_dir)
+        print(f"EUEnergy: {mode} file {os.path.basename(path)} processed from byte {offset}.")
+
+    missing = [name for name in manifest['files'] if name not in {os.path.abspath(path) for path in paths}]
+    if missing:
+        print(f"Warning (EUEnergy): {len(missing)} previously processed files are no longer listed; their rows stay in the state.")
+    report_eu_issues(issues)
+    if rows_skipped:
+        print(f"EUEnergy: skipped {rows_skipped} rows of rewritten files at or before the high-water mark {high_water_mark}.")
+    print(f"EUEnergy: incremental update added {rows_added} rows ({rows_replaced} earlier rows replaced); "
+          f"{len(aggregates)} (date, hour, energy type) aggregates stored.")
+    return aggregates.sort_index(), histogram.sort_index()
+
+
+def reset_eu_state(state_dir=EU_STATE_DIR):
+    if os.path.isdir(state_dir):
+        shutil.rmtree(state_dir)
+
+
+def _expected_state(frame):
+    cleaned = clean_eu_frame(frame.drop_duplicates(SYNTHETIC_KEY, keep='last'))[0]
+    return aggregate_eu_prices(cleaned), price_histogram(cleaned)
+
+
+def _compare_state(label, state, expected):
+    columns = ['count', 'sum', 'min', 'max']
+    try:
+        pd.testing.assert_frame_equal(state[0][columns], expected[0][columns].sort_index(), rtol=CHECK_TOLERANCE)
+        pd.testing.assert_series_equal(state[1], expected[1].sort_index())
+    except AssertionError as exc:
+        print(f"Error (EUEnergy): {label} differ from a full rebuild: {exc}")
+        return False
+    return True
+
+
+def check_incremental_corrections(rows=CHECK_ROWS, days=CHECK_DAYS, chunksize=CHECK_CHUNK_SIZE):
+    work_dir = tempfile.mkdtemp(prefix='eu-incremental-check-')
+    try:
+        base = pd.concat(synthetic_eu_chunks(rows, days=days), ignore_index=True)
+        revisions = synthetic_eu_revisions(rows, days=days)
+        same_file, appended = revisions.iloc[:len(revisions) // 2], revisions.iloc[len(revisions) // 2:]
+        path = os.path.join(work_dir, 'EU_energy_data.csv')
+        state_dir = os.path.join(work_dir, 'state')
+
+        pd.concat([same_file.iloc[:1], base, same_file.iloc[1:]]).to_csv(path, index=False)
+        ok = _compare_state('corrections in the same file', update_eu_state([path], state_dir, chunksize),
+                            _expected_state(pd.concat([base, same_file])))
+        appended.to_csv(path, mode='a', header=False, index=False)
+        ok = _compare_state('corrections appended later', update_eu_state([path], state_dir, chunksize),
+                            _expected_state(pd.concat([base, revisions]))) and ok
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    print(f"EUEnergy: incremental check {'passed' if ok else 'FAILED'} ({len(base)} rows, {len(same_file)} corrections "
+          f"in the same file, {len(appended)} appended later, chunks of {chunksize} rows).")
+    return ok
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Fold new and corrected EU market rows into the stored hourly aggregates.')
+    parser.add_argument('paths', nargs='*',
+                        help=f'EU market CSV files (default: every CSV in {EU_DATA_DIR})')
+    parser.add_argument('--state-dir', default=EU_STATE_DIR,
+                        help=f'folder with the stored rows and aggregates (default: {EU_STATE_DIR})')
+    parser.add_argument('--chunk-size', type=int, default=EU_CHUNK_SIZE,
+                        help=f'rows read per chunk (default: {EU_CHUNK_SIZE})')
+    parser.add_argument('--reset', action='store_true',
+                        help='drop the stored rows and aggregates and rebuild them from the files')
+    parser.add_argument('--check', action='store_true',
+                        help='check corrections in the same file and in a later append against a full rebuild and exit')
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.check:
+        raise SystemExit(0 if check_incremental_corrections() else 1)
+    if args.reset:
+        reset_eu_state(args.state_dir)
+    paths = args.paths or sorted(glob.glob(os.path.join(EU_DATA_DIR, '*.csv')))
+    if not paths:
+        raise SystemExit(f"Error (EUEnergy): no CSV files found in {EU_DATA_DIR}.")
+    update_eu_state(paths, args.state_dir, args.chunk_size)
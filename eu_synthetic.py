@@ -0,0 +1,245 @@
+import argparse
+import hashlib
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+
+SYNTHETIC_KEY = ['fecha', 'hora', 'sistema', 'bandera']
+SYNTHETIC_COLUMNS = ['fecha', 'hora', 'sistema', 'bandera', 'precio', 'tipo_moneda', 'origen_dato', 'fecha_actualizacion']
+SYNTHETIC_SEED = 42
+SYNTHETIC_START_DATE = '2022-01-01'
+SYNTHETIC_DAYS = 730
+SYNTHETIC_CHUNK_SIZE = 500_000
+SYNTHETIC_BLOCK_SIZE = 100_000
+MINUTES_PER_HOUR = 60
+CHECK_ROWS = 250_000
+CHECK_CHUNK_SIZES = (SYNTHETIC_CHUNK_SIZE, 70_001)
+SYNTHETIC_OUTPUT = os.path.join('EU_energy data', 'EU_energy_data.csv')
+
+SYNTHETIC_SYSTEMS = {1: 'OMIE', 2: 'OMIE', 3: 'EPEX', 4: 'OMIE', 5: 'NORDPOOL', 6: 'GME'}
+SYSTEM_WEIGHTS = [0.25, 0.15, 0.2, 0.2, 0.1, 0.1]
+SYSTEM_PRICE_FACTORS = [1.0, 1.02, 1.08, 0.97, 0.75, 1.12]
+
+HOURLY_PRICE_SHAPE = np.array([
+    0.86, 0.81, 0.78, 0.76, 0.77, 0.82, 0.93, 1.06, 1.12, 1.06, 0.97, 0.90,
+    0.86, 0.84, 0.86, 0.93, 1.03, 1.15, 1.24, 1.25, 1.19, 1.09, 0.99, 0.91
+])
+HOURLY_GREEN_SHARE = np.array([
+    0.28, 0.28, 0.27, 0.27, 0.27, 0.28, 0.30, 0.34, 0.40, 0.46, 0.51, 0.54,
+    0.55, 0.54, 0.51, 0.46, 0.40, 0.34, 0.30, 0.29, 0.29, 0.28, 0.28, 0.28
+])
+GREEN_PRICE_FACTOR = 0.92
+REVISED_SHARE = 0.02
+
+
+def _daily_price_levels(days, rng):
+    day_numbers = np.arange(days)
+    seasonal = 1 + 0.18 * np.cos(2 * np.pi * (day_numbers - 15) / 365.25)
+    weekly = np.where(day_numbers % 7 >= 5, 0.88, 1.0)
+    shocks = rng.normal(0, 0.06, days)
+    drift = np.empty(days)
+    level = 0.0
+    for day, shock in enumerate(shocks):
+        level = 0.9 * level + shock
+        drift[day] = level
+    return 95.0 * seasonal * weekly * np.exp(drift)
+
+
+def _system_sequence(length):
+    weights = np.array(SYSTEM_WEIGHTS)
+    credit = np.zeros(len(weights))
+    sequence = np.empty(length, dtype='int64')
+    for position in range(length):
+        credit += weights
+        sequence[position] = credit.argmax()
+        credit[sequence[position]] -= 1
+    return sequence
+
+
+def _slot_layout(length):
+    systems = _system_sequence(length)
+    minutes = pd.Series(systems).groupby(systems).cumcount().to_numpy()
+    return systems, minutes
+
+
+def _slot_capacity():
+    minutes = _slot_layout(MINUTES_PER_HOUR * len(SYNTHETIC_SYSTEMS))[1]
+    return int(np.argmax(minutes >= MINUTES_PER_HOUR))
+
+
+def minimum_synthetic_days(rows):
+    return max(1, -(-rows // (_slot_capacity() * 24)))
+
+
+def _synthetic_labels(start_date, days):
+    calendar = pd.date_range(pd.Timestamp(start_date), periods=days + 2, freq='D')
+    return {
+        'systems': np.array(list(SYNTHETIC_SYSTEMS)),
+        'sources': np.array(list(SYNTHETIC_SYSTEMS.values())),
+        'times': np.array([f'{hour:02d}:{minute:02d}:00' for hour in range(24) for minute in range(MINUTES_PER_HOUR)]),
+        'dates': np.asarray(calendar.strftime('%d/%m/%Y')),
+        'updates': np.asarray(calendar.strftime('%Y-%m-%d %H:%M:%S')),
+    }
+
+
+def _synthetic_block(block, rows, seed, days, labels, layout, day_levels):
+    rng = np.random.default_rng([seed, block + 1])
+    row_numbers = np.arange(block * SYNTHETIC_BLOCK_SIZE, min((block + 1) * SYNTHETIC_BLOCK_SIZE, rows), dtype='int64')
+    slots = days * 24
+    slot = row_numbers * slots // rows
+    within_slot = row_numbers - (slot * rows + slots - 1) // slots
+    day, hour = slot // 24, slot % 24
+    systems, minutes = layout[0][within_slot], layout[1][within_slot]
+
+    green = rng.random(len(row_numbers)) < HOURLY_GREEN_SHARE[hour]
+    prices = (day_levels[day] * HOURLY_PRICE_SHAPE[hour] * np.array(SYSTEM_PRICE_FACTORS)[systems]
+              * np.where(green, GREEN_PRICE_FACTOR, 1.0) * rng.lognormal(0, 0.12, len(row_numbers)))
+    solar_glut = green & (hour >= 11) & (hour <= 15) & (rng.random(len(row_numbers)) < 0.03)
+    prices = np.where(solar_glut, rng.normal(-5, 8, len(row_numbers)), prices)
+
+    return pd.DataFrame({
+        'fecha': labels['dates'][day],
+        'hora': labels['times'][hour * MINUTES_PER_HOUR + minutes],
+        'sistema': labels['systems'][systems],
+        'bandera': np.where(green, 'Y', 'N'),
+        'precio': np.round(prices, 2),
+        'tipo_moneda': 'EUR',
+        'origen_dato': labels['sources'][systems],
+        'fecha_actualizacion': labels['updates'][day + 1],
+    }, columns=SYNTHETIC_COLUMNS)
+
+
+def _check_capacity(rows, days):
+    if rows > _slot_capacity() * days * 24:
+        raise ValueError(f"{rows} rows do not fit in {days} days with one row per (fecha, hora, sistema, bandera); "
+                         f"use at least {minimum_synthetic_days(rows)} days.")
+
+
+def _synthetic_blocks(rows, seed, start_date, days):
+    _check_capacity(rows, days)
+    labels = _synthetic_labels(start_date, days)
+    layout = _slot_layout(-(-rows // (days * 24)))
+    day_levels = _daily_price_levels(days, np.random.default_rng(seed))
+    for block in range(-(-rows // SYNTHETIC_BLOCK_SIZE)):
+        yield block, _synthetic_block(block, rows, seed, days, labels, layout, day_levels)
+
+
+def synthetic_eu_chunks(rows, seed=SYNTHETIC_SEED, start_date=SYNTHETIC_START_DATE, days=SYNTHETIC_DAYS,
+                        chunksize=SYNTHETIC_CHUNK_SIZE):
+    buffer = None
+    for _, frame in _synthetic_blocks(rows, seed, start_date, days):
+        buffer = frame if buffer is None else pd.concat([buffer, frame], ignore_index=True)
+        while len(buffer) >= chunksize:
+            yield buffer.iloc[:chunksize].reset_index(drop=True)
+            buffer = buffer.iloc[chunksize:]
+    if buffer is not None and len(buffer):
+        yield buffer.reset_index(drop=True)
+
+
+def synthetic_eu_revisions(rows, seed=SYNTHETIC_SEED, start_date=SYNTHETIC_START_DATE, days=SYNTHETIC_DAYS,
+                           share=REVISED_SHARE):
+    revisions = []
+    for block, frame in _synthetic_blocks(rows, seed, start_date, days):
+        rng = np.random.default_rng([seed, block + 1, 1])
+        revised = frame[rng.random(len(frame)) < share].copy()
+        revised['precio'] = np.round(revised['precio'] * rng.lognormal(0, 0.05, len(revised)), 2)
+        updated = (pd.to_datetime(revised['fecha_actualizacion'], format='%Y-%m-%d %H:%M:%S') + pd.Timedelta(days=1)
+                   + pd.to_timedelta(rng.integers(0, 86_400, len(revised)), unit='s'))
+        revised['fecha_actualizacion'] = updated.dt.strftime('%Y-%m-%d %H:%M:%S')
+        revisions.append(revised)
+    if not revisions:
+        return pd.DataFrame(columns=SYNTHETIC_COLUMNS)
+    return pd.concat(revisions, ignore_index=True)
+
+
+def write_synthetic_eu_csv(path, rows, seed=SYNTHETIC_SEED, start_date=SYNTHETIC_START_DATE, days=SYNTHETIC_DAYS,
+                           chunksize=SYNTHETIC_CHUNK_SIZE):
+    _check_capacity(rows, days)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temp_path = f'{path}.tmp'
+    with open(temp_path, 'w', encoding='utf-8', newline='') as output:
+        output.write(','.join(SYNTHETIC_COLUMNS) + '\n')
+        for chunk in synthetic_eu_chunks(rows, seed, start_date, days, chunksize):
+            chunk.to_csv(output, header=False, index=False, float_format='%.2f', lineterminator='\n')
+    os.replace(temp_path, path)
+    return path
+
+
+def append_synthetic_revisions(path, rows, seed=SYNTHETIC_SEED, start_date=SYNTHETIC_START_DATE, days=SYNTHETIC_DAYS,
+                               share=REVISED_SHARE):
+    revisions = synthetic_eu_revisions(rows, seed, start_date, days, share)
+    with open(path, 'a', encoding='utf-8', newline='') as output:
+        revisions.to_csv(output, header=False, index=False, float_format='%.2f', lineterminator='\n')
+    return len(revisions)
+
+
+def check_synthetic_file(rows=CHECK_ROWS, seed=SYNTHETIC_SEED, chunk_sizes=CHECK_CHUNK_SIZES):
+    work_dir = tempfile.mkdtemp(prefix='eu-synthetic-check-')
+    try:
+        digests = []
+        for chunksize in chunk_sizes:
+            path = write_synthetic_eu_csv(os.path.join(work_dir, f'eu_{chunksize}.csv'), rows, seed, chunksize=chunksize)
+            with open(path, 'rb') as source:
+                digests.append(hashlib.sha1(source.read()).hexdigest())
+        repeated = int(pd.read_csv(path, usecols=SYNTHETIC_KEY, dtype=str).duplicated().sum())
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    identical = len(set(digests)) == 1
+    print(f"EUSynthetic: {rows} rows with chunk sizes {', '.join(map(str, chunk_sizes))} -> "
+          f"{'identical files' if identical else 'DIFFERENT files'}, {repeated} repeated (fecha, hora, sistema, bandera) keys.")
+    return identical and not repeated
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Write a synthetic EU electricity market file with the EU_energy_data.csv schema.')
+    parser.add_argument('output', nargs='?', default=SYNTHETIC_OUTPUT,
+                        help=f'CSV file to write (default: {SYNTHETIC_OUTPUT})')
+    parser.add_argument('--rows', type=int, default=1_000_000,
+                        help='number of data rows (default: 1000000)')
+    parser.add_argument('--seed', type=int, default=SYNTHETIC_SEED,
+                        help=f'random seed; the same seed, rows and days give the same file for any chunk size (default: {SYNTHETIC_SEED})')
+    parser.add_argument('--start-date', default=SYNTHETIC_START_DATE,
+                        help=f'first market day, YYYY-MM-DD (default: {SYNTHETIC_START_DATE})')
+    parser.add_argument('--days', type=int, default=SYNTHETIC_DAYS,
+                        help=f'number of market days the rows are spread over (default: {SYNTHETIC_DAYS})')
+    parser.add_argument('--chunk-size', type=int, default=SYNTHETIC_CHUNK_SIZE,
+                        help=f'rows generated and written per chunk (default: {SYNTHETIC_CHUNK_SIZE})')
+    parser.add_argument('--force', action='store_true',
+                        help='overwrite the output file if it already exists')
+    parser.add_argument('--revisions', action='store_true',
+                        help=f'append corrected prices for {REVISED_SHARE:.0%} of the rows, with a later fecha_actualizacion, '
+                             f'to an existing output file written with the same --rows, --seed and --days')
+    parser.add_argument('--check', action='store_true',
+                        help='check that two chunk sizes give the same file with unique (fecha, hora, sistema, bandera) keys and exit')
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.check:
+        raise SystemExit(0 if check_synthetic_file(seed=args.seed) else 1)
+    if args.revisions:
+        if not os.path.exists(args.output):
+            print(f"Error (EUSynthetic): {args.output} does not exist. Write it first without --revisions.")
+        else:
+            try:
+                revised = append_synthetic_revisions(args.output, args.rows, args.seed, args.start_date, args.days)
+            except ValueError as exc:
+                print(f"Error (EUSynthetic): {exc}")
+            else:
+                print(f"EUSynthetic: appended {revised} revised rows to {args.output}")
+    elif os.path.exists(args.output) and not args.force:
+        print(f"Error (EUSynthetic): {args.output} already exists. Use --force to overwrite it.")
+    else:
+        try:
+            write_synthetic_eu_csv(args.output, args.rows, args.seed, args.start_date, args.days, args.chunk_size)
+        except ValueError as exc:
+            print(f"Error (EUSynthetic): {exc}")
+        else:
+            print(f"EUSynthetic: wrote {args.rows} rows to {args.output}")
@@ -0,0 +1,142 @@
+import html
+import importlib
+import json
+import os
+import re
+
+
+OUTPUT_DIR_ENV = 'ENERGY_REPORT_OUTPUT_DIR'
+EXPORT_FORMATS = ('html', 'json')
+MANIFEST_FILE = 'figures.json'
+INDEX_FILE = 'index.html'
+
+_collected_figures = None
+_output_dir = os.environ.get(OUTPUT_DIR_ENV) or None
+_export_formats = EXPORT_FORMATS
+_defer_index = False
+_exported_records = []
+_compute_only = False
+_figure_filter = None
+
+
+class LazyModule:
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attribute):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attribute)
+
+
+def lazy_function(module_name, function_name):
+    module = LazyModule(module_name)
+
+    def call(*args, **kwargs):
+        return getattr(module, function_name)(*args, **kwargs)
+    return call
+
+
+def configure_compute_only(enabled=True):
+    global _compute_only
+    _compute_only = enabled
+
+
+def configure_figure_filter(names=None):
+    global _figure_filter
+    _figure_filter = None if names is None else frozenset(names)
+
+
+def figure_wanted(name):
+    return not _compute_only and (_figure_filter is None or name in _figure_filter)
+
+
+def configure_export(output_dir, formats=EXPORT_FORMATS, defer_index=False):
+    global _output_dir, _export_formats, _defer_index
+    _output_dir = output_dir
+    _export_formats = tuple(formats)
+    _defer_index = defer_index
+
+
+def export_enabled():
+    return _output_dir is not None
+
+
+def _figure_title(fig):
+    title = fig.layout.title.text or ''
+    return re.sub(r'<[^>]+>', ' ', title).split('  ')[0].strip()
+
+
+def export_figure(fig, name, output_dir=None, formats=None):
+    output_dir = output_dir or _output_dir
+    os.makedirs(output_dir, exist_ok=True)
+    files = []
+    for fmt in formats or _export_formats:
+        path = os.path.join(output_dir, f'{name}.{fmt}')
+        if fmt == 'html':
+            fig.write_html(path, include_plotlyjs='directory', full_html=True)
+        elif fmt == 'json':
+            fig.write_json(path)
+        else:
+            raise ValueError(f"Unsupported export format '{fmt}'. Use 'html' or 'json'.")
+        files.append(os.path.basename(path))
+    return {'name': name, 'title': _figure_title(fig) or name, 'files': files}
+
+
+def update_index(records, output_dir=None):
+    output_dir = output_dir or _output_dir
+    manifest_path = os.path.join(output_dir, MANIFEST_FILE)
+    manifest = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding='utf-8') as manifest_file:
+            manifest = json.load(manifest_file)
+    for record in records:
+        manifest[record['name']] = record
+    with open(manifest_path, 'w', encoding='utf-8') as manifest_file:
+        json.dump(manifest, manifest_file, indent=2, sort_keys=True)
+
+    items = []
+    for name in sorted(manifest):
+        record = manifest[name]
+        links = ' '.join(f'<a href="{html.escape(f)}">{html.escape(f.rsplit(".", 1)[-1])}</a>' for f in record['files'])
+        items.append(f'<li><b>{html.escape(record["title"])}</b> <code>{html.escape(name)}</code> {links}</li>')
+    with open(os.path.join(output_dir, INDEX_FILE), 'w', encoding='utf-8') as index_file:
+        index_file.write(
+            '<!DOCTYPE html>\n<html>\n<head><meta charset="utf-8"><title>Energy report figures</title></head>\n'
+            f'<body>\n<h1>Energy report figures</h1>\n<ul>\n' + '\n'.join(items) + '\n</ul>\n</body>\n</html>\n'
+        )
+
+
+def show_figure(fig, name):
+    if _figure_filter is not None and name not in _figure_filter:
+        return
+    if _collected_figures is not None:
+        _collected_figures.append((name, fig))
+    elif _output_dir is not None:
+        record = export_figure(fig, name)
+        if _defer_index:
+            _exported_records.append(record)
+        else:
+            update_index([record])
+    else:
+        fig.show()
+
+
+def take_exported_records():
+    records = list(_exported_records)
+    _exported_records.clear()
+    return records
+
+
+def start_collecting():
+    global _collected_figures
+    _collected_figures = []
+
+
+def stop_collecting():
+    global _collected_figures
+    figures = _collected_figures or []
+    _collected_figures = None
+    return figures
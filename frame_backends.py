@@ -0,0 +1,242 @@
+import argparse
+import importlib
+import importlib.util
+import time
+
+import numpy as np
+import pandas as pd
+
+from eu_energy import (AGGREGATE_COLUMNS, AGGREGATE_KEYS, HISTOGRAM_KEYS, PRICE_BIN_WIDTH, aggregate_eu_prices,
+                       clean_eu_frame, price_histogram)
+from eu_synthetic import synthetic_eu_chunks
+
+
+FRAME_BACKENDS = ('pandas', 'polars', 'duckdb')
+DEFAULT_BACKEND = 'pandas'
+CHECK_ROWS = 200_000
+CHECK_TOLERANCE = 1e-9
+
+_modules = {}
+_missing_warning_shown = set()
+
+
+def _backend_module(backend):
+    if backend not in _modules:
+        try:
+            _modules[backend] = importlib.import_module(backend)
+        except ImportError:
+            _modules[backend] = None
+    return _modules[backend]
+
+
+def available_backends():
+    return [backend for backend in FRAME_BACKENDS if backend == 'pandas' or importlib.util.find_spec(backend) is not None]
+
+
+def resolve_backend(backend=None):
+    backend = backend or DEFAULT_BACKEND
+    if backend not in FRAME_BACKENDS:
+        raise ValueError(f"Unknown dataframe backend '{backend}'. Choose one of: {', '.join(FRAME_BACKENDS)}.")
+    if backend != 'pandas' and _backend_module(backend) is None:
+        if backend not in _missing_warning_shown:
+            print(f"Warning (Backend): {backend} is not installed. Using pandas for the aggregations.")
+            _missing_warning_shown.add(backend)
+        return 'pandas'
+    return backend
+
+
+def _quote(column):
+    return '"' + column.replace('"', '""') + '"'
+
+
+def _duckdb_query(sql, **frames):
+    duckdb = _backend_module('duckdb')
+    connection = duckdb.connect()
+    try:
+        for name, frame in frames.items():
+            connection.register(name, frame)
+        return connection.execute(sql).df()
+    finally:
+        connection.close()
+
+
+def _eu_input(df_eu):
+    return pd.DataFrame({
+        'date': df_eu['date'].to_numpy(dtype='datetime64[ns]'),
+        'hour': df_eu['hour'].to_numpy(dtype='int64'),
+        'is_green_energy': df_eu['is_green_energy'].to_numpy(dtype='bool'),
+        'price_eur_mwh': df_eu['price_eur_mwh'].to_numpy(dtype='float64'),
+        'row_id': np.arange(len(df_eu), dtype='int64'),
+    })
+
+
+def _as_eu_aggregates(result):
+    index = pd.MultiIndex.from_arrays([
+        pd.DatetimeIndex(result['date'].to_numpy(dtype='datetime64[ns]')),
+        pd.Index(result['hour'].to_numpy(dtype='int8')),
+        pd.Index(result['is_green_energy'].to_numpy(dtype='bool')),
+    ], names=AGGREGATE_KEYS)
+    aggregates = pd.DataFrame({column: result[column].to_numpy() for column in AGGREGATE_COLUMNS}, index=index)
+    return aggregates.astype({'count': 'int64', 'sum': 'float64', 'min': 'float64', 'max': 'float64',
+                              'first': 'float64', 'last': 'float64'})
+
+
+def _polars_eu_aggregates(df_eu):
+    pl = _backend_module('polars')
+    price = pl.col('price_eur_mwh')
+    result = (
+        pl.from_pandas(_eu_input(df_eu)).lazy()
+        .sort('row_id')
+        .group_by(AGGREGATE_KEYS)
+        .agg(price.count().alias('count'), price.sum().alias('sum'), price.min().alias('min'),
+             price.max().alias('max'), price.first().alias('first'), price.last().alias('last'))
+        .sort(AGGREGATE_KEYS)
+        .collect()
+    )
+    return _as_eu_aggregates(result.to_pandas())
+
+
+def _duckdb_eu_aggregates(df_eu):
+    result = _duckdb_query("""
+        SELECT date, hour, is_green_energy,
+               count(*) AS count, sum(price_eur_mwh) AS sum,
+               min(price_eur_mwh) AS min, max(price_eur_mwh) AS max,
+               arg_min(price_eur_mwh, row_id) AS first, arg_max(price_eur_mwh, row_id) AS last
+        FROM eu GROUP BY date, hour, is_green_energy ORDER BY date, hour, is_green_energy
+    """, eu=_eu_input(df_eu))
+    return _as_eu_aggregates(result)
+
+
+def eu_aggregates(df_eu, backend=None):
+    backend = resolve_backend(backend)
+    if backend == 'pandas' or df_eu.empty:
+        return aggregate_eu_prices(df_eu)
+    if backend == 'polars':
+        return _polars_eu_aggregates(df_eu)
+    return _duckdb_eu_aggregates(df_eu)
+
+
+def _as_price_histogram(result):
+    index = pd.MultiIndex.from_arrays([
+        pd.Index(result['hour'].to_numpy(dtype='int8')),
+        pd.Index(result['is_green_energy'].to_numpy(dtype='bool')),
+        pd.Index(result['price_bin'].to_numpy(dtype='int64')),
+    ], names=HISTOGRAM_KEYS)
+    return pd.Series(result['count'].to_numpy(dtype='int64'), index=index, name='count')
+
+
+def eu_price_histogram(df_eu, bin_width=PRICE_BIN_WIDTH, backend=None):
+    backend = resolve_backend(backend)
+    if backend == 'pandas' or df_eu.empty:
+        return price_histogram(df_eu, bin_width)
+    if backend == 'polars':
+        pl = _backend_module('polars')
+        result = (
+            pl.from_pandas(_eu_input(df_eu)).lazy()
+            .with_columns((pl.col('price_eur_mwh') / bin_width).floor().cast(pl.Int64).alias('price_bin'))
+            .group_by(HISTOGRAM_KEYS)
+            .agg(pl.col('price_bin').count().alias('count'))
+            .sort(HISTOGRAM_KEYS)
+            .collect()
+            .to_pandas()
+        )
+    else:
+        result = _duckdb_query(f"""
+            SELECT hour, is_green_energy, CAST(floor(price_eur_mwh / {float(bin_width)!r}) AS BIGINT) AS price_bin,
+                   count(*) AS count
+            FROM eu GROUP BY ALL ORDER BY hour, is_green_energy, price_bin
+        """, eu=_eu_input(df_eu))
+    return _as_price_histogram(result)
+
+
+def group_sum(df, keys, columns, backend=None):
+    keys = [keys] if isinstance(keys, str) else list(keys)
+    columns = list(columns)
+    backend = resolve_backend(backend)
+    if backend == 'pandas' or df.empty:
+        return df.groupby(keys, observed=True)[columns].sum().reset_index()
+    frame = df[keys + columns]
+    if backend == 'polars':
+        pl = _backend_module('polars')
+        result = (
+            pl.from_pandas(frame).lazy()
+            .drop_nulls(keys)
+            .group_by(keys)
+            .agg([pl.col(column).sum() for column in columns])
+            .sort(keys)
+            .collect()
+            .to_pandas()
+        )
+    else:
+        key_list = ', '.join(_quote(key) for key in keys)
+        sums = ', '.join(f'coalesce(sum({_quote(column)}), 0) AS {_quote(column)}' for column in columns)
+        not_null = ' AND '.join(f'{_quote(key)} IS NOT NULL' for key in keys)
+        result = _duckdb_query(f'SELECT {key_list}, {sums} FROM frame WHERE {not_null} GROUP BY {key_list} ORDER BY {key_list}',
+                               frame=frame)
+    result = result[keys + columns]
+    return result.astype({column: df[column].dtype for column in keys + columns}).reset_index(drop=True)
+
+
+def _check_frames(name, backend, expected, actual, check):
+    try:
+        check(expected, actual)
+    except AssertionError as exc:
+        print(f"Error (Backend): {backend} {name} differ from pandas: {exc}")
+        return False
+    return True
+
+
+def verify_backends(df_eu=None, df_year=None, year_columns=None, backends=None, rows=CHECK_ROWS):
+    if df_eu is None:
+        raw = pd.concat(synthetic_eu_chunks(rows), ignore_index=True).astype({'precio': 'float64'})
+        df_eu = clean_eu_frame(raw)[0]
+    if df_year is None:
+        df_year = pd.DataFrame({'Year': np.repeat(np.arange(2000, 2021), 10),
+                                'value': np.random.default_rng(0).random(210)})
+        df_year.loc[::7, 'value'] = np.nan
+        year_columns = ['value']
+
+    expected = {
+        'EU aggregates': aggregate_eu_prices(df_eu),
+        'EU price histogram': price_histogram(df_eu),
+        'Year rollup': group_sum(df_year, 'Year', year_columns, backend='pandas'),
+    }
+    results = {}
+    for backend in backends or FRAME_BACKENDS:
+        if backend == 'pandas':
+            continue
+        if _backend_module(backend) is None:
+            print(f"Backend: {backend} is not installed. Skipping.")
+            continue
+        started = time.perf_counter()
+        actual = {
+            'EU aggregates': eu_aggregates(df_eu, backend),
+            'EU price histogram': eu_price_histogram(df_eu, backend=backend),
+            'Year rollup': group_sum(df_year, 'Year', year_columns, backend=backend),
+        }
+        elapsed = time.perf_counter() - started
+        checks = {
+            'EU aggregates': lambda a, b: pd.testing.assert_frame_equal(a, b, rtol=CHECK_TOLERANCE),
+            'EU price histogram': pd.testing.assert_series_equal,
+            'Year rollup': lambda a, b: pd.testing.assert_frame_equal(a, b, rtol=CHECK_TOLERANCE),
+        }
+        results[backend] = all([_check_frames(name, backend, expected[name], actual[name], checks[name]) for name in expected])
+        status = 'match pandas' if results[backend] else 'DIFFER from pandas'
+        print(f"Backend: {backend} results {status} ({len(df_eu)} EU rows, {elapsed:.2f}s)")
+    return results
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Check that the Polars and DuckDB aggregation backends match pandas.')
+    parser.add_argument('--backend', nargs='+', choices=FRAME_BACKENDS[1:], default=list(FRAME_BACKENDS[1:]),
+                        help='backends to check (default: every installed one)')
+    parser.add_argument('--rows', type=int, default=CHECK_ROWS,
+                        help=f'synthetic EU market rows to aggregate (default: {CHECK_ROWS})')
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    results = verify_backends(backends=args.backend, rows=args.rows)
+    if not all(results.values()):
+        raise SystemExit(1)
@@ -1,6 +1,8 @@
 import plotly.express as px
 import pandas as pd
 
+from figure_output import show_figure
+
 df = pd.read_csv(r'Data-Analysis-Between-Traditional-and-Green-sources-of-energy\Nuclear Energy Datasets\rates_death_from_energy_production_per_twh.csv')
 
 df['Deaths per TWh of electricity production'] = pd.to_numeric(
@@ -37,4 +39,4 @@ fig.update_layout(
     template='plotly_white'
 )
 
-fig.show()
\ No newline at end of file
+show_figure(fig, 'death_rate_per_twh')
\ No newline at end of file
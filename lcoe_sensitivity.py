@@ -0,0 +1,182 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from dtype_policy import exact_floats
+from lcoe_tables import COST_TABLES, LCOE_METRIC, load_cost_tables
+
+
+COSTS_DIR = 'excel_conversions'
+CAPITAL_METRICS = ['Investment (USD/MWh)', 'Decommissioning (USD/MWh)']
+SENSITIVITY_CATEGORIES = ['Green', 'Nuclear', 'Traditional']
+SENSITIVITY_RATES = (0.03, 0.10, 0.0025)
+REFERENCE_RATE = 0.03
+SENSITIVITY_SCENARIOS = 100_000
+SCENARIO_BATCH = 10_000
+COST_UNCERTAINTY = {'capital': 0.20, 'other': 0.10}
+SENSITIVITY_SEED = 2020
+PERCENTILES = [5, 50, 95]
+ITEM_KEYS = ['table', 'source', 'category', 'technology', 'country']
+
+
+class CostArrays:
+
+    def __init__(self, items, anchors, lcoe, capital):
+        self.items = items
+        self.anchors = anchors
+        self.lcoe = lcoe
+        self.capital = capital
+        self.categories = [category for category in SENSITIVITY_CATEGORIES if category in set(items['category'])]
+        self.category_codes = pd.Categorical(items['category'], categories=self.categories).codes
+        counts = np.bincount(self.category_codes, minlength=len(self.categories))
+        self.category_weights = np.zeros((len(items), len(self.categories)))
+        self.category_weights[np.arange(len(items)), self.category_codes] = 1.0 / counts[self.category_codes]
+        self.source_codes, self.sources = pd.factorize(items['source'], sort=True)
+        self.source_matrix = np.zeros((len(items), len(self.sources)))
+        self.source_matrix[np.arange(len(items)), self.source_codes] = 1.0
+
+
+def build_cost_arrays(tidy):
+    tidy = exact_floats(tidy[tidy['discount_rate'].notna() & tidy['metric'].isin([LCOE_METRIC] + CAPITAL_METRICS)])
+    tidy = tidy[tidy['category'].isin(SENSITIVITY_CATEGORIES)].dropna(subset=['country']).astype({key: 'object' for key in ITEM_KEYS})
+    tidy = tidy.assign(variant=tidy.groupby(ITEM_KEYS + ['metric', 'discount_rate'], observed=True).cumcount())
+    wide = tidy.groupby(ITEM_KEYS + ['variant', 'metric', 'discount_rate'], observed=True)['value'].first().unstack(['metric', 'discount_rate'])
+    if LCOE_METRIC not in wide.columns.get_level_values('metric'):
+        raise ValueError("The cost tables have no LCOE values at any discount rate.")
+    lcoe = wide[LCOE_METRIC]
+    anchors = lcoe.columns.to_numpy(dtype='float64')
+    complete = lcoe.notna().all(axis=1).to_numpy()
+    if not complete.all():
+        print(f"Warning (Sensitivity): {int((~complete).sum())} cost rows lack LCOE at some of the rates "
+              f"{', '.join(f'{rate:.0%}' for rate in anchors)}. Leaving them out.")
+    capital = sum((wide[metric].reindex(columns=lcoe.columns).fillna(0.0) for metric in CAPITAL_METRICS
+                   if metric in wide.columns.get_level_values('metric')), pd.DataFrame(0.0, index=wide.index, columns=lcoe.columns))
+    items = wide.index.to_frame(index=False)[complete].reset_index(drop=True)
+    return CostArrays(items, anchors, lcoe.to_numpy()[complete], capital.to_numpy()[complete])
+
+
+def rate_basis(rates, anchors):
+    rates = np.asarray(rates, dtype='float64')[:, None]
+    basis = np.ones((len(rates), len(anchors)))
+    for k, anchor in enumerate(anchors):
+        for other in np.delete(anchors, k):
+            basis[:, k] *= (rates[:, 0] - other) / (anchor - other)
+    return basis
+
+
+def _source_terms(component, weights, source_matrix):
+    return np.stack([(source_matrix * weights[:, [c]]).T @ component.T for c in range(weights.shape[1])])
+
+
+def _simulate_batch(seed, size, capital_terms, other_terms, uncertainty):
+    rng = np.random.default_rng(seed)
+    shape = (size, capital_terms.shape[1])
+    capital_sigma, other_sigma = uncertainty['capital'], uncertainty['other']
+    capital_multipliers = np.exp(rng.standard_normal(shape) * capital_sigma - capital_sigma ** 2 / 2)
+    other_multipliers = np.exp(rng.standard_normal(shape) * other_sigma - other_sigma ** 2 / 2)
+    return np.stack([capital_multipliers @ capital_terms[c] + other_multipliers @ other_terms[c]
+                     for c in range(len(capital_terms))], axis=1)
+
+
+def _ranks(means):
+    return means.argsort(axis=-2, kind='stable').argsort(axis=-2, kind='stable')
+
+
+def sensitivity_grid(start=SENSITIVITY_RATES[0], stop=SENSITIVITY_RATES[1], step=SENSITIVITY_RATES[2]):
+    return np.round(np.arange(start, stop + step / 2, step), 6)
+
+
+def run_sensitivity(arrays, rates=None, scenarios=SENSITIVITY_SCENARIOS, workers=1, seed=SENSITIVITY_SEED,
+                    uncertainty=None, batch=SCENARIO_BATCH):
+    rates = sensitivity_grid() if rates is None else np.asarray(rates, dtype='float64')
+    uncertainty = uncertainty or COST_UNCERTAINTY
+    outside = (rates < arrays.anchors.min()) | (rates > arrays.anchors.max())
+    if outside.any():
+        print(f"Warning (Sensitivity): {int(outside.sum())} discount rates lie outside the tabulated "
+              f"{arrays.anchors.min():.0%}-{arrays.anchors.max():.0%} range and are extrapolated.")
+    basis = rate_basis(rates, arrays.anchors)
+    lcoe, capital = basis @ arrays.lcoe.T, basis @ arrays.capital.T
+    weights, source_matrix = arrays.category_weights, arrays.source_matrix
+    capital_terms = _source_terms(capital, weights, source_matrix)
+    other_terms = _source_terms(lcoe - capital, weights, source_matrix)
+
+    base = (lcoe @ weights).T
+    sizes = [min(batch, scenarios - start) for start in range(0, scenarios, batch)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    jobs = [(batch_seed, size, capital_terms, other_terms, uncertainty) for batch_seed, size in zip(seeds, sizes)]
+    if workers and workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            means = np.concatenate(list(executor.map(_simulate_batch, *zip(*jobs))))
+    else:
+        means = np.concatenate([_simulate_batch(*job) for job in jobs]) if jobs else np.empty((0, *base.shape))
+
+    reference = np.abs(rates - REFERENCE_RATE).argmin()
+    ranks, base_ranks = _ranks(means), _ranks(base)
+    cheapest = ranks == 0
+    rows = []
+    for c, category in enumerate(arrays.categories):
+        percentiles = np.percentile(means[:, c], PERCENTILES, axis=0) if len(means) else np.full((len(PERCENTILES), len(rates)), np.nan)
+        frame = pd.DataFrame({'discount_rate': rates, 'category': category, 'base_lcoe': base[c],
+                              'mean_lcoe': means[:, c].mean(axis=0) if len(means) else np.nan})
+        for percentile, values in zip(PERCENTILES, percentiles):
+            frame[f'p{percentile}_lcoe'] = values
+        frame['base_rank'] = base_ranks[c] + 1
+        frame['p_cheapest'] = cheapest[:, c].mean(axis=0) if len(means) else np.nan
+        frame['p_rank_change'] = (ranks[:, c] != base_ranks[c, reference]).mean(axis=0) if len(means) else np.nan
+        rows.append(frame)
+    summary = pd.concat(rows, ignore_index=True).sort_values(['discount_rate', 'category'], ignore_index=True)
+    order_changed = (ranks != base_ranks[None, :, [reference]]).any(axis=1)
+    rank_changes = pd.DataFrame({'discount_rate': rates, 'base_order': [' < '.join(np.array(arrays.categories)[base[:, r].argsort(kind='stable')])
+                                                                        for r in range(len(rates))],
+                                 'p_order_change': order_changed.mean(axis=0) if len(means) else np.nan})
+    return summary, rank_changes
+
+
+def default_tables():
+    return [entry['table'] for entry in COST_TABLES if entry['category'] in SENSITIVITY_CATEGORIES]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Monte Carlo LCOE sensitivity over a dense grid of discount rates.')
+    parser.add_argument('--dir', default=COSTS_DIR,
+                        help=f'folder with the IEA cost table CSVs (default: {COSTS_DIR})')
+    parser.add_argument('--tables', nargs='+', default=None,
+                        help='cost tables to include (default: every Green, Nuclear and Traditional table)')
+    parser.add_argument('--rates', nargs=3, type=float, default=list(SENSITIVITY_RATES), metavar=('START', 'STOP', 'STEP'),
+                        help='discount rate grid (default: 0.03 0.10 0.0025)')
+    parser.add_argument('--scenarios', type=int, default=SENSITIVITY_SCENARIOS,
+                        help=f'Monte Carlo cost scenarios (default: {SENSITIVITY_SCENARIOS})')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='processes for the scenario batches (default: 1)')
+    parser.add_argument('--seed', type=int, default=SENSITIVITY_SEED,
+                        help=f'random seed (default: {SENSITIVITY_SEED})')
+    parser.add_argument('--capital-sigma', type=float, default=COST_UNCERTAINTY['capital'],
+                        help=f"log-normal spread of the capital part of LCOE (default: {COST_UNCERTAINTY['capital']})")
+    parser.add_argument('--other-sigma', type=float, default=COST_UNCERTAINTY['other'],
+                        help=f"log-normal spread of fuel, O&M and carbon costs (default: {COST_UNCERTAINTY['other']})")
+    parser.add_argument('--output', default=None,
+                        help='optional CSV path for the per-rate, per-category summary')
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    tidy = load_cost_tables(args.dir, tables=args.tables or default_tables(), metrics=[LCOE_METRIC] + CAPITAL_METRICS)
+    if tidy.empty:
+        raise SystemExit(f"Error (Sensitivity): no cost tables found in {args.dir}.")
+    arrays = build_cost_arrays(tidy)
+    started = time.perf_counter()
+    summary, rank_changes = run_sensitivity(arrays, sensitivity_grid(*args.rates), args.scenarios, args.workers, args.seed,
+                                            {'capital': args.capital_sigma, 'other': args.other_sigma})
+    print(f"Sensitivity: {len(arrays.items)} cost rows x {len(rank_changes)} discount rates x {args.scenarios} scenarios "
+          f"in {time.perf_counter() - started:.2f}s")
+    print(summary.round(3).to_string(index=False))
+    print(rank_changes.round(3).to_string(index=False))
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+        summary.to_csv(args.output, index=False)
+        print(f"Sensitivity: summary written to {args.output}")
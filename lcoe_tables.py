@@ -0,0 +1,148 @@
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from dtype_policy import compact_frame
+from energy_cache import load_cached
+
+
+LCOE_METRIC = 'LCOE (USD/MWh)'
+
+COST_TABLES = [
+    {'table': '3.1', 'file': '3_1.csv', 'source': 'All technologies (summary)', 'category': 'Other'},
+    {'table': '3.2.a', 'file': '3_2_a_b.csv', 'source': 'Gas CCGT', 'category': 'Traditional'},
+    {'table': '3.2.b', 'file': '3_2_a_b.csv', 'source': 'Gas OCGT', 'category': 'Traditional'},
+    {'table': '3.3', 'file': '3_3.csv', 'source': 'Coal', 'category': 'Traditional'},
+    {'table': '3.4.a', 'file': '3_4_a_b.csv', 'source': 'Nuclear new build', 'category': 'Nuclear'},
+    {'table': '3.4.b', 'file': '3_4_a_b.csv', 'source': 'Nuclear LTO', 'category': 'Nuclear'},
+    {'table': '3.5', 'file': '3_5.csv', 'source': 'Solar', 'category': 'Green'},
+    {'table': '3.6.a', 'file': '3_6_a_b.csv', 'source': 'Onshore wind', 'category': 'Green'},
+    {'table': '3.6.b', 'file': '3_6_a_b.csv', 'source': 'Offshore wind', 'category': 'Green'},
+    {'table': '3.7.a', 'file': '3_7_a_b_c.csv', 'source': 'Hydropower', 'category': 'Green'},
+    {'table': '3.7.b', 'file': '3_7_a_b_c.csv', 'source': 'Biomass', 'category': 'Green'},
+    {'table': '3.7.c', 'file': '3_7_a_b_c.csv', 'source': 'Geothermal', 'category': 'Green'},
+    {'table': '3.8', 'file': '3_8.csv', 'source': 'CHP', 'category': 'Other'},
+    {'table': '3.9', 'file': '3_9.csv', 'source': 'Storage', 'category': 'Other'},
+    {'table': '3.10', 'file': '3_10.csv', 'source': 'Fuel cells', 'category': 'Other'},
+    {'table': '3.11.a', 'file': '3_11_a_b.csv', 'source': 'Gas CCGT (85% CF)', 'category': 'Traditional'},
+    {'table': '3.11.b', 'file': '3_11_a_b.csv', 'source': 'Gas OCGT (30% CF)', 'category': 'Traditional'},
+    {'table': '3.12', 'file': '3_12.csv', 'source': 'Coal (85% CF)', 'category': 'Traditional'},
+    {'table': '3.13.a', 'file': '3_13_a_b1_b2.csv', 'source': 'Nuclear new build (85% CF)', 'category': 'Nuclear'},
+    {'table': '3.13.b1', 'file': '3_13_a_b1_b2.csv', 'source': 'Nuclear LTO 10y (85% CF)', 'category': 'Nuclear'},
+    {'table': '3.13.b2', 'file': '3_13_a_b1_b2.csv', 'source': 'Nuclear LTO 20y (85% CF)', 'category': 'Nuclear'},
+    {'table': '3.14', 'file': '3_14.csv', 'source': 'Solar', 'category': 'Green'},
+    {'table': '3.15.a', 'file': '3_15_a_b.csv', 'source': 'Onshore wind', 'category': 'Green'},
+    {'table': '3.15.b', 'file': '3_15_a_b.csv', 'source': 'Offshore wind', 'category': 'Green'},
+    {'table': '3.16.a', 'file': '3_16_a_b_c.csv', 'source': 'Hydropower', 'category': 'Green'},
+    {'table': '3.16.b', 'file': '3_16_a_b_c.csv', 'source': 'Biomass', 'category': 'Green'},
+    {'table': '3.16.c', 'file': '3_16_a_b_c.csv', 'source': 'Geothermal', 'category': 'Green'},
+    {'table': '3.17', 'file': '3_17.csv', 'source': 'CHP', 'category': 'Other'},
+    {'table': '3.18', 'file': '3_18.csv', 'source': 'Storage', 'category': 'Other'},
+    {'table': '3.19', 'file': '3_19.csv', 'source': 'Fuel cells', 'category': 'Other'},
+    {'table': '3.20.a', 'file': '3_20a_b.csv', 'source': 'Gas CCGT (50% CF)', 'category': 'Traditional'},
+    {'table': '3.20.b', 'file': '3_20a_b.csv', 'source': 'Gas OCGT (10% CF)', 'category': 'Traditional'},
+    {'table': '3.21', 'file': '3_21.csv', 'source': 'Coal (50% CF)', 'category': 'Traditional'},
+    {'table': '3.22.a', 'file': '3_22_a_b1_b2.csv', 'source': 'Nuclear new build (50% CF)', 'category': 'Nuclear'},
+    {'table': '3.22.b1', 'file': '3_22_a_b1_b2.csv', 'source': 'Nuclear LTO 10y (50% CF)', 'category': 'Nuclear'},
+    {'table': '3.22.b2', 'file': '3_22_a_b1_b2.csv', 'source': 'Nuclear LTO 20y (50% CF)', 'category': 'Nuclear'},
+]
+
+TIDY_COLUMNS = ['table', 'source', 'category', 'technology', 'country', 'metric', 'discount_rate', 'value']
+
+_HEADER_SKIPROWS = 3
+_TITLE_PATTERN = r'^\s*Table\s+(\d+\.\d+(?:\.[a-z0-9]+)?)\s*:'
+
+
+def _clean_label(label):
+    if pd.isna(label):
+        return None
+    return re.sub(r'\s+', ' ', str(label)).strip()
+
+
+def read_table_layout(path):
+    header = pd.read_csv(path, header=None, skiprows=_HEADER_SKIPROWS, nrows=2, dtype=str)
+    groups = [_clean_label(label) for label in header.iloc[0]]
+    subs = [_clean_label(label) for label in header.iloc[1]]
+
+    key_columns = {}
+    metric_columns = []
+    current_group = None
+    for position, (group, sub) in enumerate(zip(groups, subs)):
+        if group in ('Country', 'Technology'):
+            key_columns.setdefault(group.lower(), position)
+            current_group = None
+            continue
+        if group is not None:
+            current_group = group
+        elif sub is None:
+            current_group = None
+        if current_group is None:
+            continue
+        rate = pd.to_numeric(sub, errors='coerce') if sub is not None else float('nan')
+        metric = current_group if pd.notna(rate) or sub is None else f'{current_group} ({sub})'
+        metric_columns.append((position, metric, rate))
+    return key_columns, metric_columns
+
+
+def _build_tidy_table(path, metrics):
+    key_columns, metric_columns = read_table_layout(path)
+    if metrics is not None:
+        metric_columns = [column for column in metric_columns if column[1] in metrics]
+    usecols = sorted({1, *key_columns.values(), *(position for position, _, _ in metric_columns)})
+
+    raw = pd.read_csv(path, header=None, skiprows=1, usecols=usecols, dtype=str)
+    raw.columns = usecols
+    table_ids = raw[1].str.extract(_TITLE_PATTERN, expand=False).ffill()
+
+    technology = raw[key_columns['technology']].str.strip() if 'technology' in key_columns else pd.Series(index=raw.index, dtype='object')
+    if 'country' in key_columns:
+        country = raw[key_columns['country']].str.strip().str.rstrip('*').str.strip()
+        header_rows = country.eq('Country') | raw[1].str.match(_TITLE_PATTERN, na=False)
+        country = country.mask(header_rows).groupby(table_ids).ffill()
+    else:
+        country = pd.Series(index=raw.index, dtype='object')
+    is_data = technology.notna() & technology.ne('Technology') & table_ids.notna()
+
+    pieces = []
+    for position, metric, rate in metric_columns:
+        values = pd.to_numeric(raw[position], errors='coerce')
+        keep = is_data & values.notna()
+        pieces.append(pd.DataFrame({
+            'table': table_ids[keep], 'technology': technology[keep], 'country': country[keep],
+            'metric': metric, 'discount_rate': rate, 'value': values[keep]
+        }))
+    if not pieces:
+        return pd.DataFrame({column: pd.Series(dtype='object') for column in TIDY_COLUMNS if column not in ('source', 'category')})
+    tidy = pd.concat(pieces, ignore_index=True)
+    tidy['discount_rate'] = tidy['discount_rate'].astype('float64')
+    return tidy
+
+
+def _load_tidy_file(path, metrics):
+    tag = 'tidy-all' if metrics is None else 'tidy-' + '-'.join(sorted(metrics))
+    return load_cached(path, lambda source: _build_tidy_table(source, metrics), tag=tag)
+
+
+def load_cost_tables(table_dir, tables=None, metrics=None, max_workers=8, compact=True):
+    registry = [entry for entry in COST_TABLES if tables is None or entry['table'] in tables]
+    metrics = None if metrics is None else tuple(metrics)
+    files = sorted({entry['file'] for entry in registry})
+
+    def load(file_name):
+        path = os.path.join(table_dir, file_name)
+        try:
+            return _load_tidy_file(path, metrics)
+        except FileNotFoundError:
+            print(f"Warning (Costs): {file_name} not found in {table_dir}. Skipping its tables.")
+            return None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        frames = [frame for frame in executor.map(load, files) if frame is not None and not frame.empty]
+    if not frames:
+        return pd.DataFrame({column: pd.Series(dtype='object') for column in TIDY_COLUMNS})
+
+    registry_df = pd.DataFrame(registry)[['table', 'source', 'category']]
+    tidy = pd.concat(frames, ignore_index=True).merge(registry_df, on='table', how='inner')[TIDY_COLUMNS]
+    return compact_frame(tidy) if compact else tidy
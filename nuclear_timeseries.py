@@ -0,0 +1,174 @@
+import argparse
+import calendar
+import os
+import shutil
+import tempfile
+
+import pandas as pd
+
+from dtype_policy import exact_floats
+from eia_tables import NUCLEAR_DIR, load_eia_table
+from energy_cache import CACHE_DIR
+
+
+NUCLEAR_STATE_DIR = os.path.join(CACHE_DIR, 'nuclear_state')
+ROLLING_WINDOW = 12
+ROLLING_STATISTICS = ['mean', 'std', 'min', 'max']
+CHECK_WINDOWS = (12, 6)
+CHECK_TOLERANCE = 1e-9
+
+MONTH_NUMBERS = {name: number for number, name in enumerate(calendar.month_name) if name}
+
+NUCLEAR_SERIES = {
+    'us': {'table': 'nuclear_overview', 'columns': {
+        'Nuclear Generating Units, Capacity Factor': 'capacity_factor_pct',
+        'Nuclear Electricity Net Generation': 'generation_gwh',
+        'Nuclear Share of Electricity Net Generation': 'share_pct',
+        'Nuclear Generating Units, Net Summer Capacity': 'capacity_gw',
+        'Nuclear Generating Units, Total Operable Units': 'operable_units',
+    }},
+    'world': {'table': 'world_monthly_generation', 'columns': {
+        'nuclear_generation_twh': 'generation_twh',
+        'share_of_generation_pct': 'share_pct',
+    }},
+}
+
+
+def monthly_frame(table, columns):
+    month = table['Month']
+    if not pd.api.types.is_numeric_dtype(month.dtype):
+        month = month.map(MONTH_NUMBERS).astype('float64')
+    unknown = month.isna()
+    if unknown.any():
+        print(f"Warning (Nuclear): {int(unknown.sum())} rows with an unknown month name were dropped.")
+        table, month = table[~unknown], month[~unknown]
+    dates = pd.to_datetime(pd.DataFrame({'year': table['Year'].to_numpy(), 'month': month.to_numpy(), 'day': 1}))
+    monthly = exact_floats(table[list(columns)]).rename(columns=columns).astype('float64')
+    monthly.index = pd.DatetimeIndex(dates, name='month')
+    monthly = monthly.sort_index()
+    duplicated = monthly.index.duplicated(keep='last')
+    if duplicated.any():
+        print(f"Warning (Nuclear): {int(duplicated.sum())} repeated months found. Keeping the last row of each.")
+        monthly = monthly[~duplicated]
+    return monthly.asfreq('MS')
+
+
+def load_nuclear_series(name, nuclear_dir=NUCLEAR_DIR):
+    series = NUCLEAR_SERIES[name]
+    return monthly_frame(load_eia_table(series['table'], nuclear_dir), series['columns'])
+
+
+def rolling_statistics(monthly, window=ROLLING_WINDOW):
+    rolled = monthly.rolling(window, min_periods=window).agg(ROLLING_STATISTICS)
+    rolled.columns = [f'{column}_{statistic}_{window}m' for column, statistic in rolled.columns]
+    return rolled
+
+
+def _state_paths(state_dir, name, window):
+    return (os.path.join(state_dir, f'{name}-monthly-{window}m.parquet'),
+            os.path.join(state_dir, f'{name}-rolling-{window}m.parquet'))
+
+
+def _first_changed_month(stored, stats, monthly):
+    if (not stored.index.isin(monthly.index).all() or not stats.index.isin(monthly.index).all()
+            or list(stored.columns) != list(monthly.columns)):
+        return monthly.index[0]
+    previous = stored.reindex(monthly.index)
+    same = (previous == monthly) | (previous.isna() & monthly.isna())
+    changed = ~same.all(axis=1) | ~monthly.index.isin(stored.index) | ~monthly.index.isin(stats.index)
+    return monthly.index[changed.to_numpy()][0] if changed.any() else None
+
+
+def update_rolling_statistics(name, monthly, window=ROLLING_WINDOW, state_dir=NUCLEAR_STATE_DIR):
+    os.makedirs(state_dir, exist_ok=True)
+    monthly_path, stats_path = _state_paths(state_dir, name, window)
+    if os.path.exists(monthly_path) and os.path.exists(stats_path):
+        stored, stats = pd.read_parquet(monthly_path).asfreq('MS'), pd.read_parquet(stats_path).asfreq('MS')
+        start = _first_changed_month(stored, stats, monthly)
+    else:
+        stats, start = None, monthly.index[0]
+    if start is None:
+        print(f"Nuclear: {name} series unchanged, {len(stats)} rolling rows reused.")
+        return stats
+
+    position = monthly.index.get_loc(start)
+    fresh = rolling_statistics(monthly.iloc[max(0, position - window + 1):], window).loc[start:]
+    stats = fresh if stats is None or position == 0 else pd.concat([stats[stats.index < start], fresh]).asfreq('MS')
+    monthly.to_parquet(monthly_path)
+    stats.to_parquet(stats_path)
+    print(f"Nuclear: {name} series recomputed {len(fresh)} of {len(stats)} rolling rows from {start:%Y-%m}.")
+    return stats
+
+
+def nuclear_rolling_statistics(names=None, nuclear_dir=NUCLEAR_DIR, window=ROLLING_WINDOW, state_dir=NUCLEAR_STATE_DIR):
+    results = {}
+    for name in names or NUCLEAR_SERIES:
+        try:
+            monthly = load_nuclear_series(name, nuclear_dir)
+        except FileNotFoundError as exc:
+            print(f"Warning (Nuclear): {name} series not found ({exc}). Skipping it.")
+            continue
+        results[name] = (monthly, update_rolling_statistics(name, monthly, window, state_dir))
+    return results
+
+
+def reset_nuclear_state(state_dir=NUCLEAR_STATE_DIR):
+    if os.path.isdir(state_dir):
+        shutil.rmtree(state_dir)
+
+
+def check_incremental_updates(names=None, nuclear_dir=NUCLEAR_DIR, windows=CHECK_WINDOWS):
+    state_dir = tempfile.mkdtemp(prefix='nuclear-check-')
+    results = {}
+    try:
+        for name in names or NUCLEAR_SERIES:
+            monthly = load_nuclear_series(name, nuclear_dir)
+            truncated = monthly.iloc[:len(monthly) * 4 // 5]
+            runs = [(windows[0], truncated)] + [(window, monthly) for window in windows[1:]] + [(windows[0], monthly)]
+            ok = True
+            for window, series in runs:
+                stats = update_rolling_statistics(name, series, window, state_dir)
+                try:
+                    pd.testing.assert_frame_equal(stats, rolling_statistics(series, window), rtol=CHECK_TOLERANCE, check_freq=False)
+                except AssertionError as exc:
+                    print(f"Error (Nuclear): {name} {window}-month statistics differ from a full recompute: {exc}")
+                    ok = False
+            results[name] = ok
+            print(f"Nuclear: {name} incremental check {'passed' if ok else 'FAILED'} "
+                  f"(windows {', '.join(str(window) for window, _ in runs)}).")
+    finally:
+        shutil.rmtree(state_dir, ignore_errors=True)
+    return results
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Rolling statistics of the monthly US and world nuclear generation series.')
+    parser.add_argument('--dir', default=NUCLEAR_DIR,
+                        help=f'folder with the EIA CSV files (default: {NUCLEAR_DIR})')
+    parser.add_argument('--series', nargs='+', choices=list(NUCLEAR_SERIES), default=None,
+                        help='series to process (default: all)')
+    parser.add_argument('--window', type=int, default=ROLLING_WINDOW,
+                        help=f'rolling window in months (default: {ROLLING_WINDOW})')
+    parser.add_argument('--reset', action='store_true',
+                        help='drop the stored series and recompute every rolling statistic')
+    parser.add_argument('--check', action='store_true',
+                        help='check incremental updates across windows against a full recompute and exit')
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.window < 2:
+        raise SystemExit('Error (Nuclear): --window must be at least 2 months.')
+    if args.check:
+        raise SystemExit(0 if all(check_incremental_updates(args.series, args.dir).values()) else 1)
+    if args.reset:
+        reset_nuclear_state()
+    for name, (monthly, stats) in nuclear_rolling_statistics(args.series, args.dir, args.window).items():
+        latest = stats.dropna(how='all')
+        if latest.empty:
+            print(f"Nuclear: {name} has fewer than {args.window} months.")
+            continue
+        print(f"Nuclear: {name} {monthly.index[0]:%Y-%m} to {monthly.index[-1]:%Y-%m}, latest {args.window}-month window:")
+        for column, value in latest.iloc[-1].items():
+            print(f"    {column}: {value:.3f}")
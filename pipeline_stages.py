@@ -0,0 +1,89 @@
+import cProfile
+import json
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+
+PROFILE_FILE_SUFFIX = '.prof'
+
+_current_run = None
+
+
+def _new_stage_record():
+    return {'calls': 0, 'wall_seconds': 0.0, 'cpu_seconds': 0.0, 'rows': None, 'peak_traced_bytes': None}
+
+
+def _close_stage():
+    if _current_run is None or _current_run['stage'] is None:
+        return
+    record = _current_run['record']['stages'].setdefault(_current_run['stage'], _new_stage_record())
+    record['calls'] += 1
+    record['wall_seconds'] += time.perf_counter() - _current_run['wall_started']
+    record['cpu_seconds'] += time.process_time() - _current_run['cpu_started']
+    if _current_run['rows'] is not None:
+        record['rows'] = (record['rows'] or 0) + int(_current_run['rows'])
+    if _current_run['memory']:
+        peak = tracemalloc.get_traced_memory()[1]
+        record['peak_traced_bytes'] = max(record['peak_traced_bytes'] or 0, peak)
+    _current_run['stage'] = None
+
+
+def mark_stage(stage, rows=None):
+    if _current_run is None:
+        return
+    _close_stage()
+    if _current_run['memory']:
+        tracemalloc.reset_peak()
+    _current_run.update({'stage': stage, 'rows': rows,
+                         'wall_started': time.perf_counter(), 'cpu_started': time.process_time()})
+
+
+@contextmanager
+def track_stages(generator, memory=False, profile_path=None):
+    global _current_run
+    previous = _current_run
+    started_tracing = memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    record = {'generator': generator, 'stages': {}, 'wall_seconds': None, 'cpu_seconds': None,
+              'peak_traced_bytes': None, 'profile': profile_path}
+    _current_run = {'record': record, 'memory': memory, 'stage': None, 'rows': None}
+    profiler = cProfile.Profile() if profile_path else None
+    wall_started, cpu_started = time.perf_counter(), time.process_time()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield record
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        _close_stage()
+        record['wall_seconds'] = time.perf_counter() - wall_started
+        record['cpu_seconds'] = time.process_time() - cpu_started
+        if memory:
+            record['peak_traced_bytes'] = max([stage['peak_traced_bytes'] or 0 for stage in record['stages'].values()]
+                                              + [tracemalloc.get_traced_memory()[1]])
+        if started_tracing:
+            tracemalloc.stop()
+        if profiler is not None:
+            os.makedirs(os.path.dirname(profile_path) or '.', exist_ok=True)
+            profiler.dump_stats(profile_path)
+        _current_run = previous
+
+
+def profile_path_for(cprofile_dir, generator):
+    if not cprofile_dir:
+        return None
+    return os.path.join(cprofile_dir, f'{generator}{PROFILE_FILE_SUFFIX}')
+
+
+def write_profile_report(runs, path, settings=None):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    report = {'created': time.strftime('%Y-%m-%d %H:%M:%S'), 'settings': settings or {}, 'runs': runs}
+    with open(path, 'w', encoding='utf-8') as report_file:
+        json.dump(report, report_file, indent=2)
+    return path
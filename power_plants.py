@@ -0,0 +1,185 @@
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from dtype_policy import compact_frame, exact_floats
+from eia_tables import NUCLEAR_DIR
+from energy_cache import load_cached
+
+
+PLANT_DATABASE_FILE = 'global_power_plant_database.csv'
+PLANT_COLUMNS = ['country', 'country_long', 'name', 'capacity_mw', 'latitude', 'longitude', 'primary_fuel']
+GRID_CELL_DEGREES = 1.0
+EARTH_RADIUS_KM = 6371.0088
+
+PLANT_CATEGORIES = ['Green', 'Traditional', 'Nuclear', 'Other']
+FUEL_CATEGORIES = {
+    'Solar': 'Green', 'Wind': 'Green', 'Hydro': 'Green', 'Biomass': 'Green', 'Geothermal': 'Green',
+    'Wave and Tidal': 'Green', 'Nuclear': 'Nuclear', 'Coal': 'Traditional', 'Gas': 'Traditional',
+    'Oil': 'Traditional', 'Petcoke': 'Traditional', 'Cogeneration': 'Traditional',
+}
+
+
+def _grid_shape(cell_degrees):
+    return int(np.ceil(180 / cell_degrees)), int(np.ceil(360 / cell_degrees))
+
+
+def _grid_rows(latitude, cell_degrees):
+    n_rows = _grid_shape(cell_degrees)[0]
+    return np.clip(np.floor((np.asarray(latitude) + 90) / cell_degrees).astype('int64'), 0, n_rows - 1)
+
+
+def _grid_columns(longitude, cell_degrees):
+    n_columns = _grid_shape(cell_degrees)[1]
+    return np.clip(np.floor((np.asarray(longitude) + 180) / cell_degrees).astype('int64'), 0, n_columns - 1)
+
+
+def _load_plants(path, cell_degrees=GRID_CELL_DEGREES):
+    plants = pd.read_csv(path, usecols=PLANT_COLUMNS, dtype={'country': 'category', 'country_long': 'category',
+                                                             'primary_fuel': 'category'})
+    located = plants['latitude'].between(-90, 90) & plants['longitude'].between(-180, 180) & plants['capacity_mw'].notna()
+    if not located.all():
+        print(f"Warning (Plants): {int((~located).sum())} plants without a valid location or capacity were dropped.")
+        plants = plants[located].copy()
+    plants['category'] = pd.Categorical(plants['primary_fuel'].astype(str).map(FUEL_CATEGORIES).fillna('Other'),
+                                        categories=PLANT_CATEGORIES)
+    n_columns = _grid_shape(cell_degrees)[1]
+    plants['cell'] = (_grid_rows(plants['latitude'], cell_degrees) * n_columns
+                      + _grid_columns(plants['longitude'], cell_degrees))
+    return compact_frame(plants.sort_values('cell', kind='stable').reset_index(drop=True))
+
+
+class PlantGrid:
+
+    def __init__(self, plants, cell_degrees=GRID_CELL_DEGREES):
+        self.plants = plants
+        self.cell_degrees = cell_degrees
+        self.n_rows, self.n_columns = _grid_shape(cell_degrees)
+        exact = exact_floats(plants[['latitude', 'longitude', 'capacity_mw']])
+        self.latitude = exact['latitude'].to_numpy(dtype='float64')
+        self.longitude = exact['longitude'].to_numpy(dtype='float64')
+        self.capacity = exact['capacity_mw'].to_numpy(dtype='float64')
+        self.fuels = pd.Index(plants['primary_fuel'].cat.categories, name='primary_fuel')
+        self.fuel_codes = plants['primary_fuel'].cat.codes.to_numpy(dtype='int64')
+        self.fuel_categories = pd.Series([FUEL_CATEGORIES.get(fuel, 'Other') for fuel in self.fuels], index=self.fuels)
+        self.offsets = np.searchsorted(plants['cell'].to_numpy(), np.arange(self.n_rows * self.n_columns + 1))
+        totals = pd.DataFrame({'country': plants['country'], 'category': plants['category'], 'capacity_mw': self.capacity})
+        self.country_capacity = (totals.groupby(['country', 'category'], observed=False)['capacity_mw'].sum()
+                                 .unstack('category').reindex(columns=PLANT_CATEGORIES, fill_value=0.0).astype('float64'))
+        self.country_capacity['Total'] = self.country_capacity.sum(axis=1)
+        self.country_capacity['Green share (%)'] = (
+            self.country_capacity['Green'] / self.country_capacity['Total'].where(self.country_capacity['Total'] > 0) * 100
+        )
+
+    def _candidates(self, lat_min, lat_max, lon_ranges):
+        rows = range(_grid_rows(lat_min, self.cell_degrees), _grid_rows(lat_max, self.cell_degrees) + 1)
+        slices = []
+        for lon_min, lon_max in lon_ranges:
+            first, last = _grid_columns(lon_min, self.cell_degrees), _grid_columns(lon_max, self.cell_degrees)
+            for row in rows:
+                start, stop = self.offsets[row * self.n_columns + first], self.offsets[row * self.n_columns + last + 1]
+                if stop > start:
+                    slices.append(np.arange(start, stop))
+        return np.concatenate(slices) if slices else np.empty(0, dtype='int64')
+
+    def _capacity_by_fuel(self, index):
+        codes = self.fuel_codes[index]
+        summary = pd.DataFrame({
+            'category': self.fuel_categories,
+            'plants': np.bincount(codes, minlength=len(self.fuels)),
+            'capacity_mw': np.bincount(codes, weights=self.capacity[index], minlength=len(self.fuels)),
+        }, index=self.fuels)
+        return summary[summary['plants'] > 0].sort_values('capacity_mw', ascending=False)
+
+    def bbox(self, lat_min, lat_max, lon_min, lon_max):
+        lon_ranges = [(lon_min, lon_max)] if lon_min <= lon_max else [(lon_min, 180.0), (-180.0, lon_max)]
+        index = self._candidates(lat_min, lat_max, lon_ranges)
+        latitude, longitude = self.latitude[index], self.longitude[index]
+        inside = (latitude >= lat_min) & (latitude <= lat_max)
+        inside &= np.logical_or.reduce([(longitude >= low) & (longitude <= high) for low, high in lon_ranges])
+        return self._capacity_by_fuel(index[inside])
+
+    def radius(self, lat, lon, km):
+        lat_delta = np.degrees(km / EARTH_RADIUS_KM)
+        lat_min, lat_max = max(-90.0, lat - lat_delta), min(90.0, lat + lat_delta)
+        widest = np.cos(np.radians(max(abs(lat_min), abs(lat_max))))
+        lon_delta = np.degrees(km / (EARTH_RADIUS_KM * widest)) if widest > 1e-12 else 180.0
+        if lon_delta >= 180:
+            lon_ranges = [(-180.0, 180.0)]
+        else:
+            low, high = lon - lon_delta, lon + lon_delta
+            lon_ranges = [(max(low, -180.0), min(high, 180.0))]
+            if low < -180:
+                lon_ranges.append((low + 360, 180.0))
+            if high > 180:
+                lon_ranges.append((-180.0, high - 360))
+        index = self._candidates(lat_min, lat_max, lon_ranges)
+        index = np.unique(index) if len(lon_ranges) > 1 else index
+        phi, plant_phi = np.radians(lat), np.radians(self.latitude[index])
+        half_chord = (np.sin((plant_phi - phi) / 2) ** 2
+                      + np.cos(phi) * np.cos(plant_phi) * np.sin(np.radians(self.longitude[index] - lon) / 2) ** 2)
+        distance = 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(half_chord, 1.0)))
+        return self._capacity_by_fuel(index[distance <= km])
+
+    def country_totals(self, countries=None):
+        if countries is None:
+            return self.country_capacity
+        missing = [country for country in countries if country not in self.country_capacity.index]
+        if missing:
+            raise LookupError(f"No plants for country code(s): {', '.join(missing)}.")
+        return self.country_capacity.loc[list(countries)]
+
+
+def default_plant_path(nuclear_dir=NUCLEAR_DIR):
+    return os.path.join(nuclear_dir, PLANT_DATABASE_FILE)
+
+
+def load_plant_grid(path=None, cell_degrees=GRID_CELL_DEGREES):
+    path = path or default_plant_path()
+    plants = load_cached(path, lambda source: _load_plants(source, cell_degrees), tag=f'plants-grid-{cell_degrees:g}')
+    return PlantGrid(plants, cell_degrees)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Query capacity by fuel from a local copy of the WRI Global Power Plant Database.')
+    parser.add_argument('--csv', default=default_plant_path(),
+                        help=f'path to {PLANT_DATABASE_FILE} (default: {default_plant_path()})')
+    parser.add_argument('--cell', type=float, default=GRID_CELL_DEGREES,
+                        help=f'grid cell size in degrees (default: {GRID_CELL_DEGREES})')
+    parser.add_argument('--bbox', nargs=4, type=float, metavar=('LAT_MIN', 'LAT_MAX', 'LON_MIN', 'LON_MAX'),
+                        help='capacity by fuel inside a bounding box (LON_MIN > LON_MAX crosses the antimeridian)')
+    parser.add_argument('--radius', nargs=3, type=float, metavar=('LAT', 'LON', 'KM'),
+                        help='capacity by fuel within KM kilometres of a point')
+    parser.add_argument('--country', nargs='+', default=None,
+                        help='ISO 3166-1 alpha-3 codes for green-versus-traditional capacity totals')
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    try:
+        started = time.perf_counter()
+        grid = load_plant_grid(args.csv, args.cell)
+    except FileNotFoundError:
+        raise SystemExit(f"Error (Plants): {args.csv} not found. Download global_power_plant_database.csv from "
+                         f"https://datasets.wri.org/dataset/globalpowerplantdatabase and pass it with --csv.")
+    print(f"Plants: indexed {len(grid.plants)} plants in {(time.perf_counter() - started) * 1000:.1f} ms")
+    queries = []
+    if args.bbox:
+        queries.append((f"bounding box {args.bbox}", lambda: grid.bbox(*args.bbox)))
+    if args.radius:
+        queries.append((f"{args.radius[2]:g} km around ({args.radius[0]:g}, {args.radius[1]:g})", lambda: grid.radius(*args.radius)))
+    if args.country or not queries:
+        queries.append(('country totals (MW)', lambda: grid.country_totals(args.country).round(1)))
+    for label, query in queries:
+        started = time.perf_counter()
+        try:
+            result = query()
+        except LookupError as exc:
+            print(f"Error (Plants): {exc}")
+            continue
+        print(f"Plants: {label} answered in {(time.perf_counter() - started) * 1000:.2f} ms")
+        print(result.to_string())
@@ -0,0 +1,160 @@
+import argparse
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from dtype_policy import compact_frame
+from energy_cache import cache_entry
+
+
+RENEWABLES_DIR = 'Renewable Energy World Wide  1965~2022'
+RENEWABLES_FILES = [
+    '01 renewable-share-energy.csv',
+    '02 modern-renewable-energy-consumption.csv',
+    '03 modern-renewable-prod.csv',
+    '04 share-electricity-renewables.csv',
+    '05 hydropower-consumption.csv',
+    '06 hydro-share-energy.csv',
+    '07 share-electricity-hydro.csv',
+    '08 wind-generation.csv',
+    '09 cumulative-installed-wind-energy-capacity-gigawatts.csv',
+    '10 wind-share-energy.csv',
+    '11 share-electricity-wind.csv',
+    '12 solar-energy-consumption.csv',
+    '13 installed-solar-PV-capacity.csv',
+    '14 solar-share-energy.csv',
+    '15 share-electricity-solar.csv',
+    '16 biofuel-production.csv',
+    '17 installed-geothermal-capacity.csv',
+]
+STORE_KEYS = ['Entity', 'Year']
+STORE_ROW_GROUP_SIZE = 2048
+CHECK_UNKNOWN_METRIC = 'Not A Metric'
+
+
+def _read_renewables_file(path):
+    df = pd.read_csv(path, dtype={'Entity': 'string', 'Code': 'string'})
+    return df.dropna(subset=STORE_KEYS).drop_duplicates(subset=STORE_KEYS, keep='last').set_index(STORE_KEYS)
+
+
+def build_renewables_store(paths, compact=True):
+    frames = [_read_renewables_file(path) for path in paths]
+    keys = frames[0].index
+    for frame in frames[1:]:
+        keys = keys.union(frame.index)
+    store = pd.DataFrame(index=keys.sort_values())
+
+    for path, frame in zip(paths, frames):
+        frame = frame.reindex(store.index)
+        for column in frame.columns:
+            if column not in store.columns:
+                store[column] = frame[column]
+                continue
+            both = store[column].notna() & frame[column].notna()
+            if column != 'Code':
+                conflicts = int((both & ((store[column] - frame[column]).abs() > 1e-6)).sum())
+                if conflicts:
+                    print(f"Warning (Renewables): {conflicts} values of '{column}' in {os.path.basename(path)} differ from an earlier file. Keeping the earlier values.")
+            store[column] = store[column].fillna(frame[column])
+
+    store = store.reset_index().sort_values(STORE_KEYS, ignore_index=True)
+    return compact_frame(store) if compact else store
+
+
+def renewables_paths(renewables_dir=RENEWABLES_DIR, files=None):
+    return tuple(os.path.join(renewables_dir, file_name) for file_name in (files or RENEWABLES_FILES))
+
+
+def _select(store, entities, metrics, years):
+    mask = pd.Series(True, index=store.index)
+    if entities is not None:
+        mask &= store['Entity'].isin(entities)
+    if years is not None:
+        mask &= store['Year'].between(*years)
+    columns = STORE_KEYS + [column for column in (metrics or store.columns) if column not in STORE_KEYS]
+    return store.loc[mask, columns]
+
+
+def _check_metrics(metrics, columns):
+    unknown = [metric for metric in metrics if metric not in columns]
+    if unknown:
+        valid = ', '.join(f"'{column}'" for column in columns if column not in STORE_KEYS)
+        raise ValueError(f"unknown metric {', '.join(repr(metric) for metric in unknown)}. Valid metrics: {valid}")
+
+
+def load_renewables(renewables_dir=RENEWABLES_DIR, entities=None, metrics=None, years=None, cache_dir=None):
+    paths = renewables_paths(renewables_dir)
+    store_file, store = cache_entry(paths, build_renewables_store, tag='renewables-compact', cache_dir=cache_dir,
+                                    parquet_options={'row_group_size': STORE_ROW_GROUP_SIZE})
+    if metrics is not None:
+        if store is not None:
+            _check_metrics(metrics, list(store.columns))
+        else:
+            import pyarrow.parquet
+            _check_metrics(metrics, pyarrow.parquet.read_schema(store_file).names)
+    if store is not None:
+        selection = _select(store, entities, metrics, years)
+    else:
+        filters = []
+        if entities is not None:
+            filters.append(('Entity', 'in', list(entities)))
+        if years is not None:
+            filters.extend([('Year', '>=', years[0]), ('Year', '<=', years[1])])
+        columns = None if metrics is None else STORE_KEYS + [metric for metric in metrics if metric not in STORE_KEYS]
+        selection = pd.read_parquet(store_file, columns=columns, filters=filters or None, memory_map=True)
+    if entities is not None:
+        selection['Entity'] = selection['Entity'].cat.remove_unused_categories()
+    return selection.set_index(STORE_KEYS)
+
+
+def check_unknown_metric(renewables_dir=RENEWABLES_DIR):
+    ok = True
+    with tempfile.TemporaryDirectory(prefix='renewables-check-') as cache_dir:
+        for state in ('cold', 'warm'):
+            try:
+                load_renewables(renewables_dir, metrics=[CHECK_UNKNOWN_METRIC], cache_dir=cache_dir)
+            except ValueError as exc:
+                if 'Valid metrics:' not in str(exc):
+                    print(f"Renewables: {state} cache error does not list the valid metrics: {exc}")
+                    ok = False
+            else:
+                print(f"Renewables: {state} cache accepted the unknown metric {CHECK_UNKNOWN_METRIC!r}")
+                ok = False
+            if state == 'cold':
+                metric = load_renewables(renewables_dir, cache_dir=cache_dir).columns[-1]
+                if list(load_renewables(renewables_dir, metrics=[metric], cache_dir=cache_dir).columns) != [metric]:
+                    print(f"Renewables: a known metric {metric!r} was not returned")
+                    ok = False
+    print(f"Renewables: unknown metric check {'passed' if ok else 'FAILED'}")
+    return ok
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Query the merged Renewable Energy World Wide 1965~2022 store.')
+    parser.add_argument('--dir', default=RENEWABLES_DIR,
+                        help=f'folder with the 17 CSV files (default: {RENEWABLES_DIR})')
+    parser.add_argument('--entity', nargs='+', default=None,
+                        help='countries or regions to return (default: all)')
+    parser.add_argument('--metric', nargs='+', default=None,
+                        help='metric columns to return (default: all)')
+    parser.add_argument('--years', nargs=2, type=int, default=None, metavar=('FIRST', 'LAST'),
+                        help='inclusive year range (default: all years)')
+    parser.add_argument('--check', action='store_true',
+                        help='only check that unknown metrics are rejected with a cold and a warm cache')
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.check:
+        raise SystemExit(0 if check_unknown_metric(args.dir) else 1)
+    started = time.perf_counter()
+    try:
+        result = load_renewables(args.dir, args.entity, args.metric, args.years)
+    except ValueError as exc:
+        print(f"Error (Renewables): {exc}")
+        raise SystemExit(1)
+    print(result)
+    print(f"Renewables: {len(result)} rows x {len(result.columns)} metrics in {time.perf_counter() - started:.3f}s")
@@ -0,0 +1,13 @@
+import importlib.util
+import os
+
+
+REPORT_SCRIPT = 'Data-Analysis-Between-Traditional-and-Green-sources-of-energy.py'
+
+
+def load_report_module():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    spec = importlib.util.spec_from_file_location('energy_report', os.path.join(script_dir, REPORT_SCRIPT))
+    report = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(report)
+    return report
@@ -0,0 +1,111 @@
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from dtype_policy import compact_frame, exact_floats
+from energy_cache import load_cached
+
+
+SHARES_DIR = 'Renewable vs Nuclear Energy generation (1965-)'
+SHARE_TABLES = {
+    'electricity': {'file': 'share-elec-produc-by-source.csv', 'suffix': ' (% electricity)'},
+    'energy': {'file': 'share-energy-consum-by-source.csv', 'suffix': ' (% sub energy)'},
+}
+
+SOURCE_CATEGORIES = {
+    'Hydro': 'Green', 'Solar': 'Green', 'Wind': 'Green', 'Other renewables': 'Green',
+    'Coal': 'Traditional', 'Oil': 'Traditional', 'Gas': 'Traditional', 'Nuclear': 'Nuclear',
+}
+CATEGORY_ORDER = ['Green', 'Traditional', 'Nuclear']
+
+
+def category_weights(sources, groups=None, categories=None):
+    groups = SOURCE_CATEGORIES if groups is None else groups
+    categories = categories or list(dict.fromkeys(groups.values()))
+    weights = pd.DataFrame(0.0, index=pd.Index(sources, name='source'), columns=pd.Index(categories, name='category'))
+    for source, category in groups.items():
+        if source in weights.index and category in weights.columns:
+            weights.loc[source, category] = 1.0
+    return weights
+
+
+def rollup_frame(df, weights):
+    values = exact_floats(df[list(weights.index)]).fillna(0).to_numpy(dtype='float64')
+    return pd.DataFrame(values @ weights.to_numpy(), index=df.index, columns=weights.columns)
+
+
+def _load_shares(path):
+    return compact_frame(pd.read_csv(path).drop(columns=['Code']))
+
+
+class SourceCube:
+
+    def __init__(self, shares, suffix=''):
+        source_columns = [column for column in shares.columns if column not in ('Entity', 'Year')]
+        self.sources = pd.Index([column[:-len(suffix)] if suffix and column.endswith(suffix) else column
+                                 for column in source_columns], name='source')
+        entity_codes, self.entities = pd.factorize(shares['Entity'].astype('object'), sort=True)
+        year_codes, self.years = pd.factorize(shares['Year'].astype('int64'), sort=True)
+        self.entities, self.years = pd.Index(self.entities, name='Entity'), pd.Index(self.years, name='Year')
+        self.values = np.full((len(self.entities), len(self.years), len(self.sources)), np.nan)
+        self.values[entity_codes, year_codes] = exact_floats(shares[source_columns]).to_numpy(dtype='float64')
+        self.present = np.zeros((len(self.entities), len(self.years)), dtype=bool)
+        self.present[entity_codes, year_codes] = True
+
+    def rollup(self, weights=None, skipna=True):
+        weights = category_weights(self.sources, categories=CATEGORY_ORDER) if weights is None else weights
+        weights = weights.reindex(self.sources, fill_value=0.0)
+        values = np.where(np.isnan(self.values) & self.present[..., None], 0.0, self.values) if skipna else self.values
+        return values @ weights.to_numpy()
+
+    def to_frame(self, cube, columns):
+        entity_codes, year_codes = np.nonzero(self.present)
+        frame = pd.DataFrame(cube[entity_codes, year_codes], columns=pd.Index(columns))
+        frame.insert(0, 'Year', self.years[year_codes])
+        frame.insert(0, 'Entity', self.entities[entity_codes])
+        return frame
+
+    def rollup_frame(self, weights=None, skipna=True):
+        weights = category_weights(self.sources, categories=CATEGORY_ORDER) if weights is None else weights
+        return self.to_frame(self.rollup(weights, skipna), weights.columns)
+
+    def entity(self, name, weights=None):
+        if name not in self.entities:
+            raise LookupError(f"Unknown entity '{name}'.")
+        position = self.entities.get_loc(name)
+        weights = category_weights(self.sources, categories=CATEGORY_ORDER) if weights is None else weights
+        rows = self.present[position]
+        values = np.nan_to_num(self.values[position, rows]) @ weights.reindex(self.sources, fill_value=0.0).to_numpy()
+        return pd.DataFrame(values, index=self.years[rows], columns=weights.columns)
+
+
+def load_source_cube(table='electricity', shares_dir=SHARES_DIR):
+    spec = SHARE_TABLES[table]
+    shares = load_cached(os.path.join(shares_dir, spec['file']), _load_shares, tag='shares-compact')
+    return SourceCube(shares, spec['suffix'])
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Green / traditional / nuclear shares from the Entity x Year x Source cube.')
+    parser.add_argument('--dir', default=SHARES_DIR,
+                        help=f'folder with the share CSV files (default: {SHARES_DIR})')
+    parser.add_argument('--table', choices=list(SHARE_TABLES), default='electricity',
+                        help='share table to load (default: electricity)')
+    parser.add_argument('--entity', nargs='+', default=['World'],
+                        help='entities to print (default: World)')
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    cube = load_source_cube(args.table, args.dir)
+    print(f"SourceCube: {len(cube.entities)} entities x {len(cube.years)} years x {len(cube.sources)} sources "
+          f"({int(cube.present.sum())} rows present)")
+    for name in args.entity:
+        try:
+            print(f"{name}:")
+            print(cube.entity(name).round(2).to_string())
+        except LookupError as exc:
+            print(f"Error (SourceCube): {exc}")
@@ -0,0 +1,57 @@
+import numpy as np
+
+
+VIOLIN_GRID_POINTS = 100
+
+
+def _binned_quantiles(bin_lows, counts, bin_width, probs):
+    cumulative = np.cumsum(counts)
+    targets = np.asarray(probs) * cumulative[-1]
+    positions = np.clip(np.searchsorted(cumulative, targets, side='left'), 0, len(counts) - 1)
+    before = np.where(positions > 0, cumulative[positions - 1], 0)
+    fraction = (targets - before) / counts[positions]
+    return bin_lows[positions] + np.clip(fraction, 0, 1) * bin_width
+
+
+def binned_violin(bin_lows, counts, bin_width, grid_points=VIOLIN_GRID_POINTS):
+    bin_lows = np.asarray(bin_lows, dtype='float64')
+    counts = np.asarray(counts, dtype='float64')
+    order = np.argsort(bin_lows)
+    bin_lows, counts = bin_lows[order], counts[order]
+    centers = bin_lows + bin_width / 2
+    total = counts.sum()
+
+    mean = float((counts * centers).sum() / total)
+    std = float(np.sqrt((counts * (centers - mean) ** 2).sum() / total))
+    q1, median, q3 = _binned_quantiles(bin_lows, counts, bin_width, [0.25, 0.5, 0.75])
+    iqr = q3 - q1
+
+    spread = min(std, iqr / 1.34) if iqr > 0 else std
+    bandwidth = 0.9 * spread * total ** -0.2
+    bandwidth = max(bandwidth, bin_width / 2)
+
+    data_min, data_max = centers[0], centers[-1]
+    grid = np.linspace(data_min - 2 * bandwidth, data_max + 2 * bandwidth, grid_points)
+    kernel = np.exp(-0.5 * ((grid[:, None] - centers[None, :]) / bandwidth) ** 2)
+    density = kernel @ counts / (total * bandwidth * np.sqrt(2 * np.pi))
+
+    inside_fences = centers[(centers >= q1 - 1.5 * iqr) & (centers <= q3 + 1.5 * iqr)]
+    return {
+        'count': int(total), 'mean': mean, 'q1': float(q1), 'median': float(median), 'q3': float(q3),
+        'lowerfence': float(inside_fences.min() if inside_fences.size else data_min),
+        'upperfence': float(inside_fences.max() if inside_fences.size else data_max),
+        'bandwidth': float(bandwidth), 'grid': grid, 'density': density
+    }
+
+
+def violin_statistics(histogram, bin_width, grid_points=VIOLIN_GRID_POINTS):
+    stats = []
+    for (hour, is_green), group in histogram.groupby(level=['hour', 'is_green_energy'], sort=True):
+        counts = group.to_numpy()
+        if counts.sum() == 0:
+            continue
+        bin_lows = group.index.get_level_values('price_bin').to_numpy() * bin_width
+        violin = binned_violin(bin_lows, counts, bin_width, grid_points)
+        violin.update({'hour': int(hour), 'is_green_energy': bool(is_green)})
+        stats.append(violin)
+    return stats